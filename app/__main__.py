@@ -7,17 +7,48 @@ Them maze is loaded from a text file into a 2D list of strings.
 
 The search types are dynamically loaded from the search_types directory
 so future search_types can be added.
+
+Run with --compare to compare all the search patterns from the command line,
+without starting the GUI, or with --batch to solve a whole directory of mazes.
+Run with --preprocess to save the cluster abstraction used by hierarchical
+search next to the maze file. Each search can be limited with --time-limit
+and --max-expansions. With --checkpoint-dir, batch searches are saved as they
+run, and resumed when the batch is run again.
+Run with --trace to record a search to a trace file, and with --replay
+to replay it, or to print it as it was at a --step.
+Run with --benchmark to time the parallel breadth first search on a large
+open grid with more and more --workers, and report the speedup.
 """
 
-from typing import List, Tuple
+import argparse
+import os
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from app.maze import Maze
+from app.maze_abstraction import (
+    DEFAULT_CLUSTER_SIZE,
+    ClusterAbstraction,
+    abstraction_filename,
+)
 from app.search import Solver
-from app.search_gui import SearchGUI
+from app.search_budget import SearchBudget
+from app.search_checkpoint import DEFAULT_CHECKPOINT_INTERVAL
+from app.search_batch import run_batch
+from app.search_compare import compare_search_patterns, format_comparison
 from app.search_loader import SearchLoader
+from app.search_trace import TraceReader, TraceWriter, format_frame
+
+# The GUI, and with it customtkinter, is only imported when it is started,
+# so that the command line modes do not pay for it.
+
+if TYPE_CHECKING:
+    from app.search_gui import SearchGUI
 
-_maze: Maze = Maze()
+_maze: Maze
 _search_loader: SearchLoader = SearchLoader()
+_gui: "SearchGUI"
+_reduce: bool = False
+_budget: SearchBudget = SearchBudget()
 
 
 def show_solution(
@@ -68,27 +99,330 @@ def start_search(search_pattern: str) -> None:
         search_pattern (str): The search pattern to use.
     """
 
-    _solver = Solver(_search_loader.registered_search_modules[search_pattern], _maze)
-    _solver.solve(show_solution)
+    _solver = Solver(
+        _search_loader.get_search_pattern_factory(search_pattern),
+        _maze,
+        reduce=_reduce,
+        budget=_budget,
+    )
+    _solution = _solver.solve(show_solution)
+    if _solution.exhausted:
+        _gui.message(
+            "Out of budget, showing the best path found."
+            if _solution.found
+            else "Out of budget, no path found."
+        )
 
 
-_gui: SearchGUI = SearchGUI(None, start_search)
+def toggle_wall(row: int, col: int) -> bool:
+    """
+    toggle_wall
 
-if __name__ == "__main__":
+    A link to this function is passed to the GUI
+    so that it can toggle a wall when a cell is clicked.
+
+    Args:
+        row (int): The row of the cell (zero based).
+        col (int): The column of the cell (zero based).
 
-    # Load the maze.
+    Returns:
+        bool: True if the wall was toggled.
+    """
+    try:
+        _maze.toggle_wall((row, col))
+    except ValueError:
+        return False
+
+    return True
 
-    _maze: Maze = Maze()
-    _maze.load()
 
-    # Dynamically load the search types, get their names.
+def start_compare() -> None:
+    """
+    start_compare
 
-    _search_loader.import_search_modules()
+    A link to this function is passed to the GUI
+    so that it can compare all the search patterns when the compare button is pressed.
+    """
+
+    # The maze is sent as it is now, with any walls toggled since it was loaded.
+
+    _results = compare_search_patterns(
+        _maze,
+        _search_loader.list_search_types(),
+        reduce=_reduce,
+        budget=_budget,
+    )
+    _gui.show_comparison(_results)
+    _gui.message(f"Compared {len(_results)} search patterns.")
+
+
+def record_trace(search_pattern: str, filename: str) -> None:
+    """
+    record_trace
+
+    Searches the maze without the GUI, recording the search to a trace file.
+
+    Args:
+        search_pattern (str): The search pattern to use.
+        filename (str): The trace file.
+    """
+    with TraceWriter(filename, _maze, search_pattern) as _trace:
+        _solution = Solver(
+            _search_loader.get_search_pattern_factory(search_pattern),
+            _maze,
+            reduce=_reduce,
+            budget=_budget,
+            trace=_trace,
+        ).solve(lambda *_args: None)
+
+    _path = str(len(_solution.cells)) if _solution.found else "-"
+    print(
+        f"{search_pattern}\texplored={_solution.num_explored}\tpath={_path}\t"
+        + f"saved '{filename}'"
+    )
+
+
+def replay_trace(filename: str, step: Optional[int]) -> None:
+    """
+    replay_trace
+
+    Replays a trace file, in the replay GUI, or as text if a step is given.
+
+    Args:
+        filename (str): The trace file.
+        step (Optional[int]): The step to print, or None to start the replay GUI.
+    """
+    _reader = TraceReader(filename)
+    if step is not None:
+        print(format_frame(_reader, step))
+        print(
+            f"{_reader.pattern}\tstep {min(step, _reader.num_expansions)} "
+            + f"of {_reader.num_expansions}"
+        )
+        return
+
+    from app.search_gui import (  # pylint: disable=import-outside-toplevel
+        ReplayGUI,
+    )
+
+    ReplayGUI(_reader).run()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    main
+
+    Parses the command line, and either compares the search patterns
+    or starts the GUI.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments.
+            Defaults to those the app was started with.
+    """
+    global _gui, _maze, _reduce, _budget  # pylint: disable=global-statement
+
+    _parser = argparse.ArgumentParser(
+        prog="maze",
+        description="A maze searching app with dynamically loaded search patterns.",
+    )
+    _parser.add_argument(
+        "--maze", default="maze.txt", help="the maze file to load from app/mazes"
+    )
+    _parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="compare all the search patterns without starting the GUI",
+    )
+    _parser.add_argument(
+        "--batch",
+        metavar="DIRECTORY",
+        help="solve every maze in a directory without starting the GUI",
+    )
+    _parser.add_argument(
+        "--pattern",
+        action="append",
+        help="a search pattern to use with --batch, may be repeated "
+        + "(defaults to all the search patterns)",
+    )
+    _parser.add_argument(
+        "--workers",
+        type=int,
+        help="the number of worker processes to use with --batch, "
+        + "or the most to time with --benchmark",
+    )
+    _parser.add_argument(
+        "--reduce",
+        action="store_true",
+        help="search the junction graph of the maze, "
+        + "with its dead ends filled and corridors contracted",
+    )
+    _parser.add_argument(
+        "--preprocess",
+        action="store_true",
+        help="save the cluster abstraction of the maze next to the maze file",
+    )
+    _parser.add_argument(
+        "--cluster-size",
+        type=int,
+        default=DEFAULT_CLUSTER_SIZE,
+        help="the size of the clusters to use with --preprocess",
+    )
+    _parser.add_argument(
+        "--time-limit",
+        type=float,
+        metavar="SECONDS",
+        help="stop each search after this many seconds",
+    )
+    _parser.add_argument(
+        "--max-expansions",
+        type=int,
+        help="stop each search after expanding this many nodes",
+    )
+    _parser.add_argument(
+        "--checkpoint-dir",
+        metavar="DIRECTORY",
+        help="save the searches of --batch to this directory as they run, "
+        + "and resume them from it",
+    )
+    _parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=DEFAULT_CHECKPOINT_INTERVAL,
+        metavar="SECONDS",
+        help="the number of seconds between checkpoints",
+    )
+    _parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="record a search of the maze with the first --pattern to a trace file, "
+        + "without starting the GUI",
+    )
+    _parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="replay a trace file",
+    )
+    _parser.add_argument(
+        "--step",
+        type=int,
+        help="print the replay as it was at this step, rather than starting the GUI",
+    )
+    _parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="time the parallel breadth first search on an open grid "
+        + "with more and more workers, without starting the GUI",
+    )
+    _parser.add_argument(
+        "--benchmark-size",
+        type=int,
+        metavar="CELLS",
+        help="the number of rows and columns of the grid used by --benchmark",
+    )
+    _args = _parser.parse_args(argv)
+    _reduce = _args.reduce
+    _budget = SearchBudget(_args.time_limit, _args.max_expansions)
+
+    # A trace holds its own maze, so is replayed without loading one.
+
+    if _args.replay:
+        replay_trace(_args.replay, _args.step)
+        return
+
+    # The benchmark builds its own grid. It is only imported when asked for,
+    # so that starting the app does not import the search type it times.
+
+    if _args.benchmark:
+        from app.search_benchmark import (  # pylint: disable=import-outside-toplevel
+            DEFAULT_BENCHMARK_SIZE,
+            benchmark_parallel_search,
+            format_benchmark,
+        )
+
+        _size = _args.benchmark_size
+        print(
+            format_benchmark(
+                benchmark_parallel_search(
+                    DEFAULT_BENCHMARK_SIZE if _size is None else _size,
+                    _args.workers,
+                )
+            )
+        )
+        return
+
+    # Dynamically discover the search types, get their names.
+
+    _search_loader.discover_search_modules()
     _search_types = _search_loader.list_search_types()
 
+    if _args.batch:
+        for _stats in run_batch(
+            _args.batch,
+            _args.pattern or _search_types,
+            _args.workers,
+            _args.reduce,
+            _budget,
+            _args.checkpoint_dir,
+            _args.checkpoint_interval,
+        ):
+            _path = str(_stats.path_length) if _stats.path_length else "-"
+            print(
+                f"{os.path.basename(_stats.maze)}\t{_stats.pattern}\t"
+                + f"explored={_stats.num_explored}\tpath={_path}\t"
+                + f"time={_stats.seconds * 1000:.2f}ms"
+                + ("\tout of budget" if _stats.exhausted else ""),
+                flush=True,
+            )
+        return
+
+    if _args.compare:
+        print(
+            format_comparison(
+                compare_search_patterns(
+                    _args.maze, _search_types, reduce=_args.reduce, budget=_budget
+                )
+            )
+        )
+        return
+
+    # Load the maze, only now that it is known to be needed.
+
+    _maze = Maze(_args.maze)
+
+    if _args.preprocess:
+        _filename = abstraction_filename(_maze)
+        ClusterAbstraction.build(_maze, _args.cluster_size).save(_filename)
+        print(f"Saved '{_filename}'.")
+        return
+
+    if _args.trace:
+        if not _args.pattern:
+            _parser.error("--trace needs a --pattern to search with")
+        if _args.pattern[0] not in _search_types:
+            _parser.error(
+                f"unknown search pattern '{_args.pattern[0]}', "
+                + f"choose from: {', '.join(_search_types)}"
+            )
+        record_trace(_args.pattern[0], _args.trace)
+        return
+
     # Start GUI.
 
+    from app.search_gui import (  # pylint: disable=import-outside-toplevel
+        SearchGUI,
+    )
+
+    _gui = SearchGUI(
+        None,
+        start_search,
+        compare_button_action=start_compare,
+        toggle_wall_action=toggle_wall,
+    )
     _gui.run(
         _search_types,
         _maze.maze,
     )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,39 @@ and the Manhatten value of a given cell.
 
 In the maze definition an asterisk represents a wall,
 'A' represents the start position and 'B' represents the goal.
+A digit from 1 to 9 represents terrain with that cost to step onto,
+and any other cell costs 1.
 
 Cooridnates in the maze are given and returned as (row, col).
+
+As well as the text of the maze, a compact grid is kept, with one byte per cell
+stored row by row: WALL for a wall, and otherwise the cost of stepping onto
+the cell, from OPEN (1) up to MAX_COST (9). Short lines
+are padded with walls so that the grid is rectangular. The compact grid can be
+placed in shared memory and a Maze rebuilt around it with Maze.from_grid.
+
+The open cells are labelled with the connected component they belong to
+when the maze is loaded, unless the caller defers it, so whether the goal can be
+reached from the start is known before any search begins.
 """
 
 from __future__ import annotations
 
+import hashlib
 import os
-from typing import List, Tuple
+import threading
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+WALL = 0
+OPEN = 1
+MAX_COST = 9
+
+Grid = Union[bytearray, memoryview]
+
+ChangeListener = Callable[[Optional[Tuple[int, int]]], None]
+
+T = TypeVar("T")
 
 
 class Maze:
@@ -22,20 +47,87 @@ class Maze:
     Defines the Maze class.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self, filename: Optional[str] = "maze.txt", label_components: bool = True
+    ) -> None:
         """
         __init__
 
         Initialises the maze class.
+
+        Args:
+            filename (Optional[str], optional): The maze file to load.
+                Defaults to "maze.txt". If None no maze is loaded.
+            label_components (bool, optional): Whether to label the connected
+                components as the maze is loaded, rather than the first time
+                they are needed. Defaults to True.
         """
 
+        self.filename: str = filename or ""
+        self.path: str = ""
         self.maze: list[list[str]] = []
+        self.grid: Grid = bytearray()
         self.start: Tuple[int, int] = (0, 0)  # row, col
         self.goal: Tuple[int, int] = (0, 0)  # row, col
         self.rows: int = 0
         self.cols: int = 0
+        self.weighted: bool = False
+
+        self._change_listeners: List[ChangeListener] = []
+
+        # The costs of the open cells turned into walls, to restore if they
+        # are opened again.
+
+        self._wall_costs: Dict[int, int] = {}
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+        if filename is not None:
+            self.load(filename, label_components)
+
+    @classmethod
+    def from_grid(  # pylint: disable=too-many-arguments
+        cls,
+        grid: Grid,
+        rows: int,
+        cols: int,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        filename: str = "",
+    ) -> Maze:
+        """
+        from_grid
+
+        Builds a maze around an existing compact grid, without copying it.
+        The text of the maze is not available on a maze built this way.
 
-        self.load()
+        Args:
+            grid (Grid): The compact grid, rows * cols bytes.
+            rows (int): The number of rows.
+            cols (int): The number of columns.
+            start (Tuple[int, int]): The start cell (row, col).
+            goal (Tuple[int, int]): The goal cell (row, col).
+            filename (str, optional): The maze file the grid was loaded from.
+
+        Returns:
+            Maze: The maze.
+        """
+        if len(grid) != rows * cols:
+            raise ValueError(
+                f"Grid has {len(grid)} cells, expected {rows} x {cols} = {rows * cols}."
+            )
+
+        _maze = cls(None)
+        _maze.filename = filename
+        _maze.path = filename if os.path.isabs(filename) else ""
+        _maze.grid = grid
+        _maze.rows = rows
+        _maze.cols = cols
+        _maze.start = start
+        _maze.goal = goal
+        _maze.weighted = any(_cost > OPEN for _cost in grid)
+
+        return _maze
 
     def get_start(self) -> Tuple[int, int]:
         """
@@ -59,6 +151,192 @@ class Maze:
         """
         return self.goal
 
+    def content_hash(self) -> str:
+        """
+        content_hash
+
+        Returns a hash of the size, start, goal and compact grid of the maze,
+        to check that data computed from a maze still belongs to it.
+
+        Returns:
+            str: The hash, as a hex string.
+        """
+        _hash = hashlib.sha256()
+        _hash.update(
+            f"{self.rows},{self.cols},{self.start},{self.goal};".encode("utf-8")
+        )
+        _hash.update(self.grid)
+
+        return _hash.hexdigest()
+
+    def get_components(self) -> array[int]:
+        """
+        get_components
+
+        Returns the connected component label of each cell, row by row.
+        Walls are labelled -1. The labels are worked out when the maze is loaded,
+        and again the first time they are needed after the maze changes.
+
+        Returns:
+            array[int]: The labels, rows * cols of them.
+        """
+        return self.get_derived("components", _label_components)
+
+    def is_reachable(self, cell: Tuple[int, int], other: Tuple[int, int]) -> bool:
+        """
+        is_reachable
+
+        Checks if one cell can be reached from another, without searching.
+
+        Args:
+            cell (Tuple[int, int]): The cell to start from (row, col).
+            other (Tuple[int, int]): The cell to reach (row, col).
+
+        Returns:
+            bool: True if there is a path between the cells.
+        """
+        if self.is_wall(cell) or self.is_wall(other):
+            return False
+
+        _components = self.get_components()
+        return (
+            _components[cell[0] * self.cols + cell[1]]
+            == _components[other[0] * self.cols + other[1]]
+        )
+
+    def is_wall(self, cell: Tuple[int, int]) -> bool:
+        """
+        is_wall
+
+        Checks if a given cell is a wall. Cells outside the maze count as walls.
+
+        Args:
+            cell (Tuple[int, int]): The cell to check (row, col).
+
+        Returns:
+            bool: True if the cell is a wall.
+        """
+        row: int = cell[0]
+        col: int = cell[1]
+
+        return not (
+            0 <= row < self.rows
+            and 0 <= col < self.cols
+            and self.grid[row * self.cols + col] != WALL
+        )
+
+    def toggle_wall(self, cell: Tuple[int, int]) -> bool:
+        """
+        toggle_wall
+
+        Turns a wall into an open cell, or an open cell into a wall,
+        and notifies the change listeners. A cell opened again gets back
+        the terrain cost it had before it was made a wall.
+
+        Args:
+            cell (Tuple[int, int]): The cell to toggle (row, col).
+
+        Raises:
+            ValueError: If the cell is outside the maze, or is the start or goal.
+
+        Returns:
+            bool: True if the cell is now a wall.
+        """
+        row: int = cell[0]
+        col: int = cell[1]
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(
+                f"Cell outside maze limits {row,col}. "
+                + f"There are {self.rows} rows (0-{self.rows-1}) "
+                + f"and {self.cols} cols (0-{self.cols-1})."
+            )
+        if cell in (self.start, self.goal):
+            raise ValueError(f"Cannot toggle the start or goal cell {row,col}.")
+
+        _index = row * self.cols + col
+        _wall = not self.is_wall(cell)
+        if _wall:
+            self._wall_costs[_index] = self.grid[_index]
+            self.grid[_index] = WALL
+        else:
+            self.grid[_index] = self._wall_costs.pop(_index, OPEN)
+
+        # Keep the text of the maze in step, if there is one.
+
+        if self.maze:
+            _row = self.maze[row]
+            if len(_row) <= col:
+                _row.extend(["*"] * (col + 1 - len(_row)))
+            _cost = self.grid[_index]
+            _row[col] = "*" if _wall else " " if _cost == OPEN else str(_cost)
+
+        with self._derived_lock:
+            self._derived.clear()
+
+        for _listener in list(self._change_listeners):
+            _listener(cell)
+
+        return _wall
+
+    def get_derived(self, name: str, build: Callable[[Maze], T]) -> T:
+        """
+        get_derived
+
+        Returns data derived from the maze, building it the first time it is
+        asked for. The data is kept until the maze is changed or reloaded.
+
+        Args:
+            name (str): The name to keep the data under.
+            build (Callable[[Maze], T]): Builds the data from the maze.
+
+        Returns:
+            T: The data.
+        """
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+
+            return self._derived[name]
+
+    def has_derived(self, name: str) -> bool:
+        """
+        has_derived
+
+        Checks if data derived from the maze has already been built.
+
+        Args:
+            name (str): The name the data is kept under.
+
+        Returns:
+            bool: True if the data is ready, without building it.
+        """
+        with self._derived_lock:
+            return name in self._derived
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """
+        add_change_listener
+
+        Adds a function to be called with the cell (row, col)
+        each time a cell of the maze is changed, or with None
+        when a new maze is loaded.
+
+        Args:
+            listener (ChangeListener): The function to call.
+        """
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: ChangeListener) -> None:
+        """
+        remove_change_listener
+
+        Removes a function added by add_change_listener.
+
+        Args:
+            listener (ChangeListener): The function to remove.
+        """
+        self._change_listeners.remove(listener)
+
     def get_neighbours(
         self, cell: Tuple[int, int]
     ) -> List[Tuple[str, Tuple[int, int]]]:
@@ -89,12 +367,30 @@ class Maze:
             if (
                 0 <= _row < self.rows
                 and 0 <= _col < self.cols
-                and self.maze[_row][_col] != "*"
+                and self.grid[_row * self.cols + _col] != WALL
             ):
                 neighbours.append((action, (_row, _col)))
 
         return neighbours
 
+    def get_step_cost(  # pylint: disable=unused-argument
+        self, cell: Tuple[int, int], neighbour: Tuple[int, int]
+    ) -> int:
+        """
+        get_step_cost
+
+        Returns the cost of stepping from a cell to a neighbouring cell,
+        which is the terrain cost of the neighbouring cell.
+
+        Args:
+            cell (Tuple[int, int]): The cell stepped from (row, col).
+            neighbour (Tuple[int, int]): The cell stepped to (row, col).
+
+        Returns:
+            int: The cost of the step.
+        """
+        return self.grid[neighbour[0] * self.cols + neighbour[1]]
+
     def get_manhattan(self, cell: Tuple[int, int]) -> int:
         """
         get_manhattan
@@ -115,7 +411,7 @@ class Maze:
             + f"and {self.cols} cols (0-{self.cols-1})."
         )
 
-    def load(self, filename: str = "maze.txt") -> None:
+    def load(self, filename: str = "maze.txt", label_components: bool = True) -> None:
         """
         loads
 
@@ -124,6 +420,9 @@ class Maze:
 
         Args:
             filename (str, optional): The maze file to load. Defaults to "maze.txt".
+                An absolute path loads a maze from outside the 'mazes' directory.
+            label_components (bool, optional): Whether to label the connected
+                components straight away. Defaults to True.
         """
         _directory = "mazes"
 
@@ -139,22 +438,92 @@ class Maze:
 
             # Open the maze file
 
-            with open(os.path.join(_directory, filename), "r", encoding="utf-8") as f:
+            _path = os.path.join(_directory, filename)
+            with open(_path, "r", encoding="utf-8") as f:
                 _lines = f.readlines()
 
             # Load the maze into the 2D list.
 
+            self.filename = filename
+            self.path = _path
+            with self._derived_lock:
+                self._derived.clear()
+            self.maze = []
             self.rows = 0
             for i, _row in enumerate(_lines):
+                _row = _row.rstrip("\r\n")
                 self.rows += 1
-                self.cols = 0
                 for j, _col in enumerate(_row):
-                    self.cols += 1
                     if _col == "A":
                         self.start = (i, j)
                     if _col == "B":
                         self.goal = (i, j)
                 self.maze.append(list(_row))
+            self.cols = max((len(_row) for _row in self.maze), default=0)
+
+            # Build the compact grid, padding short rows with walls.
+
+            self.grid = bytearray(self.rows * self.cols)
+            for i, _row in enumerate(self.maze):
+                for j, _col in enumerate(_row):
+                    if _col in "123456789":
+                        self.grid[i * self.cols + j] = int(_col)
+                    elif _col != "*":
+                        self.grid[i * self.cols + j] = OPEN
+            self.weighted = any(_cost > OPEN for _cost in self.grid)
+
+            # Label the connected components.
+
+            self._wall_costs.clear()
+            if label_components:
+                self.get_components()
+
+            # Everything derived from the previous maze is now out of date.
+
+            for _listener in list(self._change_listeners):
+                _listener(None)
 
         except FileNotFoundError as err:
             raise FileNotFoundError(f"Maze '{filename}' not found.") from err
+
+
+def _label_components(maze: Maze) -> array[int]:
+    """
+    _label_components
+
+    Labels each open cell of a maze with the connected component
+    it belongs to, using a flood fill. Walls are labelled -1.
+
+    Args:
+        maze (Maze): The maze.
+
+    Returns:
+        array[int]: The labels, rows * cols of them.
+    """
+    _rows = maze.rows
+    _cols = maze.cols
+    _grid = maze.grid
+    _labels = array("i", [-1]) * (_rows * _cols)
+    _label = 0
+
+    for _index, _value in enumerate(_grid):
+        if _value == WALL or _labels[_index] >= 0:
+            continue
+
+        _labels[_index] = _label
+        _stack = [_index]
+        while _stack:
+            _cell = _stack.pop()
+            _row, _col = divmod(_cell, _cols)
+            for _neighbour, _inside in (
+                (_cell - _cols, _row > 0),
+                (_cell + _cols, _row < _rows - 1),
+                (_cell - 1, _col > 0),
+                (_cell + 1, _col < _cols - 1),
+            ):
+                if _inside and _grid[_neighbour] != WALL and _labels[_neighbour] < 0:
+                    _labels[_neighbour] = _label
+                    _stack.append(_neighbour)
+        _label += 1
+
+    return _labels
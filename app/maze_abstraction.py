@@ -0,0 +1,539 @@
+"""
+The maze abstraction module provides the cluster abstraction
+used by hierarchical pathfinding (HPA*).
+
+The maze is split into square clusters. Wherever open cells face each other
+across the border between two clusters there is an entrance, and its cells
+become nodes of an abstract graph. Nodes either side of a border are joined
+by a single step, and nodes in the same cluster by their shortest distance
+within that cluster. A search then crosses the maze a cluster at a time,
+and only refines the path cell by cell within each cluster.
+
+The abstraction can be saved next to the maze file, and is checked against
+the content hash of the maze when it is loaded.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from app.maze import Maze
+from app.search_budget import BudgetExhausted, BudgetTracker
+from app.search_pattern import Solution
+
+ABSTRACTION_EXTENSION = ".hpa.json"
+ABSTRACTION_VERSION = 1
+DEFAULT_CLUSTER_SIZE = 10
+
+# Entrances at least this wide get a node at each end rather than one in the middle.
+
+WIDE_ENTRANCE = 6
+
+Cell = Tuple[int, int]
+Bounds = Tuple[int, int, int, int]  # first row, first col, last row + 1, last col + 1
+
+ACTIONS: Dict[Tuple[int, int], str] = {
+    (-1, 0): "N",
+    (0, -1): "W",
+    (1, 0): "S",
+    (0, 1): "E",
+}
+
+
+def _local_search(
+    maze: Maze,
+    source: Cell,
+    bounds: Bounds,
+    reverse: bool = False,
+    budget: Optional[BudgetTracker] = None,
+) -> Tuple[Dict[Cell, int], Dict[Cell, Cell]]:
+    """
+    _local_search
+
+    Finds the cost of reaching every cell that can be reached from a source
+    cell without leaving the given bounds, or of reaching the source from them.
+
+    Args:
+        maze (Maze): The maze to search.
+        source (Cell): The cell to search from (row, col).
+        bounds (Bounds): The bounds of the search.
+        reverse (bool, optional): Whether to find the cost of reaching
+            the source rather than of leaving it. Defaults to False.
+        budget (Optional[BudgetTracker], optional): The budget each cell
+            expanded is spent from. Defaults to no limits.
+
+    Raises:
+        BudgetExhausted: If the budget runs out.
+
+    Returns:
+        Tuple[Dict[Cell, int], Dict[Cell, Cell]]: The cost of each cell reached,
+            and the cell before it on the way from the source.
+    """
+    _first_row, _first_col, _last_row, _last_col = bounds
+    _distances: Dict[Cell, int] = {}
+    _parents: Dict[Cell, Cell] = {}
+    _queue: List[Tuple[int, Cell, Cell]] = [(0, source, source)]
+
+    while _queue:
+        _distance, _cell, _parent = heapq.heappop(_queue)
+        if _cell in _distances:
+            continue
+        if budget is not None and not budget.expand():
+            raise BudgetExhausted()
+        _distances[_cell] = _distance
+        if _cell != source:
+            _parents[_cell] = _parent
+
+        for _, _neighbour in maze.get_neighbours(_cell):
+            if (
+                _neighbour not in _distances
+                and _first_row <= _neighbour[0] < _last_row
+                and _first_col <= _neighbour[1] < _last_col
+            ):
+                _step = (
+                    maze.get_step_cost(_neighbour, _cell)
+                    if reverse
+                    else maze.get_step_cost(_cell, _neighbour)
+                )
+                heapq.heappush(_queue, (_distance + _step, _neighbour, _cell))
+
+    return _distances, _parents
+
+
+def abstraction_filename(maze: Maze) -> str:
+    """
+    abstraction_filename
+
+    Returns the file the abstraction of a maze is saved to, next to the maze file.
+
+    Args:
+        maze (Maze): The maze.
+
+    Returns:
+        str: The file name, empty if the maze was not loaded from a file.
+    """
+    return maze.path + ABSTRACTION_EXTENSION if maze.path else ""
+
+
+class ClusterAbstraction:
+    """
+    ClusterAbstraction
+
+    The abstract graph of the entrances between the clusters of a maze.
+    """
+
+    def __init__(
+        self,
+        cluster_size: int,
+        content_hash: str,
+        edges: Dict[Cell, Dict[Cell, int]],
+    ) -> None:
+        """
+        __init__
+
+        Initialises the abstraction.
+
+        Args:
+            cluster_size (int): The number of rows and columns in each cluster.
+            content_hash (str): The content hash of the maze it was built from.
+            edges (Dict[Cell, Dict[Cell, int]]): The cost of each abstract edge.
+        """
+        self.cluster_size: int = cluster_size
+        self.content_hash: str = content_hash
+        self.edges: Dict[Cell, Dict[Cell, int]] = edges
+
+        self._cluster_nodes: Dict[Tuple[int, int], List[Cell]] = {}
+        for _node in edges:
+            self._cluster_nodes.setdefault(self.cluster_of(_node), []).append(_node)
+
+    @classmethod
+    def build(
+        cls,
+        maze: Maze,
+        cluster_size: int = DEFAULT_CLUSTER_SIZE,
+        budget: Optional[BudgetTracker] = None,
+    ) -> ClusterAbstraction:
+        """
+        build
+
+        Builds the abstraction of a maze.
+
+        Args:
+            maze (Maze): The maze.
+            cluster_size (int, optional): The number of rows and columns
+                in each cluster. Defaults to DEFAULT_CLUSTER_SIZE.
+            budget (Optional[BudgetTracker], optional): The budget the searches
+                within each cluster are spent from. Defaults to no limits.
+
+        Raises:
+            BudgetExhausted: If the budget runs out.
+
+        Returns:
+            ClusterAbstraction: The abstraction.
+        """
+        if cluster_size < 1:
+            raise ValueError(f"Cluster size must be at least 1, not {cluster_size}.")
+
+        _edges: Dict[Cell, Dict[Cell, int]] = {}
+
+        # Find the entrances along the right and bottom border of each cluster.
+
+        for _first_row in range(0, maze.rows, cluster_size):
+            _last_row = min(_first_row + cluster_size, maze.rows)
+            for _first_col in range(0, maze.cols, cluster_size):
+                _last_col = min(_first_col + cluster_size, maze.cols)
+
+                if _last_col < maze.cols:
+                    cls._add_entrances(
+                        maze,
+                        _edges,
+                        [
+                            ((_row, _last_col - 1), (_row, _last_col))
+                            for _row in range(_first_row, _last_row)
+                        ],
+                    )
+                if _last_row < maze.rows:
+                    cls._add_entrances(
+                        maze,
+                        _edges,
+                        [
+                            ((_last_row - 1, _col), (_last_row, _col))
+                            for _col in range(_first_col, _last_col)
+                        ],
+                    )
+
+        # Join the entrance cells within each cluster.
+
+        _abstraction = cls(cluster_size, maze.content_hash(), _edges)
+        for _nodes in _abstraction._cluster_nodes.values():
+            for _node in _nodes:
+                _distances, _ = _local_search(
+                    maze,
+                    _node,
+                    _abstraction.cluster_bounds(maze, _node),
+                    budget=budget,
+                )
+                for _other in _nodes:
+                    if _other != _node and _other in _distances:
+                        _edges[_node][_other] = _distances[_other]
+
+        return _abstraction
+
+    @staticmethod
+    def _add_entrances(
+        maze: Maze,
+        edges: Dict[Cell, Dict[Cell, int]],
+        border: List[Tuple[Cell, Cell]],
+    ) -> None:
+        """
+        _add_entrances
+
+        Adds the entrances found along a border between two clusters.
+
+        Args:
+            maze (Maze): The maze.
+            edges (Dict[Cell, Dict[Cell, int]]): The abstract edges to add to.
+            border (List[Tuple[Cell, Cell]]): The pairs of cells facing
+                each other across the border, in order along it.
+        """
+        _entrance: List[Tuple[Cell, Cell]] = []
+        for _pair in [*border, None]:
+            if _pair is not None and not (
+                maze.is_wall(_pair[0]) or maze.is_wall(_pair[1])
+            ):
+                _entrance.append(_pair)
+                continue
+            if not _entrance:
+                continue
+
+            if len(_entrance) < WIDE_ENTRANCE:
+                _crossings = [_entrance[len(_entrance) // 2]]
+            else:
+                _crossings = [_entrance[0], _entrance[-1]]
+            for _cell, _other in _crossings:
+                edges.setdefault(_cell, {})[_other] = maze.get_step_cost(_cell, _other)
+                edges.setdefault(_other, {})[_cell] = maze.get_step_cost(_other, _cell)
+            _entrance = []
+
+    def cluster_of(self, cell: Cell) -> Tuple[int, int]:
+        """
+        cluster_of
+
+        Returns the cluster a cell belongs to.
+
+        Args:
+            cell (Cell): The cell (row, col).
+
+        Returns:
+            Tuple[int, int]: The cluster (row, col).
+        """
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def cluster_bounds(self, maze: Maze, cell: Cell) -> Bounds:
+        """
+        cluster_bounds
+
+        Returns the bounds of the cluster a cell belongs to.
+
+        Args:
+            maze (Maze): The maze.
+            cell (Cell): The cell (row, col).
+
+        Returns:
+            Bounds: The bounds of the cluster.
+        """
+        _row, _col = self.cluster_of(cell)
+        _first_row = _row * self.cluster_size
+        _first_col = _col * self.cluster_size
+
+        return (
+            _first_row,
+            _first_col,
+            min(_first_row + self.cluster_size, maze.rows),
+            min(_first_col + self.cluster_size, maze.cols),
+        )
+
+    def find_path(
+        self, maze: Maze, budget: Optional[BudgetTracker] = None
+    ) -> Solution:
+        """
+        find_path
+
+        Finds a path from the start to the goal through the abstract graph,
+        and refines it into cells.
+
+        Args:
+            maze (Maze): The maze the abstraction was built from.
+            budget (Optional[BudgetTracker], optional): The budget each cell
+                and abstract node expanded is spent from. Defaults to no limits.
+
+        Raises:
+            BudgetExhausted: If the budget runs out.
+
+        Returns:
+            Solution: The solution, with the abstract nodes explored.
+        """
+        _start = maze.get_start()
+        _goal = maze.get_goal()
+        _num_explored = 0
+
+        # Connect the start and goal to the entrances of their clusters.
+
+        _extra: Dict[Cell, Dict[Cell, int]] = {}
+        _start_distances, _ = _local_search(
+            maze, _start, self.cluster_bounds(maze, _start), budget=budget
+        )
+        _goal_distances, _ = _local_search(
+            maze, _goal, self.cluster_bounds(maze, _goal), True, budget
+        )
+        _num_explored += len(_start_distances) + len(_goal_distances)
+
+        for _node in self._cluster_nodes.get(self.cluster_of(_start), []):
+            if _node in _start_distances:
+                _extra.setdefault(_start, {})[_node] = _start_distances[_node]
+        for _node in self._cluster_nodes.get(self.cluster_of(_goal), []):
+            if _node in _goal_distances:
+                _extra.setdefault(_node, {})[_goal] = _goal_distances[_node]
+        if _goal in _start_distances:
+            _extra.setdefault(_start, {})[_goal] = _start_distances[_goal]
+
+        # A* search of the abstract graph.
+
+        _nodes = self._abstract_search(maze, _extra, budget)
+        if _nodes is None:
+            return Solution([], [], [], _num_explored)
+        _explored, _path = _nodes
+        _num_explored += len(_explored)
+
+        # Refine each abstract edge into cells.
+
+        _cells: List[Cell] = []
+        for _from, _to in zip(_path, _path[1:]):
+            if self.cluster_of(_from) != self.cluster_of(_to):
+                _cells.append(_to)
+                continue
+
+            _distances, _parents = _local_search(
+                maze, _from, self.cluster_bounds(maze, _from), budget=budget
+            )
+            _num_explored += len(_distances)
+            _segment: List[Cell] = []
+            _cell = _to
+            while _cell != _from:
+                _segment.append(_cell)
+                _cell = _parents[_cell]
+            _segment.reverse()
+            _cells.extend(_segment)
+
+        _actions: List[str] = []
+        _previous = _start
+        for _cell in _cells:
+            _actions.append(
+                ACTIONS[(_cell[0] - _previous[0], _cell[1] - _previous[1])]
+            )
+            _previous = _cell
+
+        return Solution(_cells, _actions, _explored, _num_explored)
+
+    def _abstract_search(
+        self,
+        maze: Maze,
+        extra: Dict[Cell, Dict[Cell, int]],
+        budget: Optional[BudgetTracker] = None,
+    ) -> Optional[Tuple[List[Cell], List[Cell]]]:
+        """
+        _abstract_search
+
+        A* search of the abstract graph from the start to the goal.
+
+        Args:
+            maze (Maze): The maze.
+            extra (Dict[Cell, Dict[Cell, int]]): The edges joining the start
+                and goal to the abstract graph for this search.
+            budget (Optional[BudgetTracker], optional): The budget each node
+                expanded is spent from. Defaults to no limits.
+
+        Raises:
+            BudgetExhausted: If the budget runs out.
+
+        Returns:
+            Optional[Tuple[List[Cell], List[Cell]]]: The nodes explored, and
+                the nodes on the path from the start to the goal,
+                or None if the goal cannot be reached.
+        """
+        _start = maze.get_start()
+        _goal = maze.get_goal()
+
+        _costs: Dict[Cell, int] = {_start: 0}
+        _parents: Dict[Cell, Cell] = {}
+        _queue: List[Tuple[int, int, Cell]] = [(maze.get_manhattan(_start), 0, _start)]
+        _explored: List[Cell] = []
+        _closed: set[Cell] = set()
+
+        while _queue:
+            _, _cost, _node = heapq.heappop(_queue)
+            if _node in _closed:
+                continue
+            if budget is not None and not budget.expand():
+                raise BudgetExhausted()
+            _closed.add(_node)
+            _explored.append(_node)
+
+            if _node == _goal:
+                _path = [_node]
+                while _node != _start:
+                    _node = _parents[_node]
+                    _path.append(_node)
+                _path.reverse()
+                return _explored, _path
+
+            for _edges in (self.edges.get(_node, {}), extra.get(_node, {})):
+                for _next, _step in _edges.items():
+                    _next_cost = _cost + _step
+                    if _next_cost < _costs.get(_next, _next_cost + 1):
+                        _costs[_next] = _next_cost
+                        _parents[_next] = _node
+                        heapq.heappush(
+                            _queue,
+                            (_next_cost + maze.get_manhattan(_next), _next_cost, _next),
+                        )
+
+        return None
+
+    def save(self, filename: str) -> None:
+        """
+        save
+
+        Saves the abstraction as JSON.
+
+        Args:
+            filename (str): The file to save to.
+        """
+        _data = {
+            "version": ABSTRACTION_VERSION,
+            "cluster_size": self.cluster_size,
+            "content_hash": self.content_hash,
+            "edges": [
+                [_node[0], _node[1], _other[0], _other[1], _cost]
+                for _node, _others in self.edges.items()
+                for _other, _cost in _others.items()
+            ],
+        }
+
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(_data, f)
+
+    @classmethod
+    def load(cls, filename: str) -> ClusterAbstraction:
+        """
+        load
+
+        Loads an abstraction saved by save().
+
+        Args:
+            filename (str): The file to load.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file was saved by a different version.
+
+        Returns:
+            ClusterAbstraction: The abstraction.
+        """
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                _data = json.load(f)
+        except FileNotFoundError as err:
+            raise FileNotFoundError(f"Abstraction '{filename}' not found.") from err
+
+        if _data.get("version") != ABSTRACTION_VERSION:
+            raise ValueError(
+                f"Abstraction '{filename}' is version {_data.get('version')}, "
+                + f"expected {ABSTRACTION_VERSION}."
+            )
+
+        _edges: Dict[Cell, Dict[Cell, int]] = {}
+        for _row, _col, _other_row, _other_col, _cost in _data["edges"]:
+            _edges.setdefault((_row, _col), {})[(_other_row, _other_col)] = _cost
+
+        return cls(_data["cluster_size"], _data["content_hash"], _edges)
+
+    @classmethod
+    def for_maze(
+        cls,
+        maze: Maze,
+        cluster_size: int = DEFAULT_CLUSTER_SIZE,
+        budget: Optional[BudgetTracker] = None,
+    ) -> ClusterAbstraction:
+        """
+        for_maze
+
+        Loads the abstraction saved next to a maze file,
+        or builds it if there is none, or it no longer matches the maze.
+
+        Args:
+            maze (Maze): The maze.
+            cluster_size (int, optional): The cluster size to build with.
+                Defaults to DEFAULT_CLUSTER_SIZE.
+            budget (Optional[BudgetTracker], optional): The budget a build
+                is spent from. Defaults to no limits.
+
+        Raises:
+            BudgetExhausted: If the budget runs out while building.
+
+        Returns:
+            ClusterAbstraction: The abstraction.
+        """
+        _filename = abstraction_filename(maze)
+        if _filename and os.path.isfile(_filename):
+            try:
+                _abstraction = cls.load(_filename)
+                if _abstraction.content_hash == maze.content_hash():
+                    return _abstraction
+            except (ValueError, KeyError):
+                pass
+
+        return cls.build(maze, cluster_size, budget)
@@ -0,0 +1,201 @@
+"""
+The maze landmarks module provides the landmark (ALT) heuristic.
+
+A few landmark cells are chosen, spread as far apart as possible, and the
+distance from each landmark to every cell is worked out once, and kept in
+compact arrays. By the triangle inequality, the distance from a cell to the
+goal is at least the difference between their distances from any landmark.
+In winding mazes this is a much closer estimate than the Manhattan value.
+
+As stepping onto terrain costs its own cost, the distance to a cell is not
+the same as the distance back, so in weighted mazes the distances to each
+landmark are kept as well as the distances from it.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import deque
+from typing import Callable, Deque, List, Tuple
+
+from app.maze import WALL, Maze
+
+DEFAULT_LANDMARKS = 8
+
+Cell = Tuple[int, int]
+
+
+def _distances_from(maze: Maze, source: int) -> array[int]:
+    """
+    _distances_from
+
+    Finds the distance from a cell to every cell of an unweighted maze,
+    with a breadth first search over the compact grid.
+
+    Args:
+        maze (Maze): The maze.
+        source (int): The index of the cell in the compact grid.
+
+    Returns:
+        array[int]: The distances, rows * cols of them, -1 where unreachable.
+    """
+    _rows = maze.rows
+    _cols = maze.cols
+    _grid = maze.grid
+    _distances = array("i", [-1]) * (_rows * _cols)
+    _distances[source] = 0
+    _queue: Deque[int] = deque([source])
+
+    while _queue:
+        _cell = _queue.popleft()
+        _distance = _distances[_cell] + 1
+        _row, _col = divmod(_cell, _cols)
+        for _neighbour, _inside in (
+            (_cell - _cols, _row > 0),
+            (_cell + _cols, _row < _rows - 1),
+            (_cell - 1, _col > 0),
+            (_cell + 1, _col < _cols - 1),
+        ):
+            if _inside and _grid[_neighbour] != WALL and _distances[_neighbour] < 0:
+                _distances[_neighbour] = _distance
+                _queue.append(_neighbour)
+
+    return _distances
+
+
+def _weighted_distances(maze: Maze, source: int, reverse: bool) -> array[int]:
+    """
+    _weighted_distances
+
+    Finds the distance from a cell to every cell of a weighted maze,
+    or from every cell to it, with Dijkstra's algorithm over the compact grid.
+
+    Args:
+        maze (Maze): The maze.
+        source (int): The index of the cell in the compact grid.
+        reverse (bool): Whether to find the distances to the cell
+            rather than from it.
+
+    Returns:
+        array[int]: The distances, rows * cols of them, -1 where unreachable.
+    """
+    _rows = maze.rows
+    _cols = maze.cols
+    _grid = maze.grid
+    _distances = array("i", [-1]) * (_rows * _cols)
+    _queue: List[Tuple[int, int]] = [(0, source)]
+
+    while _queue:
+        _distance, _cell = heapq.heappop(_queue)
+        if _distances[_cell] >= 0:
+            continue
+        _distances[_cell] = _distance
+
+        # Going forwards a step costs the cell stepped onto,
+        # going backwards it costs the cell stepped off.
+
+        _row, _col = divmod(_cell, _cols)
+        for _neighbour, _inside in (
+            (_cell - _cols, _row > 0),
+            (_cell + _cols, _row < _rows - 1),
+            (_cell - 1, _col > 0),
+            (_cell + 1, _col < _cols - 1),
+        ):
+            if _inside and _grid[_neighbour] != WALL and _distances[_neighbour] < 0:
+                _step = _grid[_cell] if reverse else _grid[_neighbour]
+                heapq.heappush(_queue, (_distance + _step, _neighbour))
+
+    return _distances
+
+
+class Landmarks:
+    """
+    Landmarks
+
+    The landmarks of a maze, and the distance from each of them to every cell.
+    """
+
+    def __init__(self, maze: Maze, count: int = DEFAULT_LANDMARKS) -> None:
+        """
+        __init__
+
+        Chooses the landmarks and works out their distances.
+        Each landmark is the cell furthest from those already chosen,
+        among the cells that can be reached from the start.
+
+        Args:
+            maze (Maze): The maze.
+            count (int, optional): The number of landmarks.
+                Defaults to DEFAULT_LANDMARKS.
+        """
+        self.cols: int = maze.cols
+        self.landmarks: List[Cell] = []
+        self.distances: List[array[int]] = []  # From each landmark.
+        self.distances_to: List[array[int]] = []  # To each landmark.
+
+        _start = maze.get_start()
+        if maze.is_wall(_start):
+            return
+
+        # The minimum distance of each cell from the landmarks chosen so far,
+        # starting with its distance from the start.
+
+        _start_index = _start[0] * maze.cols + _start[1]
+        if maze.weighted:
+            _nearest = _weighted_distances(maze, _start_index, reverse=False)
+        else:
+            _nearest = _distances_from(maze, _start_index)
+        for _ in range(count):
+            _landmark = max(range(len(_nearest)), key=_nearest.__getitem__)
+            if _nearest[_landmark] <= 0:
+                break
+
+            if maze.weighted:
+                _distances = _weighted_distances(maze, _landmark, reverse=False)
+                _distances_to = _weighted_distances(maze, _landmark, reverse=True)
+            else:
+                _distances = _distances_to = _distances_from(maze, _landmark)
+            self.landmarks.append(divmod(_landmark, maze.cols))
+            self.distances.append(_distances)
+            self.distances_to.append(_distances_to)
+            for _index, _distance in enumerate(_distances):
+                if 0 <= _distance < _nearest[_index]:
+                    _nearest[_index] = _distance
+
+    def heuristic_to(self, goal: Cell) -> Callable[[Cell], int]:
+        """
+        heuristic_to
+
+        Returns the landmark heuristic for a goal cell.
+
+        Args:
+            goal (Cell): The goal cell (row, col).
+
+        Returns:
+            Callable[[Cell], int]: Returns the lower bound on the distance
+                from a cell (row, col) to the goal.
+        """
+        _cols = self.cols
+        _goal = goal[0] * _cols + goal[1]
+        _landmarks = [
+            (_from[_goal], _from, _to[_goal], _to)
+            for _from, _to in zip(self.distances, self.distances_to)
+            if _from[_goal] >= 0 and _to[_goal] >= 0
+        ]
+
+        # For a landmark L, d(cell, goal) >= d(L, goal) - d(L, cell)
+        # and d(cell, goal) >= d(cell, L) - d(goal, L).
+
+        def _heuristic(cell: Cell) -> int:
+            _index = cell[0] * _cols + cell[1]
+            return max(
+                (
+                    max(_from_goal - _from[_index], _to[_index] - _to_goal)
+                    for _from_goal, _from, _to_goal, _to in _landmarks
+                    if _from[_index] >= 0 and _to[_index] >= 0
+                ),
+                default=0,
+            )
+
+        return _heuristic
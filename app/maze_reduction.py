@@ -0,0 +1,300 @@
+"""
+The maze reduction module shrinks a maze into a weighted graph of its junctions,
+for the search patterns to search instead of the maze itself.
+
+First the dead ends are filled: any open cell with only one open neighbour
+cannot be on a path unless it is the start or the goal, so it is filled, and
+filling it may make its neighbour a dead end in turn. Then each corridor of
+cells with exactly two open neighbours is contracted into a single edge between
+the junctions at either end, weighted by the cost of following it.
+
+A ReducedMaze offers the same search methods as a Maze, so the solver can
+search it unchanged, and expand the junctions it finds back into cells.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from app.maze import Maze
+
+Cell = Tuple[int, int]
+
+
+class Corridor:  # pylint: disable=too-few-public-methods
+    """
+    Corridor
+
+    A corridor between two junctions.
+    """
+
+    def __init__(self, actions: List[str], cells: List[Cell], cost: int) -> None:
+        """
+        __init__
+
+        Initialises the corridor.
+
+        Args:
+            actions (List[str]): The actions that follow the corridor.
+            cells (List[Cell]): The cells of the corridor,
+                ending with the junction it leads to.
+            cost (int): The cost of following the corridor.
+        """
+        self.actions: List[str] = actions
+        self.cells: List[Cell] = cells
+        self.cost: int = cost
+
+
+class ReducedMaze:
+    """
+    ReducedMaze
+
+    The junction graph of a maze, with its dead ends filled
+    and its corridors contracted.
+    """
+
+    def __init__(self, maze: Maze) -> None:
+        """
+        __init__
+
+        Reduces a maze.
+
+        Args:
+            maze (Maze): The maze to reduce.
+        """
+        self.maze: Maze = maze
+        self.filled: Set[Cell] = self._fill_dead_ends(maze)
+        self.corridors: Dict[Cell, Dict[Cell, Corridor]] = {}
+
+        # Every open cell that is not simply part of a corridor is a junction.
+
+        for _row in range(maze.rows):
+            for _col in range(maze.cols):
+                _cell = (_row, _col)
+                if not maze.is_wall(_cell) and _cell not in self.filled:
+                    if self._is_junction(_cell):
+                        self.corridors[_cell] = {}
+
+        for _junction, _corridors in self.corridors.items():
+            for _action, _cell in self._open_neighbours(_junction):
+                _corridor = self._follow(_junction, _action, _cell)
+                if _corridor is None:
+                    continue
+                _end = _corridor.cells[-1]
+                if _end != _junction and (
+                    _end not in _corridors or _corridor.cost < _corridors[_end].cost
+                ):
+                    _corridors[_end] = _corridor
+
+    @staticmethod
+    def _fill_dead_ends(maze: Maze) -> Set[Cell]:
+        """
+        _fill_dead_ends
+
+        Finds the open cells that can only be reached through dead ends.
+
+        Args:
+            maze (Maze): The maze.
+
+        Returns:
+            Set[Cell]: The cells filled.
+        """
+        _keep = (maze.get_start(), maze.get_goal())
+        _filled: Set[Cell] = set()
+        _open_neighbours: Dict[Cell, int] = {}
+        _queue: Deque[Cell] = deque()
+
+        for _row in range(maze.rows):
+            for _col in range(maze.cols):
+                _cell = (_row, _col)
+                if not maze.is_wall(_cell):
+                    _open_neighbours[_cell] = len(maze.get_neighbours(_cell))
+                    if _open_neighbours[_cell] <= 1 and _cell not in _keep:
+                        _queue.append(_cell)
+
+        while _queue:
+            _cell = _queue.popleft()
+            if _cell in _filled:
+                continue
+            _filled.add(_cell)
+
+            for _, _neighbour in maze.get_neighbours(_cell):
+                if _neighbour not in _filled:
+                    _open_neighbours[_neighbour] -= 1
+                    if _open_neighbours[_neighbour] <= 1 and _neighbour not in _keep:
+                        _queue.append(_neighbour)
+
+        return _filled
+
+    def _open_neighbours(self, cell: Cell) -> List[Tuple[str, Cell]]:
+        """
+        _open_neighbours
+
+        Returns the neighbours of a cell that have not been filled.
+
+        Args:
+            cell (Cell): The cell (row, col).
+
+        Returns:
+            List[Tuple[str, Cell]]: The actions and neighbours.
+        """
+        return [
+            (_action, _neighbour)
+            for _action, _neighbour in self.maze.get_neighbours(cell)
+            if _neighbour not in self.filled
+        ]
+
+    def _is_junction(self, cell: Cell) -> bool:
+        """
+        _is_junction
+
+        Checks if a cell is a junction. The start and goal always are.
+
+        Args:
+            cell (Cell): The cell (row, col).
+
+        Returns:
+            bool: True if the cell is a junction.
+        """
+        return (
+            cell in (self.maze.get_start(), self.maze.get_goal())
+            or len(self._open_neighbours(cell)) != 2
+        )
+
+    def _follow(self, junction: Cell, action: str, cell: Cell) -> Optional[Corridor]:
+        """
+        _follow
+
+        Follows a corridor from a junction to the next junction.
+
+        Args:
+            junction (Cell): The junction the corridor starts at.
+            action (str): The action that leads into the corridor.
+            cell (Cell): The first cell of the corridor.
+
+        Returns:
+            Optional[Corridor]: The corridor, or None if it loops
+                back on itself without reaching a junction.
+        """
+        _actions = [action]
+        _cells = [cell]
+        _cost = self.maze.get_step_cost(junction, cell)
+        _previous = junction
+
+        while cell not in self.corridors:
+            _action, _next = next(
+                (_action, _neighbour)
+                for _action, _neighbour in self._open_neighbours(cell)
+                if _neighbour != _previous
+            )
+            _cost += self.maze.get_step_cost(cell, _next)
+            _previous, cell = cell, _next
+            _actions.append(_action)
+            _cells.append(cell)
+            if len(_cells) > self.maze.rows * self.maze.cols:
+                return None
+
+        return Corridor(_actions, _cells, _cost)
+
+    @property
+    def num_junctions(self) -> int:
+        """
+        num_junctions
+
+        Returns:
+            int: The number of junctions in the reduced graph.
+        """
+        return len(self.corridors)
+
+    def get_start(self) -> Cell:
+        """
+        get_start
+
+        Return the location of the start cell (row, col).
+
+        Returns:
+            Cell: The location of the start cell (row, col).
+        """
+        return self.maze.get_start()
+
+    def get_goal(self) -> Cell:
+        """
+        get_goal
+
+        Return the location of the goal cell (row, col).
+
+        Returns:
+            Cell: The location of the goal cell (row, col).
+        """
+        return self.maze.get_goal()
+
+    def get_neighbours(self, cell: Cell) -> List[Tuple[str, Cell]]:
+        """
+        get_neighbours
+
+        Returns the junctions at the far end of the corridors from a junction.
+        The action is the first action along the corridor.
+
+        Args:
+            cell (Cell): The junction (row, col).
+
+        Returns:
+            List[Tuple[str, Cell]]: The list of neighbouring junctions.
+        """
+        return [
+            (_corridor.actions[0], _junction)
+            for _junction, _corridor in self.corridors.get(cell, {}).items()
+        ]
+
+    def get_step_cost(self, cell: Cell, neighbour: Cell) -> int:
+        """
+        get_step_cost
+
+        Returns the cost of following the corridor between two junctions.
+
+        Args:
+            cell (Cell): The junction stepped from (row, col).
+            neighbour (Cell): The junction stepped to (row, col).
+
+        Returns:
+            int: The cost of the corridor.
+        """
+        return self.corridors[cell][neighbour].cost
+
+    def get_manhattan(self, cell: Cell) -> int:
+        """
+        get_manhattan
+
+        Returns the Manhattan value from a given junction to the goal cell.
+
+        Args:
+            cell (Cell): The junction (row, col).
+
+        Returns:
+            int: The Manhattan value.
+        """
+        return self.maze.get_manhattan(cell)
+
+    def expand(self, junctions: List[Cell]) -> Tuple[List[Cell], List[str]]:
+        """
+        expand
+
+        Expands a path of junctions from the start into the cells of the maze.
+
+        Args:
+            junctions (List[Cell]): The junctions after the start, in order.
+
+        Returns:
+            Tuple[List[Cell], List[str]]: The cells and actions of the path.
+        """
+        _cells: List[Cell] = []
+        _actions: List[str] = []
+        _previous = self.get_start()
+        for _junction in junctions:
+            _corridor = self.corridors[_previous][_junction]
+            _cells.extend(_corridor.cells)
+            _actions.extend(_corridor.actions)
+            _previous = _junction
+
+        return _cells, _actions
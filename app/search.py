@@ -1,14 +1,75 @@
 """
 The search ai module contains the solver class which carries out the maze search,
 and returns a solution to the maze.
+
+A solver creates a new search pattern, and so a new frontier, for each search,
+and keeps no other state between searches, so it can be called from many
+threads or asyncio tasks at once. The maze must not be changed while it is
+being searched.
+
+A search can be given a budget, a time limit and a limit on the nodes expanded,
+and a cancellation token. If either stops the search, the solution is marked
+as exhausted, holding the best path found so far if the search pattern has one.
+
+A search can also be given a checkpointer, which saves the search state from
+time to time, and when it stops early. A later search of the same maze, with
+the same search pattern, resumes from the checkpoint.
+
+A search can be recorded with a trace writer, to be replayed later.
 """
 
 from __future__ import annotations
 
-from typing import Callable, List, Tuple
+from typing import Callable, List, Optional, Set, Tuple, Union
 
 from app.maze import Maze
-from app.search_pattern import Node, SearchPattern
+from app.maze_landmarks import Landmarks
+from app.maze_reduction import ReducedMaze
+from app.search_budget import BudgetTracker, CancellationToken, SearchBudget
+from app.search_checkpoint import Checkpointer, SearchCheckpoint, pattern_id
+from app.search_pattern import (
+    LANDMARKS,
+    MANHATTAN,
+    Node,
+    PlanningPattern,
+    SearchPattern,
+    SearchPatternFactory,
+    Solution,
+    as_factory,
+)
+from app.search_trace import TraceWriter
+
+ShowSolution = Callable[
+    [List[Tuple[int, int]], str, List[Tuple[int, int]], str, int], None
+]
+
+
+def get_heuristic(maze: Maze, name: str) -> Callable[[Tuple[int, int]], int]:
+    """
+    get_heuristic
+
+    Returns a heuristic for the goal of a maze.
+
+    Args:
+        maze (Maze): The maze.
+        name (str): The heuristic, MANHATTAN or LANDMARKS.
+
+    Raises:
+        ValueError: If the heuristic is not known.
+
+    Returns:
+        Callable[[Tuple[int, int]], int]: Estimates the cost from a cell to the goal.
+    """
+    if name == MANHATTAN:
+        return maze.get_manhattan
+
+    if name == LANDMARKS:
+        _landmarks = maze.get_derived("landmarks", Landmarks).heuristic_to(
+            maze.get_goal()
+        )
+        return lambda cell: max(maze.get_manhattan(cell), _landmarks(cell))
+
+    raise ValueError(f"Unknown heuristic '{name}'.")
 
 
 class Solver:  # pylint: disable=too-few-public-methods
@@ -18,41 +79,155 @@ class Solver:  # pylint: disable=too-few-public-methods
     The solver class which searches the maze and returns a solution.
     """
 
-    def __init__(self, search_pattern: SearchPattern, maze: Maze) -> None:
+    def __init__(
+        self,
+        search_pattern: Union[SearchPatternFactory, SearchPattern],
+        maze: Maze,
+        reduce: bool = False,
+        budget: Optional[SearchBudget] = None,
+        cancellation: Optional[CancellationToken] = None,
+        checkpoint: Optional[Checkpointer] = None,
+        trace: Optional[TraceWriter] = None,
+    ) -> None:
         """
         __init__
 
         Initialised the solver class.
 
         Args:
-            fronsearch_pattern (SearchPattern): The search pattern to use.
+            search_pattern (Union[SearchPatternFactory, SearchPattern]): Creates
+                the search pattern to use. A search pattern object is copied
+                for each search instead.
             maze (Maze): The maze to solve
+            reduce (bool, optional): Whether to search the junction graph of the
+                maze, with its dead ends filled and corridors contracted,
+                rather than every cell. Defaults to False.
+            budget (Optional[SearchBudget], optional): The limits on each search.
+                Defaults to no limits.
+            cancellation (Optional[CancellationToken], optional): Stops the search
+                early when cancelled. Defaults to None.
+            checkpoint (Optional[Checkpointer], optional): Saves the state of the
+                search, and resumes from it. Planning patterns are not saved.
+                Defaults to None.
+            trace (Optional[TraceWriter], optional): Records the cells expanded,
+                the cells added to the frontier and the path. The caller closes it.
+                Defaults to None.
         """
-        self.search_pattern: SearchPattern = search_pattern
+        self.search_pattern_factory: SearchPatternFactory = as_factory(
+            search_pattern
+        )
         self.maze: Maze = maze
+        self.reduce: bool = reduce
+        self.budget: Optional[SearchBudget] = budget
+        self.cancellation: Optional[CancellationToken] = cancellation
+        self.checkpoint: Optional[Checkpointer] = checkpoint
+        self.trace: Optional[TraceWriter] = trace
 
         self.num_explored: int = 0
 
-    def solve(
-        self,
-        show_solution: Callable[
-            [List[Tuple[int, int]], str, List[Tuple[int, int]], str, int], None
-        ],
-    ):
+    async def solve_async(self, show_solution: ShowSolution) -> Solution:
+        """
+        solve_async
+
+        Invoke the maze solving algorithm in a worker thread,
+        so that many searches can be awaited at once.
+
+        Args:
+            show_solution (ShowSolution): Invoked as the search progresses,
+                and with the final result, from the worker thread.
+
+        Returns:
+            Solution: The solution found, which is empty if there is none.
+        """
+        # asyncio is only imported here, as it is slow to import
+        # and most searches are not awaited.
+
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        return await asyncio.to_thread(self.solve, show_solution)
+
+    def solve(self, show_solution: ShowSolution) -> Solution:
         """
         solve
 
         Invoke the maze solving algorithm.
+
+        Args:
+            show_solution (ShowSolution): Invoked as the search progresses,
+                and with the final result, unless the budget runs out
+                before a path is found.
+
+        Returns:
+            Solution: The solution found, which is empty if there is none.
         """
 
-        self.search_pattern.frontier_buffer = []
+        _budget = BudgetTracker(self.budget, self.cancellation)
+        _search_pattern = self.search_pattern_factory()
+
+        # Give up straight away if the goal is known to be unreachable. This is only
+        # checked if the components have already been labelled, as when a maze is
+        # loaded, because labelling them costs more than many searches.
+
+        if self.maze.has_derived("components") and not self.maze.is_reachable(
+            self.maze.get_start(), self.maze.get_goal()
+        ):
+            show_solution([], "", [], "", 0)
+            return Solution([], [], [], 0)
+
+        # Planning patterns do the whole search themselves.
+
+        if isinstance(_search_pattern, PlanningPattern):
+            _solution = _search_pattern.plan(self.maze, _budget)
+            if self.trace is not None:
+                for _cell in _solution.explored:
+                    self.trace.expand(_cell)
+                self.trace.path(_solution.cells)
+            if _solution.found:
+                show_solution(
+                    _solution.cells,
+                    "#C17E7E",
+                    _solution.explored,
+                    "#7A9EB1",
+                    _solution.num_explored,
+                )
+            elif not _solution.exhausted:
+                show_solution([], "", [], "", 0)
+            return _solution
+
+        # The cells explored are kept in order, to show and save them,
+        # and as a set, to check quickly whether a cell has been explored.
+
         _explored: List[Tuple[int, int]] = []
+        _explored_states: Set[Tuple[int, int]] = set()
         _num_explored: int = 0
 
-        # Setup the start node and add it to the frontiewr.
+        # Search either the maze itself, or its junction graph.
+
+        _maze: Union[Maze, ReducedMaze] = self.maze
+        if self.reduce:
+            _maze = self.maze.get_derived("reduced_maze", ReducedMaze)
+        _heuristic = get_heuristic(self.maze, _search_pattern.heuristic)
 
-        _start: Node = Node(state=self.maze.get_start(), parent=None, action="")
-        self.search_pattern.add_to_frontier(_start)
+        # Resume from the checkpoint if there is one, otherwise
+        # setup the start node and add it to the frontiewr.
+
+        _resumed = (
+            self.checkpoint.resume(
+                self.maze, pattern_id(self.search_pattern_factory), self.reduce
+            )
+            if self.checkpoint is not None
+            else None
+        )
+        if _resumed is not None:
+            _explored = _resumed.explored
+            _explored_states = set(_explored)
+            _num_explored = _resumed.num_explored
+            _search_pattern.restore_frontier(_resumed.frontier, _explored)
+        else:
+            _start: Node = Node(state=_maze.get_start(), parent=None, action="")
+            _search_pattern.add_to_frontier(_start)
+            if self.trace is not None:
+                self.trace.add(_start.state)
 
         # Do the search.
 
@@ -60,22 +235,35 @@ class Solver:  # pylint: disable=too-few-public-methods
 
             # If not more nodes to search then there is no solution.
 
-            if self.search_pattern.empty_frontier():
+            if _search_pattern.empty_frontier():
+                if self.checkpoint is not None:
+                    self.checkpoint.remove()
                 show_solution([], "", [], "", 0)
-                return
+                return Solution([], [], _explored, _num_explored)
+
+            # Stop if the budget has run out, or the search has been cancelled,
+            # saving a checkpoint to carry on from.
+
+            if not _budget.expand():
+                if self.checkpoint is not None:
+                    self._save_checkpoint(_search_pattern, _explored, _num_explored)
+                return Solution([], [], _explored, _num_explored, exhausted=True)
+
+            if self.checkpoint is not None and self.checkpoint.due():
+                self._save_checkpoint(_search_pattern, _explored, _num_explored)
 
             # Get the next node to search. It is this function that
             # destinguishes the different search pattersn.
 
             _node: Node = (
-                self.search_pattern.remove_from_frontier()
+                _search_pattern.remove_from_frontier()
             )  # This is search specific.
             _num_explored += 1
 
             # If the node is the goal, then construct the solution
             # and report back.
 
-            if _node.state == self.maze.get_goal():
+            if _node.state == _maze.get_goal():
                 _actions: List[str] = []
                 _cells: List[Tuple[int, int]] = []
 
@@ -85,28 +273,73 @@ class Solver:  # pylint: disable=too-few-public-methods
                     _node = _node.parent
                 _actions.reverse()
                 _cells.reverse()
+                if isinstance(_maze, ReducedMaze):
+                    _cells, _actions = _maze.expand(_cells)
+                if self.checkpoint is not None:
+                    self.checkpoint.remove()
+                if self.trace is not None:
+                    self.trace.expand(_maze.get_goal())
+                    self.trace.path(_cells)
 
                 show_solution(_cells, "#C17E7E", _explored, "#7A9EB1", _num_explored)
-                return
+                return Solution(_cells, _actions, _explored, _num_explored)
 
             # Add the node to the list of those explored, and report it.
 
             _explored.append(_node.state)
+            _explored_states.add(_node.state)
             show_solution([], "", [_node.state], "#7C9A6D", 0)
 
-            # Add the node's neighbours to the frontier.
+            # Add the node's neighbours to the frontier, then trace the node being
+            # expanded and the neighbours added with a single call.
 
-            for _action, _state in self.maze.get_neighbours(_node.state):
+            _added: List[Tuple[int, int]] = []
+            for _action, _state in _maze.get_neighbours(_node.state):
 
                 if (
-                    not self.search_pattern.frontier_contains_state(_state)
-                    and _state not in _explored
+                    not _search_pattern.frontier_contains_state(_state)
+                    and _state not in _explored_states
                 ):
                     child = Node(
                         state=_state,
                         parent=_node,
                         action=_action,
-                        manhattan=self.maze.get_manhattan(_state),
-                        cost=_num_explored,
+                        manhattan=_heuristic(_state),
+                        cost=_node.cost + _maze.get_step_cost(_node.state, _state),
                     )
-                    self.search_pattern.add_to_frontier(child)
+                    _search_pattern.add_to_frontier(child)
+                    if self.trace is not None:
+                        _added.append(_state)
+            if self.trace is not None:
+                self.trace.expand(_node.state, _added)
+
+    def _save_checkpoint(
+        self,
+        search_pattern: SearchPattern,
+        explored: List[Tuple[int, int]],
+        num_explored: int,
+    ) -> None:
+        """
+        _save_checkpoint
+
+        Saves the state of the search.
+
+        Args:
+            search_pattern (SearchPattern): The search pattern, holding the frontier.
+            explored (List[Tuple[int, int]]): The cells explored so far.
+            num_explored (int): The number of nodes removed from the frontier.
+        """
+        if self.checkpoint is None:
+            return
+
+        self.checkpoint.save(
+            SearchCheckpoint(
+                self.maze.content_hash(),
+                pattern_id(self.search_pattern_factory),
+                self.reduce,
+                num_explored,
+                list(explored),
+                search_pattern.dump_frontier(),
+            ),
+            self.maze,
+        )
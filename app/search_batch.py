@@ -0,0 +1,377 @@
+"""
+The search batch module solves every maze in a directory with one or more
+search patterns, spreading the (maze, pattern) jobs over a process pool.
+
+Each maze is loaded once, and its compact grid is placed in shared memory
+so that the workers read it without it being pickled or copied.
+A worker first checks whether the goal of each maze can be reached from its
+start, and mazes whose goal cannot be reached are answered without a search.
+The mazes are loaded as the workers become free, and the results are streamed
+back as the jobs complete, so a large directory is never held in memory at once.
+
+Given a checkpoint directory, each job saves its search there from time to time,
+and a worker sent SIGTERM saves its search before it stops. Running the batch
+again resumes each unfinished search from its checkpoint.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import signal
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from types import FrameType
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.maze import Maze
+from app.search_budget import CancellationToken, SearchBudget
+from app.search_checkpoint import DEFAULT_CHECKPOINT_INTERVAL, Checkpointer
+from app.search_compare import SearchStats, SharedGrid, share_grid, solve_and_measure
+from app.search_loader import SearchLoader
+
+MAZE_EXTENSION = ".txt"
+CHECKPOINT_EXTENSION = ".ckpt"
+
+# The number of mazes loaded into shared memory ahead of each worker.
+
+MAZES_PER_WORKER = 2
+
+# Each worker process keeps its own search loader, so the search types
+# are only imported once per worker rather than once per job.
+
+_worker_search_loader: Optional[SearchLoader] = None
+
+# The cancellation token of the job a worker is running, for the signal handler,
+# and whether the worker has been asked to stop.
+
+_worker_cancellation: Optional[CancellationToken] = None
+_worker_stopping: bool = False
+
+
+def solve_shared(  # pylint: disable=too-many-arguments
+    pattern: str,
+    shared_grid: SharedGrid,
+    reduce: bool = False,
+    budget: Optional[SearchBudget] = None,
+    checkpoint_filename: Optional[str] = None,
+    checkpoint_interval: Optional[float] = DEFAULT_CHECKPOINT_INTERVAL,
+) -> SearchStats:
+    """
+    solve_shared
+
+    Solves a maze held in shared memory with a single search pattern.
+    This is run in the worker processes.
+
+    Args:
+        pattern (str): The name of the search pattern to use.
+        shared_grid (SharedGrid): The maze to solve.
+        reduce (bool, optional): Whether to search the junction graph
+            of the maze. Defaults to False.
+        budget (Optional[SearchBudget], optional): The limits on the search.
+            Defaults to no limits.
+        checkpoint_filename (Optional[str], optional): The file to save
+            the search to, and resume it from. Defaults to None.
+        checkpoint_interval (Optional[float], optional): The number of seconds
+            between checkpoints. Defaults to DEFAULT_CHECKPOINT_INTERVAL.
+
+    Returns:
+        SearchStats: The measurements taken, without the cells explored.
+    """
+    # pylint: disable-next=global-statement
+    global _worker_search_loader, _worker_cancellation
+
+    if _worker_search_loader is None:
+        _worker_search_loader = SearchLoader()
+        _worker_search_loader.discover_search_modules()
+
+    # The workers share the resource tracker of the parent process, which
+    # created the block, so attaching here does not take ownership of it.
+
+    _worker_cancellation = CancellationToken()
+    _shared_memory = SharedMemory(shared_grid.name)
+    _grid = _shared_memory.buf[: shared_grid.rows * shared_grid.cols]
+    try:
+        _maze = Maze.from_grid(
+            _grid,
+            shared_grid.rows,
+            shared_grid.cols,
+            shared_grid.start,
+            shared_grid.goal,
+            shared_grid.filename,
+        )
+        _stats = solve_and_measure(
+            pattern,
+            _worker_search_loader.get_search_pattern_factory(pattern),
+            _maze,
+            trace_memory=False,
+            reduce=reduce,
+            budget=budget,
+            cancellation=_worker_cancellation,
+            checkpoint=(
+                None
+                if checkpoint_filename is None
+                else Checkpointer(checkpoint_filename, checkpoint_interval)
+            ),
+        )
+    finally:
+        _grid.release()
+        _shared_memory.close()
+        _worker_cancellation = None
+
+        # The search has been saved, so the worker can now stop as it was asked.
+
+        if _worker_stopping:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.raise_signal(signal.SIGTERM)
+
+    # The cells explored are not needed for a batch, and can be large to send back.
+
+    _stats.explored = []
+    return _stats
+
+
+def check_reachable(shared_grid: SharedGrid) -> bool:
+    """
+    check_reachable
+
+    Checks whether the goal of a maze held in shared memory can be reached
+    from its start, by labelling its connected components.
+    This is run in the worker processes, once for each maze.
+
+    Args:
+        shared_grid (SharedGrid): The maze to check.
+
+    Returns:
+        bool: True if there is a path from the start to the goal.
+    """
+    _shared_memory = SharedMemory(shared_grid.name)
+    _grid = _shared_memory.buf[: shared_grid.rows * shared_grid.cols]
+    try:
+        _maze = Maze.from_grid(
+            _grid,
+            shared_grid.rows,
+            shared_grid.cols,
+            shared_grid.start,
+            shared_grid.goal,
+            shared_grid.filename,
+        )
+        return _maze.is_reachable(_maze.get_start(), _maze.get_goal())
+    finally:
+        _grid.release()
+        _shared_memory.close()
+
+
+def _init_worker() -> None:
+    """
+    _init_worker
+
+    Sets up a worker process to save its search when it is sent SIGTERM.
+    """
+    signal.signal(signal.SIGTERM, _stop_worker)
+
+
+def _stop_worker(signum: int, _frame: Optional[FrameType]) -> None:
+    """
+    _stop_worker
+
+    Handles SIGTERM in a worker process. A running search is cancelled, which
+    saves its checkpoint, and the worker stops once it has. An idle worker
+    stops straight away.
+
+    Args:
+        signum (int): The signal received.
+    """
+    global _worker_stopping  # pylint: disable=global-statement
+
+    _worker_stopping = True
+    if _worker_cancellation is not None:
+        _worker_cancellation.cancel()
+    else:
+        signal.signal(signum, signal.SIG_DFL)
+        signal.raise_signal(signum)
+
+
+def checkpoint_filename(directory: str, maze_filename: str, pattern: str) -> str:
+    """
+    checkpoint_filename
+
+    Returns the checkpoint file for a (maze, pattern) job.
+
+    Args:
+        directory (str): The checkpoint directory.
+        maze_filename (str): The maze file.
+        pattern (str): The name of the search pattern.
+
+    Returns:
+        str: The checkpoint file.
+    """
+    _pattern = re.sub(r"[^0-9A-Za-z]+", "_", pattern).strip("_").lower()
+
+    return os.path.join(
+        directory, f"{os.path.basename(maze_filename)}.{_pattern}{CHECKPOINT_EXTENSION}"
+    )
+
+
+def list_mazes(directory: str) -> List[str]:
+    """
+    list_mazes
+
+    Lists the maze files in a directory.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        List[str]: The absolute paths of the maze files, sorted.
+    """
+    _directory = os.path.abspath(directory)
+
+    return sorted(
+        os.path.join(_directory, f)
+        for f in os.listdir(_directory)
+        if f.endswith(MAZE_EXTENSION) and os.path.isfile(os.path.join(_directory, f))
+    )
+
+
+def run_batch(  # pylint: disable=too-many-arguments,too-many-locals
+    directory: str,
+    patterns: List[str],
+    max_workers: Optional[int] = None,
+    reduce: bool = False,
+    budget: Optional[SearchBudget] = None,
+    checkpoint_dir: Optional[str] = None,
+    checkpoint_interval: Optional[float] = DEFAULT_CHECKPOINT_INTERVAL,
+) -> Iterator[SearchStats]:
+    """
+    run_batch
+
+    Solves every maze in a directory with each of the given search patterns,
+    in a process pool, yielding the results as they complete. The mazes are
+    loaded as the workers become free, no more than MAZES_PER_WORKER for each
+    worker at once.
+
+    Args:
+        directory (str): The directory holding the maze files.
+        patterns (List[str]): The names of the search patterns to use.
+        max_workers (Optional[int], optional): The number of worker processes.
+            Defaults to the number of CPUs.
+        reduce (bool, optional): Whether to search the junction graph
+            of each maze. Defaults to False.
+        budget (Optional[SearchBudget], optional): The limits on each search.
+            Defaults to no limits.
+        checkpoint_dir (Optional[str], optional): The directory to save
+            the searches to, and resume them from. Defaults to None.
+        checkpoint_interval (Optional[float], optional): The number of seconds
+            between checkpoints. Defaults to DEFAULT_CHECKPOINT_INTERVAL.
+
+    Yields:
+        SearchStats: The measurements for each (maze, pattern) job, in the
+            order they complete.
+    """
+    _shared: Dict[str, SharedMemory] = {}
+    _jobs_left: Dict[str, int] = {}
+
+    try:
+        if checkpoint_dir is not None:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=None if checkpoint_dir is None else _init_worker,
+        ) as _pool:
+            _pending: Set[Future[Any]] = set()
+            _checks: Dict[Future[bool], Tuple[str, SharedGrid]] = {}
+            _job_mazes: Dict[Future[SearchStats], str] = {}
+            _mazes = iter(list_mazes(directory))
+            _more_mazes = True
+
+            # Only a few mazes are loaded ahead of the workers, so that
+            # the grids held in shared memory at once stay bounded,
+            # and the first results arrive without waiting for every maze.
+
+            _window = MAZES_PER_WORKER * (max_workers or os.cpu_count() or 1)
+
+            while True:
+                while _more_mazes and len(_shared) < _window:
+                    _filename = next(_mazes, None)
+                    if _filename is None:
+                        _more_mazes = False
+                        break
+
+                    # The components are labelled by a worker rather than here,
+                    # so that this process is free to hand out jobs and results.
+
+                    _maze = Maze(_filename, label_components=False)
+                    _shared_memory, _shared_grid = share_grid(_maze)
+                    _shared[_filename] = _shared_memory
+                    _future = _pool.submit(check_reachable, _shared_grid)
+                    _checks[_future] = (_filename, _shared_grid)
+                    _pending.add(_future)
+
+                if not _pending:
+                    break
+
+                _done, _pending = wait(_pending, return_when=FIRST_COMPLETED)
+                for _future in _done:
+                    if _future in _checks:
+                        _filename, _shared_grid = _checks.pop(_future)
+
+                        # Mazes whose goal cannot be reached are answered
+                        # without a search.
+
+                        if not _future.result():
+                            _release(_shared.pop(_filename))
+                            for _pattern in patterns:
+                                yield SearchStats(
+                                    _pattern, _filename, 0, [], [], 0.0, 0
+                                )
+                            continue
+
+                        _jobs_left[_filename] = len(patterns)
+                        for _pattern in patterns:
+                            _checkpoint = (
+                                None
+                                if checkpoint_dir is None
+                                else checkpoint_filename(
+                                    checkpoint_dir, _filename, _pattern
+                                )
+                            )
+                            _job = _pool.submit(
+                                solve_shared,
+                                _pattern,
+                                _shared_grid,
+                                reduce,
+                                budget,
+                                _checkpoint,
+                                checkpoint_interval,
+                            )
+                            _job_mazes[_job] = _filename
+                            _pending.add(_job)
+                        continue
+
+                    # Free each grid as soon as all of its jobs are done.
+
+                    _filename = _job_mazes.pop(_future)
+                    _jobs_left[_filename] -= 1
+                    if _jobs_left[_filename] == 0:
+                        del _jobs_left[_filename]
+                        _release(_shared.pop(_filename))
+
+                    yield _future.result()
+    finally:
+        for _shared_memory in _shared.values():
+            _release(_shared_memory)
+
+
+def _release(shared_memory: SharedMemory) -> None:
+    """
+    _release
+
+    Closes and removes a shared memory block.
+
+    Args:
+        shared_memory (SharedMemory): The block to release.
+    """
+    shared_memory.close()
+    shared_memory.unlink()
@@ -0,0 +1,198 @@
+"""
+The search benchmark module times the parallel breadth first search pattern on
+a large open grid, through the solver as any other search is run, with different
+numbers of worker processes, and reports how much faster each is than a single
+worker.
+
+The grid is built in memory, with the start and goal in opposite corners,
+so the search reaches every cell before it finds the goal.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from functools import partial
+from typing import List, Optional
+
+from app.maze import OPEN, Maze
+from app.search import Solver
+from app.search_loader import SearchLoader
+from app.search_parallel import band_rows
+
+DEFAULT_BENCHMARK_SIZE = 4096
+BENCHMARK_PATTERN = "Parallel Breadth First search"
+
+
+class BenchmarkResult:  # pylint: disable=too-few-public-methods
+    """
+    BenchmarkResult
+
+    The time taken by the parallel breadth first search with a number of workers.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        seconds: float,
+        num_explored: int,
+        path_length: int,
+        speedup: float,
+    ) -> None:
+        """
+        __init__
+
+        Initialises the benchmark result.
+
+        Args:
+            workers (int): The number of worker processes.
+            seconds (float): The fastest time taken to solve the grid.
+            num_explored (int): The number of cells expanded.
+            path_length (int): The number of steps in the path found.
+            speedup (float): How many times faster than a single worker.
+        """
+        self.workers: int = workers
+        self.seconds: float = seconds
+        self.num_explored: int = num_explored
+        self.path_length: int = path_length
+        self.speedup: float = speedup
+
+
+def open_grid(size: int) -> Maze:
+    """
+    open_grid
+
+    Builds a square maze with no walls, from the top left corner to the bottom right.
+
+    Args:
+        size (int): The number of rows and columns.
+
+    Returns:
+        Maze: The maze.
+    """
+    return Maze.from_grid(
+        bytearray([OPEN]) * (size * size),
+        size,
+        size,
+        (0, 0),
+        (size - 1, size - 1),
+        f"open {size} x {size}",
+    )
+
+
+def worker_counts(max_workers: Optional[int] = None) -> List[int]:
+    """
+    worker_counts
+
+    Returns the numbers of workers to time: the powers of two below
+    the most workers, followed by the most workers.
+
+    Args:
+        max_workers (Optional[int], optional): The most workers to time.
+            Defaults to one for each CPU.
+
+    Returns:
+        List[int]: The numbers of workers, smallest first.
+    """
+    _max_workers = max(max_workers or os.cpu_count() or 1, 1)
+    _counts = []
+    _count = 1
+    while _count < _max_workers:
+        _counts.append(_count)
+        _count *= 2
+    _counts.append(_max_workers)
+
+    return _counts
+
+
+def benchmark_parallel_search(
+    size: int = DEFAULT_BENCHMARK_SIZE,
+    max_workers: Optional[int] = None,
+    repeats: int = 1,
+) -> List[BenchmarkResult]:
+    """
+    benchmark_parallel_search
+
+    Times the parallel breadth first search of an open grid with one worker,
+    then with more, up to the most workers. Numbers of workers that would give
+    bands less than MIN_BAND_ROWS high are left out, as they are not used.
+
+    Args:
+        size (int, optional): The number of rows and columns in the grid.
+            Defaults to DEFAULT_BENCHMARK_SIZE.
+        max_workers (Optional[int], optional): The most workers to time.
+            Defaults to one for each CPU.
+        repeats (int, optional): The number of times to solve the grid with
+            each number of workers, keeping the fastest. Defaults to 1.
+
+    Returns:
+        List[BenchmarkResult]: The results, fewest workers first.
+    """
+    # Load the search type as the app does, rather than importing it here.
+
+    _search_loader = SearchLoader()
+    _search_loader.discover_search_modules()
+    _factory = _search_loader.get_search_pattern_factory(BENCHMARK_PATTERN)
+
+    _maze = open_grid(size)
+    _results: List[BenchmarkResult] = []
+    for _workers in worker_counts(max_workers):
+        if len(band_rows(size, _workers)) - 1 != _workers:
+            continue
+
+        _seconds = float("inf")
+        for _ in range(max(repeats, 1)):
+            _start = time.perf_counter()
+            _solution = Solver(partial(_factory, _workers), _maze).solve(
+                lambda *_args: None
+            )
+            _seconds = min(_seconds, time.perf_counter() - _start)
+
+        _results.append(
+            BenchmarkResult(
+                _workers,
+                _seconds,
+                _solution.num_explored,
+                len(_solution.cells),
+                _results[0].seconds / _seconds if _results else 1.0,
+            )
+        )
+
+    return _results
+
+
+def format_benchmark(results: List[BenchmarkResult]) -> str:
+    """
+    format_benchmark
+
+    Formats the benchmark results as a plain text table.
+
+    Args:
+        results (List[BenchmarkResult]): The results to show.
+
+    Returns:
+        str: The table.
+    """
+    _headings = ("Workers", "Explored", "Path", "Time (s)", "Speedup")
+    _rows = [
+        (
+            str(_result.workers),
+            str(_result.num_explored),
+            str(_result.path_length) if _result.path_length else "-",
+            f"{_result.seconds:.2f}",
+            f"{_result.speedup:.2f}x",
+        )
+        for _result in results
+    ]
+    _widths = [
+        max(len(_row[i]) for _row in [_headings, *_rows])
+        for i in range(len(_headings))
+    ]
+
+    _lines = [
+        "  ".join(_cell.rjust(_width) for _cell, _width in zip(_row, _widths))
+        for _row in [_headings, *_rows]
+    ]
+    _lines.insert(1, "  ".join("-" * _width for _width in _widths))
+
+    return "\n".join(_lines)
@@ -0,0 +1,153 @@
+"""
+The search budget module limits how long a search may run.
+
+A SearchBudget sets a time limit and a limit on the number of nodes expanded,
+and can be sent to worker processes. A CancellationToken lets another thread
+stop a search early. The solver checks both before each expansion, through a
+BudgetTracker started afresh for each search, and gives up once either runs out.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+
+class BudgetExhausted(Exception):
+    """
+    BudgetExhausted
+
+    Raised by searches nested within others, such as those that build the data
+    a search pattern needs, to stop the whole search when the budget runs out.
+    """
+
+
+class CancellationToken:
+    """
+    CancellationToken
+
+    Cancels a search from another thread. The search stops before its next expansion.
+    """
+
+    def __init__(self) -> None:
+        """
+        __init__
+
+        Initialises the token, not yet cancelled.
+        """
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        cancel
+
+        Asks the searches using this token to stop.
+        """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        cancelled
+
+        Returns:
+            bool: True if the token has been cancelled.
+        """
+        return self._cancelled.is_set()
+
+
+class SearchBudget:  # pylint: disable=too-few-public-methods
+    """
+    SearchBudget
+
+    The limits on a single search.
+    """
+
+    def __init__(
+        self, time_limit: Optional[float] = None, max_expansions: Optional[int] = None
+    ) -> None:
+        """
+        __init__
+
+        Initialises the budget.
+
+        Args:
+            time_limit (Optional[float], optional): The number of seconds
+                a search may run for. Defaults to no limit.
+            max_expansions (Optional[int], optional): The number of nodes
+                a search may expand. Defaults to no limit.
+        """
+        self.time_limit: Optional[float] = time_limit
+        self.max_expansions: Optional[int] = max_expansions
+
+
+class BudgetTracker:
+    """
+    BudgetTracker
+
+    Tracks what is left of a budget during a single search.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[SearchBudget] = None,
+        cancellation: Optional[CancellationToken] = None,
+    ) -> None:
+        """
+        __init__
+
+        Initialises the tracker, starting the clock.
+
+        Args:
+            budget (Optional[SearchBudget], optional): The limits on the search.
+                Defaults to no limits.
+            cancellation (Optional[CancellationToken], optional): Stops the search
+                early when cancelled. Defaults to None.
+        """
+        _budget = budget or SearchBudget()
+
+        self.deadline: Optional[float] = (
+            None
+            if _budget.time_limit is None
+            else time.monotonic() + _budget.time_limit
+        )
+        self.max_expansions: Optional[int] = _budget.max_expansions
+        self.cancellation: Optional[CancellationToken] = cancellation
+        self.num_expansions: int = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        exhausted
+
+        Returns:
+            bool: True if the search should stop.
+        """
+        return (
+            (
+                self.max_expansions is not None
+                and self.num_expansions >= self.max_expansions
+            )
+            or (self.deadline is not None and time.monotonic() >= self.deadline)
+            or (self.cancellation is not None and self.cancellation.cancelled)
+        )
+
+    def expand(self, count: int = 1) -> bool:
+        """
+        expand
+
+        Spends the budget for one or more expansions, if there is any left.
+
+        Args:
+            count (int, optional): The number of expansions. Defaults to 1.
+
+        Returns:
+            bool: True if the expansions may go ahead.
+        """
+        if self.exhausted:
+            return False
+
+        self.num_expansions += count
+
+        return True
@@ -0,0 +1,404 @@
+"""
+The search checkpoint module saves the state of a search part way through,
+so that a later search of the same maze can carry on from where it stopped.
+
+A checkpoint holds the nodes in the frontier, with the parents they lead back
+through, the cells explored and the number of nodes expanded. It is saved in a
+compact binary form: a small header, followed by the nodes and cells as arrays
+of whole numbers, compressed together with zlib. The header holds the content
+hash of the maze, so a checkpoint is never resumed against a different maze.
+
+A Checkpointer saves a search at intervals, when asked to, for instance from
+a signal handler, and when the search stops early. As the checkpoint holds all
+of the search state, the resumed search finds exactly the same solution.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from app.maze import Maze
+from app.search_pattern import Node, SearchPatternFactory
+
+CHECKPOINT_MAGIC = b"MZCK"
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+# magic, version, reduce, maze hash, cols, nodes expanded, nodes, frontier nodes,
+# cells explored and the length of the search pattern name.
+
+_HEADER = struct.Struct("<4sHB32sIIIIIH")
+
+# The actions are saved as their index in this tuple.
+
+_ACTIONS: Tuple[str, ...] = ("", "N", "S", "E", "W")
+
+Cell = Tuple[int, int]
+
+
+def pattern_id(search_pattern: SearchPatternFactory) -> str:
+    """
+    pattern_id
+
+    Returns a name for a search pattern factory, to check that a checkpoint
+    is resumed by the same search pattern that saved it.
+
+    Args:
+        search_pattern (SearchPatternFactory): The search pattern factory.
+
+    Returns:
+        str: The module and name of the factory.
+    """
+    _name = getattr(search_pattern, "__qualname__", type(search_pattern).__qualname__)
+
+    return f"{search_pattern.__module__}.{_name}"
+
+
+def _to_bytes(values: array[int]) -> bytes:
+    """
+    _to_bytes
+
+    Returns the bytes of an array, little endian whatever the platform.
+
+    Args:
+        values (array[int]): The array.
+
+    Returns:
+        bytes: The bytes.
+    """
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array[int]:
+    """
+    _from_bytes
+
+    Returns the array held in little endian bytes.
+
+    Args:
+        typecode (str): The type of the array.
+        data (bytes): The bytes.
+
+    Returns:
+        array[int]: The array.
+    """
+    _values = array(typecode)
+    _values.frombytes(data)
+    if sys.byteorder == "big":
+        _values.byteswap()
+
+    return _values
+
+
+class SearchCheckpoint:  # pylint: disable=too-few-public-methods
+    """
+    SearchCheckpoint
+
+    The state of a search part way through.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        content_hash: str,
+        pattern: str,
+        reduce: bool,
+        num_explored: int,
+        explored: List[Cell],
+        frontier: List[Node],
+    ) -> None:
+        """
+        __init__
+
+        Initialises the checkpoint.
+
+        Args:
+            content_hash (str): The content hash of the maze being searched.
+            pattern (str): The pattern_id of the search pattern.
+            reduce (bool): Whether the junction graph of the maze is being searched.
+            num_explored (int): The number of nodes removed from the frontier.
+            explored (List[Cell]): The cells explored, in order.
+            frontier (List[Node]): The nodes in the frontier, in the order
+                the search pattern keeps them.
+        """
+        self.content_hash: str = content_hash
+        self.pattern: str = pattern
+        self.reduce: bool = reduce
+        self.num_explored: int = num_explored
+        self.explored: List[Cell] = explored
+        self.frontier: List[Node] = frontier
+
+    def save(self, filename: str, cols: int) -> None:
+        """
+        save
+
+        Saves the checkpoint, replacing the file only once it is complete,
+        so that a search stopped while saving keeps its previous checkpoint.
+
+        Args:
+            filename (str): The file to save to.
+            cols (int): The number of columns in the maze.
+        """
+        # Number the nodes, parents first, so each can refer to its parent.
+
+        _ids: Dict[int, int] = {}
+        _nodes: List[Node] = []
+        for _node in self.frontier:
+            _chain: List[Node] = []
+            _next: Optional[Node] = _node
+            while _next is not None and id(_next) not in _ids:
+                _chain.append(_next)
+                _next = _next.parent
+            for _ancestor in reversed(_chain):
+                _ids[id(_ancestor)] = len(_nodes)
+                _nodes.append(_ancestor)
+
+        _cells = [_node.state for _node in _nodes]
+        _body = b"".join(
+            (
+                _to_bytes(array("I", (_row * cols + _col for _row, _col in _cells))),
+                _to_bytes(
+                    array(
+                        "i",
+                        (
+                            -1 if _node.parent is None else _ids[id(_node.parent)]
+                            for _node in _nodes
+                        ),
+                    )
+                ),
+                _to_bytes(array("i", (_node.manhattan for _node in _nodes))),
+                _to_bytes(array("i", (_node.cost for _node in _nodes))),
+                bytes(_ACTIONS.index(_node.action) for _node in _nodes),
+                _to_bytes(array("I", (_ids[id(_node)] for _node in self.frontier))),
+                _to_bytes(
+                    array("I", (_row * cols + _col for _row, _col in self.explored))
+                ),
+            )
+        )
+        _pattern = self.pattern.encode("utf-8")
+        _header = _HEADER.pack(
+            CHECKPOINT_MAGIC,
+            CHECKPOINT_VERSION,
+            self.reduce,
+            bytes.fromhex(self.content_hash),
+            cols,
+            self.num_explored,
+            len(_nodes),
+            len(self.frontier),
+            len(self.explored),
+            len(_pattern),
+        )
+
+        _temporary = filename + ".tmp"
+        with open(_temporary, "wb") as f:
+            f.write(_header)
+            f.write(_pattern)
+            f.write(zlib.compress(_body))
+        os.replace(_temporary, filename)
+
+    @classmethod
+    def load(cls, filename: str) -> SearchCheckpoint:  # pylint: disable=too-many-locals
+        """
+        load
+
+        Loads a checkpoint saved by save().
+
+        Args:
+            filename (str): The file to load.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not a checkpoint, or was saved
+                by a different version.
+
+        Returns:
+            SearchCheckpoint: The checkpoint.
+        """
+        try:
+            with open(filename, "rb") as f:
+                _data = f.read()
+        except FileNotFoundError as err:
+            raise FileNotFoundError(f"Checkpoint '{filename}' not found.") from err
+
+        try:
+            (
+                _magic,
+                _version,
+                _reduce,
+                _hash,
+                _cols,
+                _num_explored,
+                _num_nodes,
+                _num_frontier,
+                _num_cells,
+                _pattern_length,
+            ) = _HEADER.unpack_from(_data)
+            if _magic != CHECKPOINT_MAGIC:
+                raise ValueError(f"'{filename}' is not a checkpoint.")
+            if _version != CHECKPOINT_VERSION:
+                raise ValueError(
+                    f"Checkpoint '{filename}' is version {_version}, "
+                    + f"expected {CHECKPOINT_VERSION}."
+                )
+            _offset = _HEADER.size + _pattern_length
+            _pattern = _data[_HEADER.size : _offset].decode("utf-8")
+            _body = zlib.decompress(_data[_offset:])
+        except (struct.error, zlib.error, UnicodeDecodeError) as err:
+            raise ValueError(f"Checkpoint '{filename}' is damaged.") from err
+
+        # Split the body back into its arrays.
+
+        _parts: List[array[int]] = []
+        _offset = 0
+        for _typecode, _length in (
+            ("I", _num_nodes),
+            ("i", _num_nodes),
+            ("i", _num_nodes),
+            ("i", _num_nodes),
+            ("B", _num_nodes),
+            ("I", _num_frontier),
+            ("I", _num_cells),
+        ):
+            _size = array(_typecode).itemsize * _length
+            _parts.append(_from_bytes(_typecode, _body[_offset : _offset + _size]))
+            _offset += _size
+        if _offset != len(_body):
+            raise ValueError(f"Checkpoint '{filename}' is damaged.")
+        _cells, _parents, _heuristics, _costs, _actions, _frontier, _explored = _parts
+
+        _nodes: List[Node] = []
+        for _index, _cell in enumerate(_cells):
+            _parent = _parents[_index]
+            _nodes.append(
+                Node(
+                    state=divmod(_cell, _cols),
+                    parent=None if _parent < 0 else _nodes[_parent],
+                    action=_ACTIONS[_actions[_index]],
+                    manhattan=_heuristics[_index],
+                    cost=_costs[_index],
+                )
+            )
+
+        return cls(
+            _hash.hex(),
+            _pattern,
+            bool(_reduce),
+            _num_explored,
+            [divmod(_cell, _cols) for _cell in _explored],
+            [_nodes[_id] for _id in _frontier],
+        )
+
+
+class Checkpointer:
+    """
+    Checkpointer
+
+    Saves the checkpoints of a search to a file, and resumes from them.
+    """
+
+    def __init__(self, filename: str, interval: Optional[float] = None) -> None:
+        """
+        __init__
+
+        Initialises the checkpointer.
+
+        Args:
+            filename (str): The file to save the checkpoints to.
+            interval (Optional[float], optional): The number of seconds between
+                checkpoints. Defaults to only saving when asked to,
+                or when the search stops early.
+        """
+        self.filename: str = filename
+        self.interval: Optional[float] = interval
+        self._requested = threading.Event()
+        self._last_saved = time.monotonic()
+
+    def request(self) -> None:
+        """
+        request
+
+        Asks for a checkpoint before the next expansion.
+        This is safe to call from a signal handler or another thread.
+        """
+        self._requested.set()
+
+    def due(self) -> bool:
+        """
+        due
+
+        Checks if it is time to save a checkpoint.
+
+        Returns:
+            bool: True if a checkpoint has been asked for, or the interval has passed.
+        """
+        return self._requested.is_set() or (
+            self.interval is not None
+            and time.monotonic() - self._last_saved >= self.interval
+        )
+
+    def save(self, checkpoint: SearchCheckpoint, maze: Maze) -> None:
+        """
+        save
+
+        Saves a checkpoint of a search of a maze.
+
+        Args:
+            checkpoint (SearchCheckpoint): The checkpoint.
+            maze (Maze): The maze being searched.
+        """
+        self._requested.clear()
+        checkpoint.save(self.filename, maze.cols)
+        self._last_saved = time.monotonic()
+
+    def resume(
+        self, maze: Maze, pattern: str, reduce: bool
+    ) -> Optional[SearchCheckpoint]:
+        """
+        resume
+
+        Loads the checkpoint to resume a search from, if there is one
+        and it was saved by the same search of the same maze.
+
+        Args:
+            maze (Maze): The maze being searched.
+            pattern (str): The pattern_id of the search pattern.
+            reduce (bool): Whether the junction graph of the maze is being searched.
+
+        Returns:
+            Optional[SearchCheckpoint]: The checkpoint, or None to start afresh.
+        """
+        if not os.path.isfile(self.filename):
+            return None
+
+        try:
+            _checkpoint = SearchCheckpoint.load(self.filename)
+        except ValueError:
+            return None
+
+        if (_checkpoint.content_hash, _checkpoint.pattern, _checkpoint.reduce) != (
+            maze.content_hash(),
+            pattern,
+            reduce,
+        ):
+            return None
+
+        return _checkpoint
+
+    def remove(self) -> None:
+        """
+        remove
+
+        Removes the checkpoint, once the search it belongs to has finished.
+        """
+        if os.path.isfile(self.filename):
+            os.remove(self.filename)
@@ -0,0 +1,421 @@
+"""
+The search compare module runs every registered search pattern against the same
+maze at once, each in its own worker process, and gathers the results into a table.
+The workers either load the maze file themselves, or, for a maze that may have
+been edited since it was loaded, read its compact grid from shared memory.
+
+As the patterns run side by side, a full comparison takes about as long
+as the slowest pattern rather than the sum of all of them.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple, Union
+
+from app.maze import Maze
+from app.search import Solver
+from app.search_budget import CancellationToken, SearchBudget
+from app.search_checkpoint import Checkpointer
+from app.search_loader import SearchLoader
+from app.search_pattern import SearchPatternFactory
+
+
+class SearchStats:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """
+    SearchStats
+
+    The measurements taken from one search pattern solving one maze.
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        maze: str,
+        num_explored: int,
+        cells: List[Tuple[int, int]],
+        explored: List[Tuple[int, int]],
+        seconds: float,
+        peak_memory: int,
+        path_cost: int = 0,
+        exhausted: bool = False,
+    ) -> None:
+        """
+        __init__
+
+        Initialises the search statistics.
+
+        Args:
+            pattern (str): The name of the search pattern.
+            maze (str): The maze file that was solved.
+            num_explored (int): The number of nodes explored.
+            cells (List[Tuple[int, int]]): The cells that make up the solution.
+            explored (List[Tuple[int, int]]): The cells explored.
+            seconds (float): The time taken to solve the maze.
+            peak_memory (int): The peak memory allocated while solving, in bytes.
+            path_cost (int, optional): The cost of following the solution,
+                which differs from its length on weighted mazes. Defaults to 0.
+            exhausted (bool, optional): True if the search ran out of budget.
+                Defaults to False.
+        """
+        self.pattern: str = pattern
+        self.maze: str = maze
+        self.num_explored: int = num_explored
+        self.cells: List[Tuple[int, int]] = cells
+        self.explored: List[Tuple[int, int]] = explored
+        self.seconds: float = seconds
+        self.peak_memory: int = peak_memory
+        self.path_cost: int = path_cost
+        self.exhausted: bool = exhausted
+
+    @property
+    def path_length(self) -> int:
+        """
+        path_length
+
+        Returns:
+            int: The number of steps in the solution, 0 if there is none.
+        """
+        return len(self.cells)
+
+
+def _ignore_progress(*_args: object) -> None:
+    """
+    _ignore_progress
+
+    A show_solution callback that discards the search progress,
+    used when searching without a GUI.
+    """
+
+
+class SharedGrid:  # pylint: disable=too-few-public-methods
+    """
+    SharedGrid
+
+    The description of a maze whose compact grid is held in shared memory,
+    small enough to be sent to a worker process with each job.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maze: Maze,
+    ) -> None:
+        """
+        __init__
+
+        Initialises the shared grid description.
+
+        Args:
+            name (str): The name of the shared memory block holding the grid.
+            maze (Maze): The maze the grid belongs to.
+        """
+        self.name: str = name
+        self.filename: str = maze.filename
+        self.rows: int = maze.rows
+        self.cols: int = maze.cols
+        self.start: Tuple[int, int] = maze.start
+        self.goal: Tuple[int, int] = maze.goal
+
+
+def share_grid(maze: Maze) -> Tuple[SharedMemory, SharedGrid]:
+    """
+    share_grid
+
+    Copies the compact grid of a maze into a new shared memory block.
+    The caller is responsible for closing and unlinking the block.
+
+    Args:
+        maze (Maze): The maze to share.
+
+    Returns:
+        Tuple[SharedMemory, SharedGrid]: The shared memory block,
+            and its description to send to the workers.
+    """
+    _shared_memory = SharedMemory(create=True, size=max(len(maze.grid), 1))
+    _shared_memory.buf[: len(maze.grid)] = maze.grid
+
+    return _shared_memory, SharedGrid(_shared_memory.name, maze)
+
+
+def measure_search(
+    pattern: str,
+    maze_filename: str,
+    reduce: bool = False,
+    budget: Optional[SearchBudget] = None,
+) -> SearchStats:
+    """
+    measure_search
+
+    Solves a maze with a single search pattern and measures the search.
+    This is run in the worker processes, so it loads its own maze and pattern.
+
+    Args:
+        pattern (str): The name of the search pattern to use.
+        maze_filename (str): The maze file to solve.
+        reduce (bool, optional): Whether to search the junction graph
+            of the maze. Defaults to False.
+        budget (Optional[SearchBudget], optional): The limits on the search.
+            Defaults to no limits.
+
+    Returns:
+        SearchStats: The measurements taken.
+    """
+    _search_loader = SearchLoader()
+    _search_loader.discover_search_modules()
+
+    return solve_and_measure(
+        pattern,
+        _search_loader.get_search_pattern_factory(pattern),
+        Maze(maze_filename),
+        reduce=reduce,
+        budget=budget,
+    )
+
+
+def solve_and_measure(  # pylint: disable=too-many-arguments
+    pattern: str,
+    search_pattern: SearchPatternFactory,
+    maze: Maze,
+    trace_memory: bool = True,
+    reduce: bool = False,
+    budget: Optional[SearchBudget] = None,
+    cancellation: Optional[CancellationToken] = None,
+    checkpoint: Optional[Checkpointer] = None,
+) -> SearchStats:
+    """
+    solve_and_measure
+
+    Solves a maze with a search pattern and measures the search.
+
+    Args:
+        pattern (str): The name of the search pattern.
+        search_pattern (SearchPatternFactory): Creates the search pattern to use.
+        maze (Maze): The maze to solve.
+        trace_memory (bool, optional): Whether to measure the peak memory,
+            in a second search that is not timed. Defaults to True.
+        reduce (bool, optional): Whether to search the junction graph
+            of the maze. Defaults to False.
+        budget (Optional[SearchBudget], optional): The limits on the search.
+            Defaults to no limits.
+        cancellation (Optional[CancellationToken], optional): Stops the search
+            early when cancelled. Defaults to None.
+        checkpoint (Optional[Checkpointer], optional): Saves the state of the
+            search, and resumes from it. Defaults to None.
+
+    Returns:
+        SearchStats: The measurements taken.
+    """
+    _solver = Solver(
+        search_pattern,
+        maze,
+        reduce=reduce,
+        budget=budget,
+        cancellation=cancellation,
+        checkpoint=checkpoint,
+    )
+
+    _start = time.perf_counter()
+    _solution = _solver.solve(_ignore_progress)
+    _seconds = time.perf_counter() - _start
+
+    # Tracing memory slows each search pattern down by a different amount, so the
+    # peak memory is measured in a second search, of a copy of the maze, so that
+    # it builds the same derived data and starts from scratch as the first did.
+
+    _peak_memory = 0
+    if trace_memory:
+        _copy = Maze.from_grid(
+            bytearray(maze.grid),
+            maze.rows,
+            maze.cols,
+            maze.start,
+            maze.goal,
+            maze.filename,
+        )
+        _memory_solver = Solver(
+            search_pattern,
+            _copy,
+            reduce=reduce,
+            budget=budget,
+            cancellation=cancellation,
+        )
+        tracemalloc.start()
+        try:
+            _memory_solver.solve(_ignore_progress)
+            _peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # Add up the cost of each step of the solution.
+
+    _path_cost = 0
+    _previous = maze.get_start()
+    for _cell in _solution.cells:
+        _path_cost += maze.get_step_cost(_previous, _cell)
+        _previous = _cell
+
+    return SearchStats(
+        pattern=pattern,
+        maze=maze.filename,
+        num_explored=_solution.num_explored,
+        cells=_solution.cells,
+        explored=_solution.explored,
+        seconds=_seconds,
+        peak_memory=_peak_memory,
+        path_cost=_path_cost,
+        exhausted=_solution.exhausted,
+    )
+
+
+def measure_shared(
+    pattern: str,
+    shared_grid: SharedGrid,
+    reduce: bool = False,
+    budget: Optional[SearchBudget] = None,
+) -> SearchStats:
+    """
+    measure_shared
+
+    Solves a maze held in shared memory with a single search pattern
+    and measures the search. This is run in the worker processes.
+
+    Args:
+        pattern (str): The name of the search pattern to use.
+        shared_grid (SharedGrid): The maze to solve.
+        reduce (bool, optional): Whether to search the junction graph
+            of the maze. Defaults to False.
+        budget (Optional[SearchBudget], optional): The limits on the search.
+            Defaults to no limits.
+
+    Returns:
+        SearchStats: The measurements taken.
+    """
+    _search_loader = SearchLoader()
+    _search_loader.discover_search_modules()
+
+    # The workers share the resource tracker of the parent process, which
+    # created the block, so attaching here does not take ownership of it.
+
+    _shared_memory = SharedMemory(shared_grid.name)
+    _grid = _shared_memory.buf[: shared_grid.rows * shared_grid.cols]
+    try:
+        return solve_and_measure(
+            pattern,
+            _search_loader.get_search_pattern_factory(pattern),
+            Maze.from_grid(
+                _grid,
+                shared_grid.rows,
+                shared_grid.cols,
+                shared_grid.start,
+                shared_grid.goal,
+                shared_grid.filename,
+            ),
+            reduce=reduce,
+            budget=budget,
+        )
+    finally:
+        _grid.release()
+        _shared_memory.close()
+
+
+def compare_search_patterns(
+    maze: Union[str, Maze],
+    patterns: List[str],
+    max_workers: Optional[int] = None,
+    reduce: bool = False,
+    budget: Optional[SearchBudget] = None,
+) -> List[SearchStats]:
+    """
+    compare_search_patterns
+
+    Solves the same maze with each of the given search patterns at once,
+    in a process pool.
+
+    Args:
+        maze (Union[str, Maze]): The maze file to solve, which each worker loads,
+            or a maze, which may have been changed since it was loaded,
+            whose grid is sent to the workers in shared memory.
+        patterns (List[str]): The names of the search patterns to compare.
+        max_workers (Optional[int], optional): The number of worker processes.
+            Defaults to one per search pattern.
+        reduce (bool, optional): Whether to search the junction graph
+            of the maze. Defaults to False.
+        budget (Optional[SearchBudget], optional): The limits on each search.
+            Defaults to no limits.
+
+    Returns:
+        List[SearchStats]: The measurements, in the order the patterns were given.
+    """
+    if not patterns:
+        return []
+
+    _shared_memory: Optional[SharedMemory] = None
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers or len(patterns)) as _pool:
+            if isinstance(maze, Maze):
+                _shared_memory, _shared_grid = share_grid(maze)
+                _futures = [
+                    _pool.submit(measure_shared, _pattern, _shared_grid, reduce, budget)
+                    for _pattern in patterns
+                ]
+            else:
+                _futures = [
+                    _pool.submit(measure_search, _pattern, maze, reduce, budget)
+                    for _pattern in patterns
+                ]
+            return [_future.result() for _future in _futures]
+    finally:
+        if _shared_memory is not None:
+            _shared_memory.close()
+            _shared_memory.unlink()
+
+
+def format_comparison(results: List[SearchStats]) -> str:
+    """
+    format_comparison
+
+    Formats the comparison results as a plain text table.
+    The search patterns that ran out of budget are marked with a *.
+
+    Args:
+        results (List[SearchStats]): The measurements to show.
+
+    Returns:
+        str: The table.
+    """
+    _headings = (
+        "Search pattern",
+        "Explored",
+        "Path",
+        "Cost",
+        "Time (ms)",
+        "Memory (KiB)",
+    )
+    _rows = [
+        (
+            _stats.pattern + (" *" if _stats.exhausted else ""),
+            str(_stats.num_explored),
+            str(_stats.path_length) if _stats.path_length else "-",
+            str(_stats.path_cost) if _stats.path_length else "-",
+            f"{_stats.seconds * 1000:.2f}",
+            f"{_stats.peak_memory / 1024:.1f}",
+        )
+        for _stats in results
+    ]
+    _widths = [
+        max(len(_row[i]) for _row in [_headings, *_rows])
+        for i in range(len(_headings))
+    ]
+
+    _lines = []
+    for _row in [_headings, *_rows]:
+        _cells = [_row[0].ljust(_widths[0])]
+        _cells += [_cell.rjust(_width) for _cell, _width in zip(_row[1:], _widths[1:])]
+        _lines.append("  ".join(_cells))
+    _lines.insert(1, "  ".join("-" * _width for _width in _widths))
+
+    return "\n".join(_lines)
@@ -8,12 +8,36 @@ using the customtkinter library.
 # So we need tell Pylance and Pylint to ignore certain issues in this file:
 # pyright: reportUnknownMemberType=false, reportMissingTypeStubs=false
 
-from typing import Callable
-
-from customtkinter import CTk, CTkButton, CTkFrame, CTkLabel, CTkOptionMenu, StringVar
+from tkinter import PhotoImage
+from typing import Callable, List, Optional, Tuple
+
+from customtkinter import (
+    CTk,
+    CTkButton,
+    CTkFrame,
+    CTkLabel,
+    CTkOptionMenu,
+    CTkSlider,
+    CTkToplevel,
+    StringVar,
+)
 from customtkinter.windows.widgets.core_rendering.ctk_canvas import CTkCanvas
 
+from app.maze import Maze
+from app.search_compare import SearchStats
+from app.search_trace import EXPANDED, FRONTIER, TraceFrames, TraceReader
+
 TITLE = "Maze Search v.1.0.0"
+OVERLAY_CELL_SIZE = 6
+REPLAY_SIZE = 600  # The largest size of the replayed maze, in pixels.
+REPLAY_TICK = 20  # The time between the steps of a replay, in milliseconds.
+
+# The colours of a replay, the same as those the search is shown with as it runs.
+
+REPLAY_COLOURS = {
+    FRONTIER: "#7A9EB1",
+    EXPANDED: "#7C9A6D",
+}
 
 
 class SearchGUI:  # pylint: disable=too-many-instance-attributes
@@ -28,12 +52,20 @@ class SearchGUI:  # pylint: disable=too-many-instance-attributes
         master,  # type: ignore[reportUnknownParameterType]
         start_button_action: Callable[[str], None],
         data_pool=None,  # type: ignore[reportUnknownParameterType]
+        compare_button_action: Optional[Callable[[], None]] = None,
+        toggle_wall_action: Optional[Callable[[int, int], bool]] = None,
     ) -> None:  # type: ignore[reportUnknownParameterType]
 
         # Just so pylance and pylint don't conplain.
 
         self.master = master
         self.start_button_action: Callable[[str], None] = start_button_action
+        self.compare_button_action: Optional[Callable[[], None]] = (
+            compare_button_action
+        )
+        self.toggle_wall_action: Optional[Callable[[int, int], bool]] = (
+            toggle_wall_action
+        )
         self.data_pool = data_pool
 
         self.selected_a_search_pattern: bool = False
@@ -61,6 +93,7 @@ class SearchGUI:  # pylint: disable=too-many-instance-attributes
         self.canvas = CTkCanvas(ctkframe1, name="canvas")
         self.canvas.configure(background="white", height=600, width=600)
         self.canvas.grid(column=0, padx=10, pady="10 5", row=0, sticky="nsew")
+        self.canvas.bind("<Button-1>", self.click_cell)
 
         for x in range(0, 620, 20):
             self.canvas.create_line(x, 0, x, 620, fill="lightgrey", width=1)
@@ -72,7 +105,7 @@ class SearchGUI:  # pylint: disable=too-many-instance-attributes
         self.search_pattern = CTkOptionMenu(
             ctkframe2, variable=self.selected_search_pattern
         )
-        self.search_pattern.configure(width=400)
+        self.search_pattern.configure(width=300)
         self.search_pattern.grid(column=0, padx=10, pady=5, row=0, sticky="ew")
         self.search_pattern.configure(command=self.select_search_pattern)
 
@@ -81,6 +114,11 @@ class SearchGUI:  # pylint: disable=too-many-instance-attributes
         self.search.grid(column=2, padx=10, pady=5, row=0)
         self.search.configure(command=self.start_search)
 
+        self.compare = CTkButton(ctkframe2)
+        self.compare.configure(text="Compare all")
+        self.compare.grid(column=1, padx=10, pady=5, row=0, sticky="e")
+        self.compare.configure(command=self.start_compare)
+
         self.status_bar = CTkFrame(ctkframe2)
         self.status_bar.configure(height=30)
         self.status_bar.grid(
@@ -128,6 +166,115 @@ class SearchGUI:  # pylint: disable=too-many-instance-attributes
         else:
             self.message("Select a search pattern")
 
+    def click_cell(self, event) -> None:  # type: ignore[reportUnknownParameterType]
+        """
+        click_cell
+
+        Executed when the maze is clicked, to toggle the wall under the pointer.
+        If a search pattern is selected the search is repeated straight away.
+
+        Args:
+            event (Event): The click event.
+        """
+        if self.toggle_wall_action is None:
+            return
+
+        if self.toggle_wall_action(event.y // 20, event.x // 20):
+            self.draw_maze(self.maze)
+            if self.selected_a_search_pattern:
+                self.start_search()
+
+    def start_compare(self):
+        """
+        start_compare
+
+        Executed when the compare button is pressed.
+        """
+        if self.compare_button_action is not None:
+            self.message("Comparing all search patterns...")
+            self.mainwindow.update()
+            self.compare_button_action()
+
+    def show_comparison(self, results: List[SearchStats]) -> None:
+        """
+        show_comparison
+
+        Shows the results of comparing the search patterns
+        as small side by side overlays in a separate window.
+
+        Args:
+            results (List[SearchStats]): The measurements to show.
+        """
+        _window = CTkToplevel(self.mainwindow)
+        _window.title(f"{TITLE} - Comparison")
+        _window.attributes("-topmost", True)
+
+        _rows = len(self.maze)
+        _cols = max((len(_row) for _row in self.maze), default=0)
+
+        for _index, _stats in enumerate(results):
+            _frame = CTkFrame(_window)
+            _frame.grid(column=_index, padx=5, pady=5, row=0, sticky="n")
+
+            _canvas = CTkCanvas(_frame)
+            _canvas.configure(
+                background="white",
+                height=_rows * OVERLAY_CELL_SIZE,
+                width=_cols * OVERLAY_CELL_SIZE,
+            )
+            _canvas.grid(column=0, padx=5, pady=5, row=0)
+
+            for i, _row in enumerate(self.maze):
+                for j, _col in enumerate(_row):
+                    if _col == "*":
+                        self._fill_overlay_cell(_canvas, i, j, "lightgrey")
+                    if _col in ("A", "B"):
+                        self._fill_overlay_cell(_canvas, i, j, "grey")
+            for _row, _col in _stats.explored:
+                if self.maze[_row][_col] not in ("A", "B"):
+                    self._fill_overlay_cell(_canvas, _row, _col, "#7A9EB1")
+            for _row, _col in _stats.cells:
+                if self.maze[_row][_col] not in ("A", "B"):
+                    self._fill_overlay_cell(_canvas, _row, _col, "#C17E7E")
+
+            _path = str(_stats.path_length) if _stats.path_length else "-"
+            _label = CTkLabel(
+                _frame,
+                justify="left",
+                text=f"{_stats.pattern}\n"
+                + f"Explored: {_stats.num_explored}\n"
+                + f"Path: {_path}\n"
+                + f"Time: {_stats.seconds * 1000:.2f} ms\n"
+                + f"Memory: {_stats.peak_memory / 1024:.1f} KiB",
+            )
+            _label.grid(column=0, padx=5, pady=5, row=1, sticky="w")
+
+    def _fill_overlay_cell(
+        self, canvas: CTkCanvas, row: int, col: int, colour: str
+    ) -> None:
+        """
+        _fill_overlay_cell
+
+        Fills a cell of a comparison overlay with the specified colour.
+
+        Args:
+            canvas (CTkCanvas): the overlay canvas.
+            row (int): the row of the cell (zero based).
+            col (int): the column of the cell (zero based).
+            colour (str): the colour to fill with.
+        """
+        _row: int = row * OVERLAY_CELL_SIZE
+        _col: int = col * OVERLAY_CELL_SIZE
+
+        canvas.create_rectangle(
+            _col,
+            _row,
+            _col + OVERLAY_CELL_SIZE,
+            _row + OVERLAY_CELL_SIZE,
+            fill=colour,
+            width=0,
+        )
+
     def draw_maze(self, maze: list[list[str]]) -> None:
         """
         draw_maze
@@ -148,6 +295,11 @@ class SearchGUI:  # pylint: disable=too-many-instance-attributes
                     self.fill_cell(i + 1, j + 1, "grey")
                     self.label_cell(i + 1, j + 1, _col, "white")
 
+                # Terrain is labelled with the cost of stepping onto it.
+
+                if _col in "23456789":
+                    self.label_cell(i + 1, j + 1, _col, "darkgrey")
+
         self.canvas.update()
 
     def fill_cell(self, row: int, col: int, colour: str) -> None:
@@ -217,3 +369,206 @@ class SearchGUI:  # pylint: disable=too-many-instance-attributes
         # Start the GUI.
 
         self.mainwindow.mainloop()
+
+
+class ReplayGUI:  # pylint: disable=too-many-instance-attributes
+    """
+    ReplayGUI
+
+    Replays a search trace, with a slider to scrub through the steps
+    and buttons to play and fast forward.
+    """
+
+    def __init__(self, reader: TraceReader) -> None:
+        """
+        __init__
+
+        Builds the replay window for a trace.
+
+        Args:
+            reader (TraceReader): The trace to replay.
+        """
+        self.reader: TraceReader = reader
+        self.maze: Maze = reader.maze()
+        self.frames: TraceFrames = TraceFrames(reader)
+        self.cell_size: int = max(
+            1, min(20, REPLAY_SIZE // max(self.maze.rows, self.maze.cols, 1))
+        )
+        self.step: int = 0
+        self.speed: int = 0
+
+        # Playing moves through about a thousand steps, whatever the trace length.
+
+        self.play_steps: int = max(1, reader.num_expansions // 1000)
+
+        # build ui.
+
+        ctk1 = CTk(None)
+        ctk1.title(f"{TITLE} - Replay - {reader.pattern}")
+        ctk1.resizable(False, False)
+
+        self.image = PhotoImage(
+            width=self.maze.cols * self.cell_size,
+            height=self.maze.rows * self.cell_size,
+        )
+        self.canvas = CTkCanvas(ctk1, name="canvas")
+        self.canvas.configure(
+            background="white",
+            height=self.maze.rows * self.cell_size,
+            width=self.maze.cols * self.cell_size,
+            highlightthickness=0,
+        )
+        self.canvas.grid(column=0, columnspan=4, padx=10, pady="10 5", row=0)
+        self.canvas.create_image(0, 0, anchor="nw", image=self.image)
+
+        self.slider = CTkSlider(
+            ctk1,
+            from_=0,
+            to=max(reader.num_expansions, 1),
+            number_of_steps=max(reader.num_expansions, 1),
+            command=self.seek,
+        )
+        self.slider.set(0)
+        self.slider.grid(column=0, columnspan=4, padx=10, pady=5, row=1, sticky="ew")
+
+        for _column, (_text, _speed) in enumerate(
+            (("Play", 1), ("Fast forward", 10), ("Pause", 0))
+        ):
+            _button = CTkButton(ctk1, text=_text)
+            _button.configure(command=lambda speed=_speed: self.play(speed))
+            _button.grid(column=_column, padx=10, pady=5, row=2)
+
+        self.status_text = CTkLabel(ctk1, text=TITLE)
+        self.status_text.grid(column=3, padx=10, pady="5 10", row=2, sticky="e")
+
+        # Main widget.
+
+        self.mainwindow = ctk1
+        self.draw_maze()
+
+    def draw_maze(self) -> None:
+        """
+        draw_maze
+
+        Draws the maze, with the search as it was at the current step.
+        """
+        # Draw a row of cells at a time, as a row of pixels repeated.
+
+        for _row in range(self.maze.rows):
+            _pixels = " ".join(
+                " ".join([self._cell_colour((_row, _col))] * self.cell_size)
+                for _col in range(self.maze.cols)
+            )
+            self.image.put(
+                " ".join([f"{{{_pixels}}}"] * self.cell_size),
+                to=(0, _row * self.cell_size),
+            )
+        self.fill_cell(self.maze.start, "grey")
+        self.fill_cell(self.maze.goal, "grey")
+
+    def _cell_colour(self, cell: Tuple[int, int]) -> str:
+        """
+        _cell_colour
+
+        Args:
+            cell (Tuple[int, int]): the cell (row, col).
+
+        Returns:
+            str: The colour of the cell at the current step, ignoring the path.
+        """
+        if self.maze.is_wall(cell):
+            return "lightgrey"
+        if cell in (self.maze.start, self.maze.goal):
+            return "grey"
+
+        return REPLAY_COLOURS.get(self.frames.state(cell), "white")
+
+    def fill_cell(self, cell: Tuple[int, int], colour: str) -> None:
+        """
+        fill_cell
+
+        Fills a given cell with the specified colour.
+
+        Args:
+            cell (Tuple[int, int]): the cell (row, col).
+            colour (str): the colour to fill with.
+        """
+        _row: int = cell[0] * self.cell_size
+        _col: int = cell[1] * self.cell_size
+
+        self.image.put(
+            colour, to=(_col, _row, _col + self.cell_size, _row + self.cell_size)
+        )
+
+    def seek(self, value: float) -> None:
+        """
+        seek
+
+        Shows the search as it was at a step. Moving forwards only draws
+        the steps in between. Moving backwards draws the search again from
+        the nearest keyframe, replaying no more than a few chunks of the trace.
+
+        Args:
+            value (float): The step to show.
+        """
+        _step = int(value)
+        _restored, _events = self.frames.seek(_step)
+        if _restored:
+            self.draw_maze()
+        else:
+            for _kind, _cell in _events:
+                if _cell not in (self.maze.start, self.maze.goal):
+                    self.fill_cell(_cell, self._cell_colour(_cell))
+
+        self.step = _step
+        if _step >= self.reader.num_expansions:
+            for _cell in self.reader.path():
+                if _cell not in (self.maze.start, self.maze.goal):
+                    self.fill_cell(_cell, "#C17E7E")
+
+        self.status_text.configure(
+            text=f"Step {_step} of {self.reader.num_expansions}"
+        )
+
+    def play(self, speed: int) -> None:
+        """
+        play
+
+        Plays the replay forwards at a speed, or pauses it.
+
+        Args:
+            speed (int): How many times faster than normal to play, 0 to pause.
+        """
+        _playing = self.speed > 0
+        self.speed = speed
+        if speed > 0 and not _playing:
+            self.mainwindow.after(REPLAY_TICK, self._tick)
+
+    def _tick(self) -> None:
+        """
+        _tick
+
+        Moves the replay on while it is playing.
+        """
+        if self.speed == 0:
+            return
+
+        _step = min(
+            self.step + self.play_steps * self.speed, self.reader.num_expansions
+        )
+        self.slider.set(_step)
+        self.seek(_step)
+        if _step >= self.reader.num_expansions:
+            self.speed = 0
+            return
+
+        self.mainwindow.after(REPLAY_TICK, self._tick)
+
+    def run(self) -> None:
+        """
+        run
+
+        Runs the replay GUI.
+        """
+        self.seek(0)
+        self.mainwindow.mainloop()
@@ -1,13 +1,99 @@
 """
 The search_loader module provides functions to dynamically load search type modules,
 and to list the registered functions.
+
+Discovery is lazy. The search type modules in the 'search_types' directory are
+only read for their module level NAME constant, and external packages can add
+search types through the 'maze.search_types' entry point group, named after
+the search type. A search type is only imported the first time it is asked for.
+
+Search types register a search pattern factory, and a new search pattern is
+created from it for each search, so one loader can serve many threads at once.
 """
 
+import ast
 import importlib
 import os
-from typing import Dict
+import threading
+from functools import partial
+from importlib.metadata import EntryPoint, entry_points
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from app.search_pattern import SearchPattern, SearchPatternFactory, as_factory
+
+ENTRY_POINT_GROUP = "maze.search_types"
+
+SearchTypeLoader = Callable[
+    [], Tuple[str, Union[SearchPatternFactory, SearchPattern]]
+]
+
+
+def _read_name(filename: str) -> Optional[str]:
+    """
+    _read_name
+
+    Reads the module level NAME constant from a search type module
+    without importing it.
+
+    Args:
+        filename (str): The search type module file.
+
+    Returns:
+        Optional[str]: The name of the search type, or None if it is not declared.
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        _tree = ast.parse(f.read(), filename)
+
+    for _statement in _tree.body:
+        if (
+            isinstance(_statement, ast.Assign)
+            and len(_statement.targets) == 1
+            and isinstance(_statement.targets[0], ast.Name)
+            and _statement.targets[0].id == "NAME"
+            and isinstance(_statement.value, ast.Constant)
+            and isinstance(_statement.value.value, str)
+        ):
+            return _statement.value.value
+
+    return None
+
+
+def _load_module(
+    full_module_name: str,
+) -> Tuple[str, Union[SearchPatternFactory, SearchPattern]]:
+    """
+    _load_module
 
-from app.search_pattern import SearchPattern
+    Imports a search type module and calls its load() function.
+
+    Args:
+        full_module_name (str): The module to import.
+
+    Returns:
+        Tuple[str, Union[SearchPatternFactory, SearchPattern]]:
+            The registration information.
+    """
+    return importlib.import_module(full_module_name).load()
+
+
+def _load_entry_point(
+    entry_point: EntryPoint,
+) -> Tuple[str, Union[SearchPatternFactory, SearchPattern]]:
+    """
+    _load_entry_point
+
+    Loads a search type from an entry point, which may refer
+    either to a search type module or to its load() function.
+
+    Args:
+        entry_point (EntryPoint): The entry point to load.
+
+    Returns:
+        Tuple[str, Union[SearchPatternFactory, SearchPattern]]:
+            The registration information.
+    """
+    _object = entry_point.load()
+    return getattr(_object, "load", _object)()
 
 
 class SearchLoader:
@@ -23,13 +109,18 @@ class SearchLoader:
 
         Initialises the search type loader.
         """
-        self.registered_search_modules: Dict[str, SearchPattern] = {}
+        self.discovered_search_modules: Dict[str, SearchTypeLoader] = {}
+        self.registered_search_modules: Dict[str, SearchPatternFactory] = {}
 
-    def import_search_modules(self) -> None:
+        self._lock = threading.Lock()
+
+    def discover_search_modules(self) -> None:
         """
-        import_search_modules
+        discover_search_modules
 
-        Imports the search modules from the 'search_types' directory.
+        Discovers the search modules in the 'search_types' directory,
+        and those provided by installed packages, without importing them.
+        Modules that do not declare a NAME constant are imported straight away.
         """
         _directory = "search_types"
 
@@ -56,24 +147,87 @@ class SearchLoader:
             ]
             _search_modules = sorted(_search_modules)
 
-            # Dynamically import modules
+            # Read the name of each module, deferring the import.
 
             for _module_name in _search_modules:
                 full_module_name = (
                     f"app.search_types.{_module_name[:-3]}"  # Remove .py extension
                 )
-                _module = importlib.import_module(full_module_name)
+                _loader = partial(_load_module, full_module_name)
+                _name = _read_name(os.path.join(_directory, _module_name))
 
-                # If the module defines a register() function,
-                # call it to register the search type.
-
-                if hasattr(_module, "load"):
-                    _name, _action = _module.load()
-                    self.registered_search_modules[_name] = _action
+                if _name is not None:
+                    self.discovered_search_modules[_name] = _loader
+                elif hasattr(importlib.import_module(full_module_name), "load"):
+                    _name, _action = _loader()
+                    self.discovered_search_modules[_name] = _loader
+                    self.registered_search_modules[_name] = as_factory(_action)
 
         except FileNotFoundError:
             print(f"Directory '{_directory}' not found.")
 
+        # Search types from installed packages, named by their entry point.
+
+        for _entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            self.discovered_search_modules.setdefault(
+                _entry_point.name, partial(_load_entry_point, _entry_point)
+            )
+
+    def import_search_modules(self) -> None:
+        """
+        import_search_modules
+
+        Discovers the search modules, then imports every one of them straight away,
+        for callers that want every search type registered up front.
+        """
+        self.discover_search_modules()
+        for _name in list(self.discovered_search_modules):
+            self.get_search_pattern_factory(_name)
+
+    def get_search_pattern_factory(self, name: str) -> SearchPatternFactory:
+        """
+        get_search_pattern_factory
+
+        Returns the search pattern factory for a search type,
+        importing it the first time it is asked for.
+
+        Args:
+            name (str): The name of the search type.
+
+        Raises:
+            KeyError: If no search type of that name has been discovered.
+
+        Returns:
+            SearchPatternFactory: The search pattern factory.
+        """
+        with self._lock:
+            if name not in self.registered_search_modules:
+                if name not in self.discovered_search_modules:
+                    raise KeyError(f"Search type '{name}' not found.")
+
+                _name, _action = self.discovered_search_modules[name]()
+                if _name != name:
+                    raise ValueError(
+                        f"Search type '{name}' registered itself as '{_name}'."
+                    )
+                self.registered_search_modules[name] = as_factory(_action)
+
+            return self.registered_search_modules[name]
+
+    def create_search_pattern(self, name: str) -> SearchPattern:
+        """
+        create_search_pattern
+
+        Creates a new search pattern for a search type.
+
+        Args:
+            name (str): The name of the search type.
+
+        Returns:
+            SearchPattern: The new search pattern.
+        """
+        return self.get_search_pattern_factory(name)()
+
     def list_search_types(self) -> list[str]:
         """
         list_search_types
@@ -84,4 +238,4 @@ class SearchLoader:
             list[str]: The list of the registered search types.
         """
 
-        return list(self.registered_search_modules.keys())
+        return list(self.discovered_search_modules.keys())
@@ -0,0 +1,625 @@
+"""
+The search parallel module runs a breadth first search across several worker
+processes, one level of the search at a time.
+
+The compact grid of the maze is copied into shared memory, along with an array
+holding the step each cell was reached by, and the rows of the maze are split
+into bands, one for each worker. At each level every worker expands the cells
+of the frontier that lie in its band. The cells it reaches within its band are
+claimed straight away, while those reached across the edge of its band are
+marked in a shared edge row, one for each side of each edge, and claimed by the
+worker that owns them at the start of the next level. So each worker only ever
+writes to its own rows and edge rows, and no locks are needed. The edge rows
+alternate between two sets from one level to the next, so a worker can mark
+the next level while its neighbour is still reading the last.
+
+The workers wait for each other at a barrier after each level, and the last
+to arrive sums the sizes of the next level, decides whether the search goes on,
+and writes the decision to a shared control block for all of them to read.
+The searching process only watches the budget while the workers run, asking
+them to stop through the control block, so it does no work for each level.
+
+Once the goal has been claimed, the path is rebuilt by following the steps
+back from the goal to the start. The cells explored stay with the workers,
+so only their number is returned.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import re
+import signal
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Barrier
+from threading import BrokenBarrierError
+from typing import List, Optional, Tuple, Union
+
+from app.maze import Grid, Maze
+from app.search_budget import BudgetTracker
+from app.search_pattern import Solution
+
+# Bands are at least this many rows high, so small mazes are searched
+# in a single band, without starting any worker processes.
+
+MIN_BAND_ROWS = 256
+
+# How often, in seconds, the searching process checks the budget
+# while the workers search.
+
+POLL_INTERVAL = 0.01
+
+# The step each cell was reached by is saved as its index in this tuple,
+# with 0 for the cells not reached yet.
+
+_ACTIONS: Tuple[str, ...] = ("", "N", "S", "E", "W")
+_NORTH = 1
+_SOUTH = 2
+_EAST = 3
+_WEST = 4
+_START = 5
+
+# The control block holds these signed 64 bit slots, followed by the number
+# of cells expanded, the size of the next level, and whether the goal has been
+# reached, for each band at the last level.
+
+_DECISION = 0
+_STOP = 1
+_TOTAL = 2
+_BAND_SLOTS = 3
+_FIRST_BAND_SLOT = 3
+
+# The decisions taken at the end of each level.
+
+_SEARCHING = 0
+_REACHED = 1
+_NO_PATH = 2
+_STOPPED = 3
+
+# The edge rows of each edge: the cells below the edge reached from above,
+# and the cells above the edge reached from below.
+
+_DOWN = 0
+_UP = 1
+
+_MARKED = re.compile(rb"[^\x00]")
+
+# The control block of the worker, read by the barrier action,
+# which is run by whichever worker reaches the barrier last.
+
+_band_control: Optional[memoryview] = None
+_band_count = 0
+
+
+class _Band:
+    """
+    _Band
+
+    Searches the rows of a maze between first_row and last_row.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        grid: Union[Grid, memoryview],
+        steps: Union[bytearray, memoryview],
+        rows: int,
+        cols: int,
+        first_row: int,
+        last_row: int,
+        goal: int,
+    ) -> None:
+        """
+        __init__
+
+        Initialises the band.
+
+        Args:
+            grid (Union[Grid, memoryview]): The compact grid of the whole maze.
+            steps (Union[bytearray, memoryview]): The step each cell of the whole
+                maze was reached by.
+            rows (int): The number of rows in the maze.
+            cols (int): The number of columns in the maze.
+            first_row (int): The first row of the band.
+            last_row (int): The row after the last row of the band.
+            goal (int): The index of the goal cell.
+        """
+        self.grid: Union[Grid, memoryview] = grid
+        self.steps: Union[bytearray, memoryview] = steps
+        self.size: int = rows * cols
+        self.cols: int = cols
+        self.first: int = first_row * cols
+        self.last: int = last_row * cols
+        self.goal: int = goal if self.first <= goal < self.last else -1
+        self.frontier: List[int] = []
+        self.blank: bytes = bytes(cols)
+
+    @property
+    def goal_reached(self) -> bool:
+        """
+        goal_reached
+
+        Returns:
+            bool: Whether the goal is in this band and has been claimed.
+        """
+        return self.goal >= 0 and self.steps[self.goal] != 0
+
+    def claim(self, cell: int, step: int) -> None:
+        """
+        claim
+
+        Claims a cell for the next level, unless it has already been reached.
+
+        Args:
+            cell (int): The index of the cell.
+            step (int): The step the cell was reached by.
+        """
+        if not self.steps[cell]:
+            self.steps[cell] = step
+            self.frontier.append(cell)
+
+    def claim_edge(self, edge: memoryview, row: int, step: int) -> None:
+        """
+        claim_edge
+
+        Claims the cells of a row marked in an edge row by the neighbouring band,
+        then clears the edge row.
+
+        Args:
+            edge (memoryview): The edge row.
+            row (int): The row of the band the edge row is for.
+            step (int): The step the cells were reached by.
+        """
+        _marks = edge.tobytes()
+        if _marks == self.blank:
+            return
+
+        _offset = row * self.cols
+        for _mark in _MARKED.finditer(_marks):
+            self.claim(_offset + _mark.start(), step)
+        edge[:] = self.blank
+
+    def expand(  # pylint: disable=too-many-locals,too-many-branches
+        self, up: Optional[memoryview] = None, down: Optional[memoryview] = None
+    ) -> Tuple[int, int]:
+        """
+        expand
+
+        Expands the current level, in the same order of neighbours as
+        Maze.get_neighbours().
+
+        Args:
+            up (Optional[memoryview], optional): The edge row to mark the cells
+                reached above the band in. Defaults to None, for the top band.
+            down (Optional[memoryview], optional): The edge row to mark the cells
+                reached below the band in. Defaults to None, for the bottom band.
+
+        Returns:
+            Tuple[int, int]: The number of cells expanded, and the size of
+                the next level, counting the cells marked in the edge rows.
+        """
+        _grid = self.grid
+        _steps = self.steps
+        _cols = self.cols
+        _frontier = self.frontier
+        _first = self.first
+        _last = self.last
+        _size = self.size
+        _level: List[int] = []
+        _marked = 0
+
+        for _cell in _frontier:
+            _col = _cell % _cols
+
+            _next = _cell - _cols
+            if _next >= 0 and _grid[_next]:
+                if _next < _first:
+                    assert up is not None
+                    up[_col] = _NORTH
+                    _marked += 1
+                elif not _steps[_next]:
+                    _steps[_next] = _NORTH
+                    _level.append(_next)
+
+            _next = _cell - 1
+            if _col and _grid[_next] and not _steps[_next]:
+                _steps[_next] = _WEST
+                _level.append(_next)
+
+            _next = _cell + _cols
+            if _next < _size and _grid[_next]:
+                if _next >= _last:
+                    assert down is not None
+                    down[_col] = _SOUTH
+                    _marked += 1
+                elif not _steps[_next]:
+                    _steps[_next] = _SOUTH
+                    _level.append(_next)
+
+            _next = _cell + 1
+            if _col + 1 < _cols and _grid[_next] and not _steps[_next]:
+                _steps[_next] = _EAST
+                _level.append(_next)
+
+        _expanded = len(_frontier)
+        self.frontier = _level
+
+        return _expanded, len(_level) + _marked
+
+
+def _decide_level() -> None:
+    """
+    _decide_level
+
+    Adds up the last level of every band, and decides whether the search
+    goes on. Run by the last worker to reach the barrier, while the others wait.
+    """
+    _control = _band_control
+    assert _control is not None
+
+    _next = 0
+    _reached = False
+    _end = _FIRST_BAND_SLOT + _band_count * _BAND_SLOTS
+    for _slot in range(_FIRST_BAND_SLOT, _end, _BAND_SLOTS):
+        _control[_TOTAL] += _control[_slot]
+        _next += _control[_slot + 1]
+        _reached = _reached or _control[_slot + 2] != 0
+
+    if _reached:
+        _control[_DECISION] = _REACHED
+    elif _control[_STOP]:
+        _control[_DECISION] = _STOPPED
+    elif not _next:
+        _control[_DECISION] = _NO_PATH
+
+
+def _edge_row(
+    edges: memoryview, cols: int, bands: int, level: int, edge: int, side: int
+) -> memoryview:
+    """
+    _edge_row
+
+    Finds an edge row in the shared edge rows.
+
+    Args:
+        edges (memoryview): The edge rows of every edge, for both sets.
+        cols (int): The number of columns in the maze.
+        bands (int): The number of bands.
+        level (int): The level the edge row is marked at.
+        edge (int): The edge, numbered from 0 for the edge below the top band.
+        side (int): _DOWN or _UP.
+
+    Returns:
+        memoryview: The edge row.
+    """
+    _start = (((level % 2) * (bands - 1) + edge) * 2 + side) * cols
+
+    return edges[_start : _start + cols]
+
+
+def _run_band(  # pylint: disable=too-many-arguments,too-many-locals
+    names: Tuple[str, str, str, str],
+    barrier: Barrier,
+    rows: int,
+    cols: int,
+    bounds: List[int],
+    index: int,
+    start: int,
+    goal: int,
+) -> None:
+    """
+    _run_band
+
+    Searches a band of the maze in a worker process, one level at a time,
+    until the last worker to finish a level decides the search is over.
+
+    Args:
+        names (Tuple[str, str, str, str]): The names of the shared memory blocks
+            holding the grid, the steps, the edge rows and the control block.
+        barrier (Barrier): The barrier the workers wait at after each level.
+        rows (int): The number of rows in the maze.
+        cols (int): The number of columns in the maze.
+        bounds (List[int]): The first row of each band, followed by the number
+            of rows.
+        index (int): The index of the band.
+        start (int): The index of the start cell.
+        goal (int): The index of the goal cell.
+    """
+    global _band_control, _band_count  # pylint: disable=global-statement
+
+    # The searching process stops the workers through the control block,
+    # so signals meant for it are not handled here too.
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    # The workers share the resource tracker of the parent process, which
+    # created the blocks, so attaching here does not take ownership of them.
+
+    _bands = len(bounds) - 1
+    _memory = [SharedMemory(_name) for _name in names]
+    _grid = _memory[0].buf[: rows * cols]
+    _steps = _memory[1].buf[: rows * cols]
+    _edges = _memory[2].buf[: 4 * (_bands - 1) * cols]
+    _control = _memory[3].buf[: (_FIRST_BAND_SLOT + _bands * _BAND_SLOTS) * 8].cast(
+        "q"
+    )
+    _band_control = _control
+    _band_count = _bands
+    _views: List[memoryview] = [_grid, _steps, _edges]
+
+    try:
+        _first_row = bounds[index]
+        _last_row = bounds[index + 1]
+        _band = _Band(_grid, _steps, rows, cols, _first_row, _last_row, goal)
+        if _band.first <= start < _band.last:
+            _band.claim(start, _START)
+
+        # The edge rows marked by this band, and read by it, at even and odd levels.
+
+        _up: List[Optional[memoryview]] = [None, None]
+        _down: List[Optional[memoryview]] = [None, None]
+        _from_above: List[Optional[memoryview]] = [None, None]
+        _from_below: List[Optional[memoryview]] = [None, None]
+        for _level in range(2):
+            if index > 0:
+                _up[_level] = _edge_row(_edges, cols, _bands, _level, index - 1, _UP)
+                _from_above[_level] = _edge_row(
+                    _edges, cols, _bands, _level, index - 1, _DOWN
+                )
+            if index + 1 < _bands:
+                _down[_level] = _edge_row(_edges, cols, _bands, _level, index, _DOWN)
+                _from_below[_level] = _edge_row(
+                    _edges, cols, _bands, _level, index, _UP
+                )
+        _views += [
+            _view
+            for _view in _up + _down + _from_above + _from_below
+            if _view is not None
+        ]
+
+        _slot = _FIRST_BAND_SLOT + index * _BAND_SLOTS
+        _level = 0
+        while True:
+            # Claim the cells the neighbouring bands reached at the last level.
+
+            _above = _from_above[1 - _level % 2]
+            if _above is not None:
+                _band.claim_edge(_above, _first_row, _SOUTH)
+            _below = _from_below[1 - _level % 2]
+            if _below is not None:
+                _band.claim_edge(_below, _last_row - 1, _NORTH)
+
+            # Stop as soon as the goal is reached, rather than expanding its level.
+
+            if _band.goal_reached:
+                _expanded, _next = 0, len(_band.frontier)
+            else:
+                _expanded, _next = _band.expand(_up[_level % 2], _down[_level % 2])
+
+            _control[_slot] = _expanded
+            _control[_slot + 1] = _next
+            _control[_slot + 2] = _band.goal_reached
+            barrier.wait()
+            if _control[_DECISION] != _SEARCHING:
+                break
+            _level += 1
+    except BrokenBarrierError:
+        pass
+    finally:
+        _band_control = None
+        for _view in _views:
+            _view.release()
+        _control.release()
+        for _block in _memory:
+            _block.close()
+
+
+def band_rows(rows: int, workers: Optional[int] = None) -> List[int]:
+    """
+    band_rows
+
+    Splits the rows of a maze into bands of nearly the same height.
+
+    Args:
+        rows (int): The number of rows in the maze.
+        workers (Optional[int], optional): The number of bands wanted.
+            Defaults to one for each CPU.
+
+    Returns:
+        List[int]: The first row of each band, followed by the number of rows.
+    """
+    _bands = max(1, min(workers or os.cpu_count() or 1, rows // MIN_BAND_ROWS))
+
+    return [rows * i // _bands for i in range(_bands + 1)]
+
+
+def _rebuild_path(
+    steps: Union[bytearray, memoryview], cols: int, goal: int, num_explored: int
+) -> Solution:
+    """
+    _rebuild_path
+
+    Follows the steps back from the goal to the start.
+
+    Args:
+        steps (Union[bytearray, memoryview]): The step each cell was reached by.
+        cols (int): The number of columns in the maze.
+        goal (int): The index of the goal cell.
+        num_explored (int): The number of cells expanded.
+
+    Returns:
+        Solution: The solution, without the cells explored.
+    """
+    _cells: List[Tuple[int, int]] = []
+    _actions: List[str] = []
+    _cell = goal
+    while steps[_cell] != _START:
+        _step = steps[_cell]
+        _cells.append(divmod(_cell, cols))
+        _actions.append(_ACTIONS[_step])
+        if _step == _NORTH:
+            _cell += cols
+        elif _step == _SOUTH:
+            _cell -= cols
+        elif _step == _EAST:
+            _cell -= 1
+        else:
+            _cell += 1
+    _cells.reverse()
+    _actions.reverse()
+
+    return Solution(_cells, _actions, [], num_explored)
+
+
+def _search_in_process(maze: Maze, budget: Optional[BudgetTracker]) -> Solution:
+    """
+    _search_in_process
+
+    Searches a maze in a single band, in this process, without copying the grid.
+
+    Args:
+        maze (Maze): The maze to search.
+        budget (Optional[BudgetTracker]): The budget for the search,
+            which is checked before each level.
+
+    Returns:
+        Solution: The solution, without the cells explored.
+    """
+    _cols = maze.cols
+    _goal = maze.goal[0] * _cols + maze.goal[1]
+    _steps = bytearray(maze.rows * _cols)
+    _band = _Band(maze.grid, _steps, maze.rows, _cols, 0, maze.rows, _goal)
+    _band.claim(maze.start[0] * _cols + maze.start[1], _START)
+    _num_explored = 0
+
+    while not _band.goal_reached:
+        if not _band.frontier:
+            return Solution([], [], [], _num_explored)
+        if budget is not None and not budget.expand(len(_band.frontier)):
+            return Solution([], [], [], _num_explored, exhausted=True)
+        _num_explored += _band.expand()[0]
+
+    return _rebuild_path(_steps, _cols, _goal, _num_explored)
+
+
+def parallel_breadth_first(  # pylint: disable=too-many-locals,too-many-branches
+    maze: Maze,
+    workers: Optional[int] = None,
+    budget: Optional[BudgetTracker] = None,
+) -> Solution:
+    """
+    parallel_breadth_first
+
+    Searches a maze breadth first, spreading each level over worker processes.
+    The path found has the fewest steps, though it may differ from that of
+    a breadth first search where several paths are as short.
+
+    Args:
+        maze (Maze): The maze to search.
+        workers (Optional[int], optional): The number of worker processes,
+            which is lowered so that no band is less than MIN_BAND_ROWS high.
+            Defaults to one for each CPU.
+        budget (Optional[BudgetTracker], optional): The budget for the search.
+            A single band checks it before each level, while workers are
+            checked every POLL_INTERVAL seconds, so may expand a level or two
+            more before they stop. Defaults to no limits.
+
+    Raises:
+        RuntimeError: If a worker process fails.
+
+    Returns:
+        Solution: The solution, without the cells explored.
+    """
+    _bounds = band_rows(maze.rows, workers)
+    if len(_bounds) == 2:
+        return _search_in_process(maze, budget)
+    if budget is not None and budget.exhausted:
+        return Solution([], [], [], 0, exhausted=True)
+
+    _rows = maze.rows
+    _cols = maze.cols
+    _size = _rows * _cols
+    _bands = len(_bounds) - 1
+    _sizes = (
+        _size,
+        _size,
+        4 * (_bands - 1) * _cols,
+        (_FIRST_BAND_SLOT + _bands * _BAND_SLOTS) * 8,
+    )
+    _memory: List[SharedMemory] = []
+    _processes: List[multiprocessing.Process] = []
+    _steps: Optional[memoryview] = None
+    _control: Optional[memoryview] = None
+    _barrier = multiprocessing.Barrier(_bands, action=_decide_level)
+
+    try:
+        for _block_size in _sizes:
+            _memory.append(SharedMemory(create=True, size=_block_size))
+            _memory[-1].buf[:_block_size] = bytes(_block_size)
+        _memory[0].buf[:_size] = maze.grid
+        _steps = _memory[1].buf[:_size]
+        _control = _memory[3].buf[: _sizes[3]].cast("q")
+
+        _names = (
+            _memory[0].name,
+            _memory[1].name,
+            _memory[2].name,
+            _memory[3].name,
+        )
+        for _index in range(_bands):
+            _processes.append(
+                multiprocessing.Process(
+                    target=_run_band,
+                    args=(
+                        _names,
+                        _barrier,
+                        _rows,
+                        _cols,
+                        _bounds,
+                        _index,
+                        maze.start[0] * _cols + maze.start[1],
+                        maze.goal[0] * _cols + maze.goal[1],
+                    ),
+                )
+            )
+            _processes[-1].start()
+
+        # Watch the budget until every worker has stopped.
+
+        _spent = 0
+        _running = list(_processes)
+        while _running:
+            wait([_process.sentinel for _process in _running], timeout=POLL_INTERVAL)
+            _running = [_process for _process in _running if _process.is_alive()]
+            if any(_process.exitcode for _process in _processes):
+                _barrier.abort()
+                raise RuntimeError("A parallel search worker failed.")
+
+            if budget is not None and not _control[_STOP]:
+                _total = _control[_TOTAL]
+                budget.expand(_total - _spent)
+                _spent = _total
+                if budget.exhausted:
+                    _control[_STOP] = 1
+
+        _num_explored = _control[_TOTAL]
+        if _control[_DECISION] == _STOPPED:
+            return Solution([], [], [], _num_explored, exhausted=True)
+        if _control[_DECISION] != _REACHED:
+            return Solution([], [], [], _num_explored)
+
+        return _rebuild_path(
+            _steps, _cols, maze.goal[0] * _cols + maze.goal[1], _num_explored
+        )
+    finally:
+        for _process in _processes:
+            if _process.is_alive():
+                _process.terminate()
+            _process.join()
+        if _steps is not None:
+            _steps.release()
+        if _control is not None:
+            _control.release()
+        for _block in _memory:
+            _block.close()
+            _block.unlink()
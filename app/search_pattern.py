@@ -1,12 +1,24 @@
 """
 The search pattyrn module provides the definition of a node
 and the frontier class required by the search patterns.
+
+Search patterns that do not fit the frontier, such as incremental searches,
+subclass PlanningPattern and plan the whole search themselves.
 """
 
 from __future__ import annotations
 
+import copy
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple, Union
+
+from app.maze import Maze
+from app.search_budget import BudgetTracker
+
+# The heuristics a search pattern can choose from.
+
+MANHATTAN = "manhattan"
+LANDMARKS = "landmarks"
 
 
 class Node:
@@ -21,7 +33,7 @@ class Node:
         state: Tuple[int, int],  # row, col - position in the maze.
         parent: Optional[Node],
         action: str,
-        manhattan: int = 0,
+        manhattan: int = 0,  # The heuristic value, the Manhattan value by default.
         cost: int = 0,
     ) -> None:
         self.state: Tuple[int, int] = state
@@ -31,13 +43,64 @@ class Node:
         self.cost: int = cost
 
 
+class Solution:  # pylint: disable=too-few-public-methods
+    """
+    Solution
+
+    The result of a search, as returned by Solver.solve.
+    """
+
+    def __init__(
+        self,
+        cells: List[Tuple[int, int]],
+        actions: List[str],
+        explored: List[Tuple[int, int]],
+        num_explored: int,
+        exhausted: bool = False,
+    ) -> None:
+        """
+        __init__
+
+        Initialises the solution.
+
+        Args:
+            cells (List[Tuple[int, int]]): The cells that make up the solution.
+            actions (List[str]): The actions followed to reach the goal.
+            explored (List[Tuple[int, int]]): The cells explored, in order.
+            num_explored (int): The number of nodes removed from the frontier.
+            exhausted (bool, optional): True if the search ran out of budget,
+                so the path, if any, is the best found so far. Defaults to False.
+        """
+        self.cells: List[Tuple[int, int]] = cells
+        self.actions: List[str] = actions
+        self.explored: List[Tuple[int, int]] = explored
+        self.num_explored: int = num_explored
+        self.exhausted: bool = exhausted
+
+    @property
+    def found(self) -> bool:
+        """
+        found
+
+        Returns:
+            bool: True if a path to the goal was found.
+        """
+        return len(self.cells) > 0
+
+
 class SearchPattern(ABC):
     """
     SearchPattern
 
     The protocol for the search pattern.
+    A search pattern holds the frontier of a single search,
+    so a new one is created for each search.
     """
 
+    # The heuristic the solver works out for each node, MANHATTAN or LANDMARKS.
+
+    heuristic: str = MANHATTAN
+
     def __init__(self) -> None:
         """
         __init__
@@ -83,7 +146,96 @@ class SearchPattern(ABC):
         """
         return len(self.frontier_buffer) == 0
 
+    def dump_frontier(self) -> List[Node]:
+        """
+        dump_frontier
+
+        Returns the nodes in the frontier, to save in a checkpoint.
+
+        Returns:
+            List[Node]: The nodes, in the order the frontier keeps them.
+        """
+        return list(self.frontier_buffer)
+
+    def restore_frontier(
+        self, nodes: List[Node], explored: List[Tuple[int, int]]
+    ) -> None:
+        """
+        restore_frontier
+
+        Restores the frontier from a checkpoint, so that the search carries on
+        exactly as it would have done.
+
+        Args:
+            nodes (List[Node]): The nodes returned by dump_frontier().
+            explored (List[Tuple[int, int]]): The cells explored so far.
+        """
+        self.frontier_buffer = list(nodes)
+
     @abstractmethod
     def remove_from_frontier(self) -> Node:
         """Removes an item from the frontier buffer to be processed.
         It is this function that distinguishes the search patterns."""
+
+
+class PlanningPattern(SearchPattern):
+    """
+    PlanningPattern
+
+    The protocol for a search pattern that plans the whole search itself,
+    rather than having the solver drive it through the frontier.
+    """
+
+    @abstractmethod
+    def plan(self, maze: Maze, budget: BudgetTracker) -> Solution:
+        """Searches the maze and returns the solution, stopping early
+        with the best solution so far when the budget is exhausted.
+        It is this function that distinguishes the planning patterns."""
+
+    def remove_from_frontier(self) -> Node:
+        """
+        remove_from_frontier
+
+        Planning patterns do not use the frontier.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError("Planning patterns do not use the frontier")
+
+
+# Search types register a factory rather than a search pattern, so that each
+# search gets a search pattern, and so a frontier, of its own.
+
+SearchPatternFactory = Callable[[], SearchPattern]
+
+
+def as_factory(
+    action: Union[SearchPatternFactory, SearchPattern],
+) -> SearchPatternFactory:
+    """
+    as_factory
+
+    Returns the search pattern factory registered by a search type.
+    Older search types register a search pattern object rather than a factory,
+    in which case each search gets a copy of it, so that any arguments it was
+    created with, and any state it holds, are kept.
+
+    Args:
+        action (Union[SearchPatternFactory, SearchPattern]): What was registered.
+
+    Returns:
+        SearchPatternFactory: The search pattern factory.
+    """
+    if not isinstance(action, SearchPattern):
+        return action
+
+    def _factory() -> SearchPattern:
+        return copy.deepcopy(action)
+
+    # Name the factory after the class, so checkpoints can tell patterns apart.
+
+    _factory.__module__ = type(action).__module__
+    _factory.__qualname__ = type(action).__qualname__
+
+    return _factory
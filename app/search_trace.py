@@ -0,0 +1,587 @@
+"""
+The search trace module records a search as it runs, so that it can be
+replayed later without searching again.
+
+A trace records each cell expanded, each cell added to the frontier and the
+final path. A chunk of events is saved as the kind of each event, a byte each,
+followed by the difference between the cell of each event and the cell of the
+event before, as 32 bit whole numbers. A chunk is only worked out and packed
+when it is written, all at once, and zlib squeezes out the bytes the small
+differences leave empty, so recording costs little more than keeping a list of
+the cells.
+A chunk index at the end of the file says where each chunk starts, and how many
+cells had been expanded before it, so a replay can seek straight to any step.
+
+The trace also holds the maze that was searched, so it can be replayed on
+its own. Opening a trace only reads its header and chunk index.
+
+TraceFrames follows a replay as it moves from step to step, keeping the state
+of every cell, and a keyframe of that state at the start of the chunks it passes,
+so that moving back to an earlier step only replays the events since a keyframe.
+"""
+
+from __future__ import annotations
+
+import operator
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate, chain
+from types import TracebackType
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type
+
+from app.maze import OPEN, WALL, Maze
+
+TRACE_MAGIC = b"MZTR"
+TRACE_END_MAGIC = b"MZTE"
+TRACE_VERSION = 2
+CHUNK_EVENTS = 65536
+
+# The zlib compression level of the events. Compressing is quick next to
+# working out the events, so the default level costs little over the fastest.
+
+ZLIB_LEVEL = 6
+
+# The kinds of event.
+
+EXPAND = 0
+ADD = 1
+_EXPANDED = bytes([EXPAND])
+_ADDED = bytes([ADD])
+
+# The states of the cells of a replay.
+
+UNSEEN = 0
+FRONTIER = 1
+EXPANDED = 2
+
+# The most cells held by all of the keyframes of a replay, before compression.
+# Longer traces keep a keyframe every few chunks rather than every chunk.
+
+KEYFRAME_CELLS = 1 << 28
+
+# magic, version, rows, cols, start, goal, maze hash, length of the search
+# pattern name and length of the compressed grid.
+
+_HEADER = struct.Struct("<4sHIIII32sHI")
+
+# The offset, compressed length, first event and expansions before each chunk.
+
+_CHUNK = struct.Struct("<QIQQ")
+
+# The offset of the chunk index, the number of chunks, the offset and
+# compressed length of the path, the number of events and expansions, and magic.
+
+_FOOTER = struct.Struct("<QIQIQQ4s")
+
+Cell = Tuple[int, int]
+
+
+def _encode(values: Sequence[int]) -> bytes:
+    """
+    _encode
+
+    Encodes whole numbers as the differences between them, as little endian
+    32 bit numbers, worked out for the whole list at once rather than one by one.
+
+    Args:
+        values (Sequence[int]): The numbers.
+
+    Returns:
+        bytes: The encoded numbers.
+    """
+    _deltas = array("i", map(operator.sub, values, chain((0,), values)))
+    if sys.byteorder == "big":
+        _deltas.byteswap()
+
+    return _deltas.tobytes()
+
+
+def _decode(data: bytes) -> Iterator[int]:
+    """
+    _decode
+
+    Decodes the numbers encoded by _encode().
+
+    Args:
+        data (bytes): The encoded numbers.
+
+    Returns:
+        Iterator[int]: The numbers.
+    """
+    _deltas = array("i")
+    _deltas.frombytes(data)
+    if sys.byteorder == "big":
+        _deltas.byteswap()
+
+    return accumulate(_deltas)
+
+
+class TraceWriter:
+    """
+    TraceWriter
+
+    Records a search to a trace file as it runs.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        maze: Maze,
+        pattern: str,
+        chunk_events: int = CHUNK_EVENTS,
+    ) -> None:
+        """
+        __init__
+
+        Creates the trace file, and writes the maze to it.
+
+        Args:
+            filename (str): The trace file.
+            maze (Maze): The maze being searched.
+            pattern (str): The name of the search pattern.
+            chunk_events (int, optional): The number of events in each chunk.
+                Defaults to CHUNK_EVENTS.
+        """
+        self.filename: str = filename
+        self.cols: int = maze.cols
+        self.chunk_events: int = chunk_events
+        self.num_events: int = 0
+
+        # The cells and kinds of the events of the current chunk. They are only
+        # turned into cell indexes when the chunk is written, all at once,
+        # so that recording each event costs as little as possible.
+
+        self._cells: List[Cell] = []
+        self._kinds: bytearray = bytearray()
+        self._chunks: List[Tuple[int, int, int, int]] = []
+        self._path: List[int] = []
+        self._written_expansions: int = 0
+
+        _pattern = pattern.encode("utf-8")
+        _grid = zlib.compress(bytes(maze.grid))
+        self._file = open(filename, "wb")  # pylint: disable=consider-using-with
+        self._file.write(
+            _HEADER.pack(
+                TRACE_MAGIC,
+                TRACE_VERSION,
+                maze.rows,
+                maze.cols,
+                maze.start[0] * maze.cols + maze.start[1],
+                maze.goal[0] * maze.cols + maze.goal[1],
+                bytes.fromhex(maze.content_hash()),
+                len(_pattern),
+                len(_grid),
+            )
+        )
+        self._file.write(_pattern)
+        self._file.write(_grid)
+
+    def __enter__(self) -> TraceWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @property
+    def num_expansions(self) -> int:
+        """
+        num_expansions
+
+        Returns:
+            int: The number of cells expanded so far.
+        """
+        return self._written_expansions + self._kinds.count(EXPAND)
+
+    def expand(self, cell: Cell, added: Sequence[Cell] = ()) -> None:
+        """
+        expand
+
+        Records a cell being expanded, and the cells then added to the frontier,
+        in order, so that a search makes a single call for each cell it expands.
+
+        Args:
+            cell (Cell): The cell (row, col).
+            added (Sequence[Cell]): The cells added to the frontier.
+        """
+        self._cells.append(cell)
+        self._cells.extend(added)
+        self._kinds += _EXPANDED + _ADDED * len(added)
+        if len(self._cells) >= self.chunk_events:
+            self._write_chunk()
+
+    def add(self, cell: Cell) -> None:
+        """
+        add
+
+        Records a cell being added to the frontier.
+
+        Args:
+            cell (Cell): The cell (row, col).
+        """
+        self._cells.append(cell)
+        self._kinds.append(ADD)
+        if len(self._cells) >= self.chunk_events:
+            self._write_chunk()
+
+    def path(self, cells: List[Cell]) -> None:
+        """
+        path
+
+        Records the path found.
+
+        Args:
+            cells (List[Cell]): The cells of the path, from the start to the goal.
+        """
+        self._path = [_row * self.cols + _col for _row, _col in cells]
+
+    def _write_chunk(self) -> None:
+        """
+        _write_chunk
+
+        Compresses the events recorded since the last chunk, and writes them,
+        as their kinds followed by the differences between their cell indexes.
+        """
+        if not self._cells:
+            return
+
+        _cols = self.cols
+        _cells = [_row * _cols + _col for _row, _col in self._cells]
+        _data = zlib.compress(self._kinds + _encode(_cells), ZLIB_LEVEL)
+        self._chunks.append(
+            (self._file.tell(), len(_data), self.num_events, self._written_expansions)
+        )
+        self._file.write(_data)
+        self.num_events += len(_cells)
+        self._written_expansions += self._kinds.count(EXPAND)
+        self._cells = []
+        self._kinds = bytearray()
+
+    def close(self) -> None:
+        """
+        close
+
+        Writes the last chunk, the path and the chunk index, and closes the file.
+        """
+        if self._file.closed:
+            return
+
+        self._write_chunk()
+
+        _path_offset = self._file.tell()
+        _path = zlib.compress(_encode(self._path), ZLIB_LEVEL)
+        self._file.write(_path)
+
+        _index_offset = self._file.tell()
+        for _chunk in self._chunks:
+            self._file.write(_CHUNK.pack(*_chunk))
+        self._file.write(
+            _FOOTER.pack(
+                _index_offset,
+                len(self._chunks),
+                _path_offset,
+                len(_path),
+                self.num_events,
+                self.num_expansions,
+                TRACE_END_MAGIC,
+            )
+        )
+        self._file.close()
+
+
+class TraceReader:  # pylint: disable=too-many-instance-attributes
+    """
+    TraceReader
+
+    Replays a trace file, reading only the chunks needed.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        __init__
+
+        Opens a trace, reading its header and chunk index.
+
+        Args:
+            filename (str): The trace file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not a complete trace,
+                or was saved by a different version.
+        """
+        self.filename: str = filename
+
+        try:
+            with open(filename, "rb") as f:
+                _header = f.read(_HEADER.size)
+                f.seek(max(os.fstat(f.fileno()).st_size - _FOOTER.size, 0))
+                _footer = f.read(_FOOTER.size)
+        except FileNotFoundError as err:
+            raise FileNotFoundError(f"Trace '{filename}' not found.") from err
+
+        try:
+            (
+                _magic,
+                _version,
+                self.rows,
+                self.cols,
+                _start,
+                _goal,
+                _hash,
+                _pattern_length,
+                self._grid_length,
+            ) = _HEADER.unpack(_header)
+            (
+                _index_offset,
+                _num_chunks,
+                self._path_offset,
+                self._path_length,
+                self.num_events,
+                self.num_expansions,
+                _end_magic,
+            ) = _FOOTER.unpack(_footer)
+        except struct.error as err:
+            raise ValueError(f"'{filename}' is not a complete trace.") from err
+
+        if _magic != TRACE_MAGIC or _end_magic != TRACE_END_MAGIC:
+            raise ValueError(f"'{filename}' is not a complete trace.")
+        if _version != TRACE_VERSION:
+            raise ValueError(
+                f"Trace '{filename}' is version {_version}, expected {TRACE_VERSION}."
+            )
+
+        self.start: Cell = divmod(_start, self.cols)
+        self.goal: Cell = divmod(_goal, self.cols)
+        self.content_hash: str = _hash.hex()
+
+        with open(filename, "rb") as f:
+            f.seek(_HEADER.size)
+            self.pattern: str = f.read(_pattern_length).decode("utf-8")
+            f.seek(_index_offset)
+            _index = f.read(_CHUNK.size * _num_chunks)
+        self._grid_offset: int = _HEADER.size + _pattern_length
+        self.chunks: List[Tuple[int, int, int, int]] = [
+            _CHUNK.unpack_from(_index, _CHUNK.size * i) for i in range(_num_chunks)
+        ]
+
+    def maze(self) -> Maze:
+        """
+        maze
+
+        Returns the maze that was searched.
+
+        Returns:
+            Maze: The maze.
+        """
+        with open(self.filename, "rb") as f:
+            f.seek(self._grid_offset)
+            _grid = zlib.decompress(f.read(self._grid_length))
+
+        return Maze.from_grid(
+            bytearray(_grid),
+            self.rows,
+            self.cols,
+            self.start,
+            self.goal,
+            self.filename,
+        )
+
+    def path(self) -> List[Cell]:
+        """
+        path
+
+        Returns the path found.
+
+        Returns:
+            List[Cell]: The cells of the path, empty if none was found.
+        """
+        with open(self.filename, "rb") as f:
+            f.seek(self._path_offset)
+            _data = zlib.decompress(f.read(self._path_length))
+
+        return [divmod(_cell, self.cols) for _cell in _decode(_data)]
+
+    def events(
+        self, first: int = 0, last: Optional[int] = None
+    ) -> Iterator[Tuple[int, Cell]]:
+        """
+        events
+
+        Replays the events between two steps. Each step is a cell expanded,
+        followed by the cells it added to the frontier. Step 0 is the start cell
+        being added. The chunks before the first step are not read.
+
+        Args:
+            first (int, optional): The step before the first event.
+                Defaults to 0, which replays from the start.
+            last (Optional[int], optional): The step of the last event.
+                Defaults to the last step.
+
+        Yields:
+            Tuple[int, Cell]: The kind of each event, EXPAND or ADD, and its cell.
+        """
+        _last = self.num_expansions if last is None else last
+
+        # Start from the last chunk that starts at or before the first step.
+
+        _chunk = 0
+        for _index, (_, _, _, _expansions) in enumerate(self.chunks):
+            if _expansions <= first:
+                _chunk = _index
+
+        with open(self.filename, "rb") as f:
+            for _offset, _length, _, _expansions in self.chunks[_chunk:]:
+                if _expansions > _last:
+                    return
+                f.seek(_offset)
+                _data = zlib.decompress(f.read(_length))
+
+                # Each event takes a byte for its kind and four for its cell.
+
+                _count = len(_data) // 5
+                for _kind, _cell in zip(_data[:_count], _decode(_data[_count:])):
+                    if _kind == EXPAND:
+                        _expansions += 1
+                        if _expansions > _last:
+                            return
+                    if _expansions > first or first == 0:
+                        yield _kind, divmod(_cell, self.cols)
+
+
+class TraceFrames:
+    """
+    TraceFrames
+
+    The state of each cell of a traced search, at the step a replay has reached.
+    """
+
+    def __init__(self, reader: TraceReader) -> None:
+        """
+        __init__
+
+        Starts the replay before its first step, with every cell unseen.
+
+        Args:
+            reader (TraceReader): The trace.
+        """
+        self.reader: TraceReader = reader
+        self.states: bytearray = bytearray(reader.rows * reader.cols)
+        self.step: int = 0
+
+        # Keyframes are taken at the start of the chunks, and are compressed,
+        # as the states are mostly long runs of the same value.
+
+        _every = max(1, -(-len(reader.chunks) * len(self.states) // KEYFRAME_CELLS))
+        self.keyframe_steps: Set[int] = {
+            _chunk[3] for _chunk in reader.chunks[::_every] if _chunk[3] > 0
+        }
+        self.keyframes: Dict[int, bytes] = {0: zlib.compress(self.states, 1)}
+
+    def seek(self, step: int) -> Tuple[bool, List[Tuple[int, Cell]]]:
+        """
+        seek
+
+        Moves the replay to a step. Moving backwards, or far forwards, starts
+        from the nearest keyframe before the step, and only replays the events
+        after it.
+
+        Args:
+            step (int): The step to move to.
+
+        Returns:
+            Tuple[bool, List[Tuple[int, Cell]]]: True if the states were replaced
+                by a keyframe, so every cell needs drawing again, and the events
+                replayed since, each the kind of event and its cell.
+        """
+        _step = max(0, min(step, self.reader.num_expansions))
+        _keyframe = max(
+            (_key for _key in self.keyframes if _key <= _step),
+            default=0,
+        )
+        _restored = _step < self.step or _keyframe > self.step
+        if _restored:
+            self.states[:] = zlib.decompress(self.keyframes[_keyframe])
+            self.step = _keyframe
+
+        _events: List[Tuple[int, Cell]] = []
+        _current = self.step
+        for _kind, _cell in self.reader.events(self.step, _step):
+            _index = _cell[0] * self.reader.cols + _cell[1]
+            if _kind == EXPAND:
+                if _current in self.keyframe_steps and _current not in self.keyframes:
+                    self.keyframes[_current] = zlib.compress(self.states, 1)
+                _current += 1
+                self.states[_index] = EXPANDED
+            elif self.states[_index] != EXPANDED:
+                self.states[_index] = FRONTIER
+            _events.append((_kind, _cell))
+        self.step = _step
+
+        return _restored, _events
+
+    def state(self, cell: Cell) -> int:
+        """
+        state
+
+        Args:
+            cell (Cell): The cell (row, col).
+
+        Returns:
+            int: The state of the cell, UNSEEN, FRONTIER or EXPANDED.
+        """
+        return self.states[cell[0] * self.reader.cols + cell[1]]
+
+
+def format_frame(reader: TraceReader, step: Optional[int] = None) -> str:
+    """
+    format_frame
+
+    Draws the state of a traced search at a step as plain text. The cells
+    expanded are shown as '.', the frontier as 'o' and the path, once the
+    last step is reached, as '+'.
+
+    Args:
+        reader (TraceReader): The trace.
+        step (Optional[int], optional): The step to draw. Defaults to the last step.
+
+    Returns:
+        str: The maze, one line for each row.
+    """
+    _step = reader.num_expansions if step is None else step
+    _maze = reader.maze()
+    _frames = TraceFrames(reader)
+    _frames.seek(_step)
+    _path = set(reader.path()) if _step >= reader.num_expansions else set()
+
+    _lines: List[str] = []
+    for _row in range(_maze.rows):
+        _line = []
+        for _col in range(_maze.cols):
+            _cell = (_row, _col)
+            _cost = _maze.grid[_row * _maze.cols + _col]
+            _state = _frames.state(_cell)
+            if _cell == _maze.start:
+                _line.append("A")
+            elif _cell == _maze.goal:
+                _line.append("B")
+            elif _cost == WALL:
+                _line.append("*")
+            elif _cell in _path:
+                _line.append("+")
+            elif _state == EXPANDED:
+                _line.append(".")
+            elif _state == FRONTIER:
+                _line.append("o")
+            else:
+                _line.append(" " if _cost == OPEN else str(_cost))
+        _lines.append("".join(_line))
+
+    return "\n".join(_lines)
@@ -1,27 +1,34 @@
 """
 A* search.
+
+When a cheaper way to a cell already in the frontier is found, it replaces
+the dearer node, so that A* finds the cheapest path on weighted mazes and on
+the weighted corridors of a reduced maze. As the heuristics never fall by more
+than the cost of a step, a cell once explored never needs to be reopened.
 """
 
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Dict, List, Tuple
+
+from app.search_pattern import Node, SearchPattern, SearchPatternFactory
 
-from app.search_pattern import Node, SearchPattern
+NAME = "A* search"
 
 
-def load() -> Tuple[str, SearchPattern]:
+def load() -> Tuple[str, SearchPatternFactory]:
     """
     load
 
     Loads the search pattern.
     Registration informaiton includes:
         str, The name of the search pattern.
-        Frontier, The search pattern object.
+        SearchPatternFactory, Creates a new search pattern for each search.
 
     Returns:
-        Tuple[int, str, Frontier]: The registration intormation.
+        Tuple[str, SearchPatternFactory]: The registration intormation.
     """
-    return ("A* search", AStar())
+    return (NAME, AStar)
 
 
 class AStar(SearchPattern):
@@ -31,6 +38,66 @@ class AStar(SearchPattern):
     The A* search pattern, using the manhattan value.
     """
 
+    def __init__(self) -> None:
+        """
+        __init__
+
+        Initialises the class.
+        """
+        super().__init__()
+
+        # The node in the frontier for each state.
+
+        self.frontier_states: Dict[Tuple[int, int], Node] = {}
+
+    def add_to_frontier(self, node: Node) -> None:
+        """
+        add_to_frontier
+
+        Adds a node to the frontier, replacing the node for the same state
+        if the new one is cheaper, and dropping it otherwise.
+
+        Args:
+            node (Node): The node to add.
+        """
+        _existing = self.frontier_states.get(node.state)
+        if _existing is not None:
+            if _existing.cost <= node.cost:
+                return
+            self.frontier_buffer.remove(_existing)
+
+        self.frontier_buffer.append(node)
+        self.frontier_states[node.state] = node
+
+    def frontier_contains_state(self, state: Tuple[int, int]) -> bool:
+        """
+        frontier_contains_state
+
+        A state is always offered again, in case the new node is cheaper.
+
+        Args:
+            state (Tuple[int, int]): state to check.
+
+        Returns:
+            bool: Always False.
+        """
+        return False
+
+    def restore_frontier(
+        self, nodes: List[Node], explored: List[Tuple[int, int]]
+    ) -> None:
+        """
+        restore_frontier
+
+        Restores the frontier from a checkpoint.
+
+        Args:
+            nodes (List[Node]): The nodes returned by dump_frontier().
+            explored (List[Tuple[int, int]]): The cells explored so far.
+        """
+        super().restore_frontier(nodes, explored)
+        self.frontier_states = {_node.state: _node for _node in nodes}
+
     def remove_from_frontier(self) -> Node:  # LIFO
         """
         remove_from_frontier
@@ -52,5 +119,6 @@ class AStar(SearchPattern):
 
         _node = min(self.frontier_buffer, key=lambda node: node.manhattan + node.cost)
         self.frontier_buffer.remove(_node)
+        del self.frontier_states[_node.state]
 
         return _node
@@ -0,0 +1,38 @@
+"""
+A* search, using the landmark heuristic.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+from app.search_pattern import LANDMARKS, SearchPatternFactory
+from app.search_types.a_star import AStar
+
+NAME = "A* search (landmarks)"
+
+
+def load() -> Tuple[str, SearchPatternFactory]:
+    """
+    load
+
+    Loads the search pattern.
+    Registration informaiton includes:
+        str, The name of the search pattern.
+        SearchPatternFactory, Creates a new search pattern for each search.
+
+    Returns:
+        Tuple[str, SearchPatternFactory]: The registration intormation.
+    """
+    return (NAME, AStarLandmarks)
+
+
+class AStarLandmarks(AStar):
+    """
+    AStarLandmarks
+
+    The A* search pattern, using the landmark heuristic
+    rather than the manhattan value.
+    """
+
+    heuristic = LANDMARKS
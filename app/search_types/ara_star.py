@@ -0,0 +1,213 @@
+"""
+Anytime Repairing A* search (ARA*).
+
+An anytime search, which first finds a path quickly with a weighted A* search,
+whose path costs no more than the weight times the cheapest. It then lowers
+the weight step by step, reusing the costs already found to improve the path,
+until the weight reaches 1 and the path is the cheapest, or the budget runs out,
+when the best path found so far is returned.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Callable, Dict, List, Set, Tuple
+
+from app.maze import Maze
+from app.search import get_heuristic
+from app.search_budget import BudgetTracker
+from app.search_pattern import PlanningPattern, SearchPatternFactory, Solution
+
+NAME = "Anytime Repairing A* search"
+
+Cell = Tuple[int, int]
+
+# The weight of the heuristic in the first search, and how much it is lowered by
+# for each search after it.
+
+INITIAL_WEIGHT = 3.0
+WEIGHT_STEP = 0.5
+
+
+def load() -> Tuple[str, SearchPatternFactory]:
+    """
+    load
+
+    Loads the search pattern.
+    Registration informaiton includes:
+        str, The name of the search pattern.
+        SearchPatternFactory, Creates a new search pattern for each search.
+
+    Returns:
+        Tuple[str, SearchPatternFactory]: The registration intormation.
+    """
+    return (NAME, AnytimeRepairingAStar)
+
+
+class AnytimeRepairingAStar(PlanningPattern):
+    """
+    AnytimeRepairingAStar
+
+    The ARA* search pattern, using the manhattan value with a falling weight.
+    """
+
+    def __init__(self) -> None:
+        """
+        __init__
+
+        Initialises the class.
+        """
+        super().__init__()
+
+        # The cost of each cell, and the cell and action it is reached from.
+
+        self.costs: Dict[Cell, float] = {}
+        self.parents: Dict[Cell, Tuple[Cell, str]] = {}
+
+        # The cells to expand in the next search. Inconsistent cells had their
+        # cost lowered after they were expanded, and wait for the search after.
+
+        self.open_cells: Dict[Cell, None] = {}
+        self.inconsistent_cells: Dict[Cell, None] = {}
+        self.explored: List[Cell] = []
+
+        # The weight and cost of each path found, in order.
+
+        self.improvements: List[Tuple[float, float]] = []
+
+    def plan(self, maze: Maze, budget: BudgetTracker) -> Solution:
+        """
+        plan
+
+        Searches the maze with a falling weight, improving the path each time.
+
+        Args:
+            maze (Maze): The maze to search.
+            budget (BudgetTracker): The budget for the search.
+
+        Returns:
+            Solution: The cheapest path found, marked as exhausted
+                if the budget ran out before it was known to be the cheapest.
+        """
+        _heuristic = get_heuristic(maze, self.heuristic)
+        _start = maze.get_start()
+        _goal = maze.get_goal()
+
+        self.costs[_start] = 0
+        self.open_cells[_start] = None
+        _cells: List[Cell] = []
+        _actions: List[str] = []
+        _weight = INITIAL_WEIGHT
+
+        while True:
+            _finished = self._improve_path(maze, _heuristic, _weight, budget)
+
+            _cost = self.costs.get(_goal, math.inf)
+            if _cost < math.inf and (
+                not self.improvements or _cost < self.improvements[-1][1]
+            ):
+                _cells, _actions = self._extract_path(_start, _goal)
+                self.improvements.append((_weight, _cost))
+
+            if not _finished:
+                return Solution(
+                    _cells, _actions, self.explored, len(self.explored), exhausted=True
+                )
+            if _weight <= 1:
+                return Solution(_cells, _actions, self.explored, len(self.explored))
+
+            # Lower the weight, and search again from the cells
+            # whose costs have changed since they were expanded.
+
+            _weight = max(1.0, _weight - WEIGHT_STEP)
+            self.open_cells.update(self.inconsistent_cells)
+            self.inconsistent_cells.clear()
+
+    def _improve_path(
+        self,
+        maze: Maze,
+        heuristic: Callable[[Cell], int],
+        weight: float,
+        budget: BudgetTracker,
+    ) -> bool:
+        """
+        _improve_path
+
+        Runs one weighted A* search, expanding each cell at most once,
+        until no open cell could lead to a cheaper path to the goal.
+
+        Args:
+            maze (Maze): The maze to search.
+            heuristic (Callable[[Cell], int]): Estimates the cost to the goal.
+            weight (float): The weight of the heuristic.
+            budget (BudgetTracker): The budget for the search.
+
+        Returns:
+            bool: True if the search finished, False if the budget ran out.
+        """
+        _goal = maze.get_goal()
+        _closed: Set[Cell] = set()
+
+        def _key(cell: Cell) -> float:
+            return self.costs[cell] + weight * heuristic(cell)
+
+        _queue = [(_key(_cell), _cell) for _cell in self.open_cells]
+        heapq.heapify(_queue)
+
+        while _queue:
+
+            # Skip the entries left behind when a cell's cost was lowered.
+
+            _priority, _cell = _queue[0]
+            if _cell not in self.open_cells or _priority != _key(_cell):
+                heapq.heappop(_queue)
+                continue
+            if self.costs.get(_goal, math.inf) <= _priority:
+                break
+            if not budget.expand():
+                return False
+
+            heapq.heappop(_queue)
+            del self.open_cells[_cell]
+            _closed.add(_cell)
+            self.explored.append(_cell)
+
+            for _action, _neighbour in maze.get_neighbours(_cell):
+                _cost = self.costs[_cell] + maze.get_step_cost(_cell, _neighbour)
+                if _cost < self.costs.get(_neighbour, math.inf):
+                    self.costs[_neighbour] = _cost
+                    self.parents[_neighbour] = (_cell, _action)
+                    if _neighbour in _closed:
+                        self.inconsistent_cells[_neighbour] = None
+                    else:
+                        self.open_cells[_neighbour] = None
+                        heapq.heappush(_queue, (_key(_neighbour), _neighbour))
+
+        return True
+
+    def _extract_path(self, start: Cell, goal: Cell) -> Tuple[List[Cell], List[str]]:
+        """
+        _extract_path
+
+        Follows the parents back from the goal to the start.
+
+        Args:
+            start (Cell): The start cell (row, col).
+            goal (Cell): The goal cell (row, col).
+
+        Returns:
+            Tuple[List[Cell], List[str]]: The cells and actions
+                from the start to the goal.
+        """
+        _cells: List[Cell] = []
+        _actions: List[str] = []
+        _cell = goal
+        while _cell != start:
+            _cells.append(_cell)
+            _cell, _action = self.parents[_cell]
+            _actions.append(_action)
+        _cells.reverse()
+        _actions.reverse()
+
+        return _cells, _actions
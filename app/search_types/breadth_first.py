@@ -6,22 +6,24 @@ from __future__ import annotations
 
 from typing import Tuple
 
-from app.search_pattern import Node, SearchPattern
+from app.search_pattern import Node, SearchPattern, SearchPatternFactory
 
+NAME = "Breadth First search"
 
-def load() -> Tuple[str, SearchPattern]:
+
+def load() -> Tuple[str, SearchPatternFactory]:
     """
     load
 
     Loads the search pattern.
     Registration informaiton includes:
         str, The name of the search pattern.
-        Frontier, The search pattern object.
+        SearchPatternFactory, Creates a new search pattern for each search.
 
     Returns:
-        Tuple[int, str, Frontier]: The registration intormation.
+        Tuple[str, SearchPatternFactory]: The registration intormation.
     """
-    return ("Breadth First search", BreadthFirst())
+    return (NAME, BreadthFirst)
 
 
 class BreadthFirst(SearchPattern):
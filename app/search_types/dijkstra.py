@@ -0,0 +1,183 @@
+"""
+Dijkstra's search, using a bucket queue (Dial's algorithm).
+
+As the cost of each step is a small whole number, no more than MAX_COST,
+the frontier only ever holds nodes whose costs lie within MAX_COST of each other.
+So rather than a comparison heap, the frontier is a ring of MAX_COST + 1 buckets,
+one for each cost, and the cheapest node is found by moving round the ring.
+The ring grows if a single step costs more, as a corridor of a reduced maze can.
+"""
+
+from __future__ import annotations
+
+from typing import List, Set, Tuple
+
+from app.maze import MAX_COST
+from app.search_pattern import Node, SearchPattern, SearchPatternFactory
+
+NAME = "Dijkstra search"
+
+
+def load() -> Tuple[str, SearchPatternFactory]:
+    """
+    load
+
+    Loads the search pattern.
+    Registration informaiton includes:
+        str, The name of the search pattern.
+        SearchPatternFactory, Creates a new search pattern for each search.
+
+    Returns:
+        Tuple[str, SearchPatternFactory]: The registration intormation.
+    """
+    return (NAME, Dijkstra)
+
+
+class Dijkstra(SearchPattern):
+    """
+    Dijkstra
+
+    The Dijkstra search pattern, using the cost of getting to each node.
+    """
+
+    def __init__(self) -> None:
+        """
+        __init__
+
+        Initialises the class.
+        """
+        super().__init__()
+
+        self.buckets: List[List[Node]] = [[] for _ in range(MAX_COST + 1)]
+        self.current_cost: int = 0
+        self.size: int = 0
+
+        # A cell can be added again when a cheaper way to it is found,
+        # so the dearer nodes for cells already removed are skipped.
+
+        self.removed_states: Set[Tuple[int, int]] = set()
+
+    def add_to_frontier(self, node: Node) -> None:
+        """
+        add_to_frontier
+
+        Adds a node to the bucket for its cost.
+
+        Args:
+            node (Node): The node to add.
+        """
+        if node.cost - self.current_cost >= len(self.buckets):
+            self._grow(node.cost - self.current_cost + 1)
+
+        self.buckets[node.cost % len(self.buckets)].append(node)
+        self.size += 1
+
+    def _grow(self, size: int) -> None:
+        """
+        _grow
+
+        Makes the ring of buckets larger, for steps that cost more than MAX_COST,
+        such as the corridors of a reduced maze.
+
+        Args:
+            size (int): The smallest number of buckets needed.
+        """
+        _nodes = [_node for _bucket in self.buckets for _node in _bucket]
+        self.buckets = [[] for _ in range(max(size, 2 * len(self.buckets)))]
+        for _node in _nodes:
+            self.buckets[_node.cost % len(self.buckets)].append(_node)
+
+    def dump_frontier(self) -> List[Node]:
+        """
+        dump_frontier
+
+        Returns the nodes in the frontier, to save in a checkpoint.
+
+        Returns:
+            List[Node]: The nodes, cheapest bucket first.
+        """
+        _size = len(self.buckets)
+
+        return [
+            _node
+            for _offset in range(_size)
+            for _node in self.buckets[(self.current_cost + _offset) % _size]
+        ]
+
+    def restore_frontier(
+        self, nodes: List[Node], explored: List[Tuple[int, int]]
+    ) -> None:
+        """
+        restore_frontier
+
+        Restores the frontier from a checkpoint. The cells removed from the
+        frontier are those explored, as the search stops at the goal.
+
+        Args:
+            nodes (List[Node]): The nodes returned by dump_frontier().
+            explored (List[Tuple[int, int]]): The cells explored so far.
+        """
+        self.buckets = [[] for _ in range(MAX_COST + 1)]
+        self.current_cost = min((_node.cost for _node in nodes), default=0)
+        self.size = 0
+        self.removed_states = set(explored)
+        for _node in nodes:
+            self.add_to_frontier(_node)
+
+    def frontier_contains_state(self, state: Tuple[int, int]) -> bool:
+        """
+        frontier_contains_state
+
+        A state is always added again, in case the new node is cheaper.
+
+        Args:
+            state (Tuple[int, int]): state to check.
+
+        Returns:
+            bool: Always False.
+        """
+        return False
+
+    def empty_frontier(self) -> int:
+        """
+        empty_frontier
+
+        Checks if the frontier buffer is empty, moving round to the cheapest bucket.
+
+        Returns:
+            int: Returns true if buffer is empty.
+        """
+        while self.size:
+            _bucket = self.buckets[self.current_cost % len(self.buckets)]
+            while _bucket and _bucket[-1].state in self.removed_states:
+                _bucket.pop()
+                self.size -= 1
+            if _bucket:
+                return False
+            self.current_cost += 1
+
+        return True
+
+    def remove_from_frontier(self) -> Node:
+        """
+        remove_from_frontier
+
+        Removes an item from the frontier buffer to be processed.
+        It is this function that distinguishes the search patterns.
+
+        Raises:
+            ValueError: To indicate the frontier buffer is empty.
+
+        Returns:
+            Node: The removed node.
+        """
+        if self.empty_frontier():
+            raise ValueError("Empty frontier")
+
+        # Remove a node from the cheapest bucket.
+
+        _node = self.buckets[self.current_cost % len(self.buckets)].pop()
+        self.size -= 1
+        self.removed_states.add(_node.state)
+
+        return _node
@@ -0,0 +1,67 @@
+"""
+Hierarchical A* search (HPA*).
+
+Searches the cluster abstraction of the maze, then refines the path
+within each cluster. The abstraction is loaded from next to the maze file
+if it has been saved there, or built the first time the maze is searched,
+and is kept until the maze changes.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+from app.maze import Maze
+from app.maze_abstraction import ClusterAbstraction
+from app.search_budget import BudgetExhausted, BudgetTracker
+from app.search_pattern import PlanningPattern, SearchPatternFactory, Solution
+
+NAME = "Hierarchical A* search"
+
+
+def load() -> Tuple[str, SearchPatternFactory]:
+    """
+    load
+
+    Loads the search pattern.
+    Registration informaiton includes:
+        str, The name of the search pattern.
+        SearchPatternFactory, Creates a new search pattern for each search.
+
+    Returns:
+        Tuple[str, SearchPatternFactory]: The registration intormation.
+    """
+    return (NAME, HierarchicalAStar)
+
+
+class HierarchicalAStar(PlanningPattern):
+    """
+    HierarchicalAStar
+
+    The hierarchical A* search pattern, using the manhattan value.
+    """
+
+    def plan(self, maze: Maze, budget: BudgetTracker) -> Solution:
+        """
+        plan
+
+        Searches the abstraction of the maze, and refines the path found.
+
+        Args:
+            maze (Maze): The maze to search.
+            budget (BudgetTracker): The budget for the search, which is spent
+                by every cell expanded, including those expanded to build the
+                abstraction the first time. An abstraction left unfinished is
+                not kept.
+
+        Returns:
+            Solution: The solution.
+        """
+        try:
+            _abstraction = maze.get_derived(
+                "cluster_abstraction",
+                lambda _maze: ClusterAbstraction.for_maze(_maze, budget=budget),
+            )
+            return _abstraction.find_path(maze, budget)
+        except BudgetExhausted:
+            return Solution([], [], [], budget.num_expansions, exhausted=True)
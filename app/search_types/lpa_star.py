@@ -0,0 +1,344 @@
+"""
+Lifelong Planning A* search.
+
+An incremental search, which keeps its results between searches of the same maze.
+When walls are toggled, only the cells affected by the change are re-expanded
+to repair the previous solution, rather than searching again from scratch.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from app.maze import Maze
+from app.search_budget import BudgetTracker
+from app.search_pattern import PlanningPattern, SearchPatternFactory, Solution
+
+NAME = "Lifelong Planning A* search"
+
+Key = Tuple[float, float]
+
+# The action that leads back the way an action came.
+
+REVERSE_ACTIONS: Dict[str, str] = {"N": "S", "S": "N", "E": "W", "W": "E"}
+
+
+def load() -> Tuple[str, SearchPatternFactory]:
+    """
+    load
+
+    Loads the search pattern.
+    Registration informaiton includes:
+        str, The name of the search pattern.
+        SearchPatternFactory, Creates a new search pattern for each search.
+
+    Returns:
+        Tuple[str, SearchPatternFactory]: The registration intormation.
+    """
+    return (NAME, LifelongPlanningAStar)
+
+
+class LifelongPlanner:
+    """
+    LifelongPlanner
+
+    The state of the Lifelong Planning A* search of a single maze,
+    kept between searches and repaired when the maze changes.
+    """
+
+    def __init__(self) -> None:
+        """
+        __init__
+
+        Initialises the planner.
+        """
+        self._lock = threading.Lock()
+        self._shape: Tuple[int, int, Tuple[int, int], Tuple[int, int]] = (
+            0,
+            0,
+            (0, 0),
+            (0, 0),
+        )
+        self._changed: Set[Tuple[int, int]] = set()
+        self._reloaded: bool = False
+
+        self._g: Dict[Tuple[int, int], float] = {}
+        self._rhs: Dict[Tuple[int, int], float] = {}
+        self._queue: List[Tuple[float, float, Tuple[int, int]]] = []
+        self._queued_keys: Dict[Tuple[int, int], Key] = {}
+
+    def wall_changed(self, cell: Optional[Tuple[int, int]]) -> None:
+        """
+        wall_changed
+
+        Records a change to the maze, to be repaired by the next search.
+
+        Args:
+            cell (Optional[Tuple[int, int]]): The cell that changed (row, col),
+                or None if a new maze was loaded, so the next search starts afresh.
+        """
+        with self._lock:
+            if cell is None:
+                self._reloaded = True
+            else:
+                self._changed.add(cell)
+
+    def plan(self, maze: Maze, budget: BudgetTracker) -> Solution:
+        """
+        plan
+
+        Finds the shortest path through the maze,
+        repairing the previous search if there was one.
+
+        Args:
+            maze (Maze): The maze to search.
+            budget (BudgetTracker): The budget for the search. If it runs out,
+                the next search carries on from where this one stopped.
+
+        Returns:
+            Solution: The solution, with the cells re-expanded by this search.
+        """
+        with self._lock:
+            _shape = (maze.rows, maze.cols, maze.get_start(), maze.get_goal())
+            if _shape != self._shape or self._reloaded:
+                self._reset(maze)
+                self._shape = _shape
+                self._reloaded = False
+            else:
+                for _cell in self._changed:
+                    self._update_cell(maze, _cell)
+                    for _, _neighbour in maze.get_neighbours(_cell):
+                        self._update_cell(maze, _neighbour)
+            self._changed.clear()
+
+            _explored, _finished = self._compute_shortest_path(maze, budget)
+            if not _finished:
+                return Solution([], [], _explored, len(_explored), exhausted=True)
+            _cells, _actions = self._extract_path(maze)
+
+            return Solution(_cells, _actions, _explored, len(_explored))
+
+    def _reset(self, maze: Maze) -> None:
+        """
+        _reset
+
+        Starts a new search of the maze, from the start cell.
+
+        Args:
+            maze (Maze): The maze to search.
+        """
+        self._g = {}
+        self._rhs = {maze.get_start(): 0}
+        self._queue = []
+        self._queued_keys = {}
+        self._push(maze, maze.get_start())
+
+    def _key(self, maze: Maze, cell: Tuple[int, int]) -> Key:
+        """
+        _key
+
+        Returns the priority of a cell in the queue.
+
+        Args:
+            maze (Maze): The maze being searched.
+            cell (Tuple[int, int]): The cell (row, col).
+
+        Returns:
+            Key: The priority, lowest first.
+        """
+        _cost = min(self._g.get(cell, math.inf), self._rhs.get(cell, math.inf))
+
+        return (_cost + maze.get_manhattan(cell), _cost)
+
+    def _push(self, maze: Maze, cell: Tuple[int, int]) -> None:
+        """
+        _push
+
+        Adds a cell to the queue, replacing any earlier entry for it.
+
+        Args:
+            maze (Maze): The maze being searched.
+            cell (Tuple[int, int]): The cell (row, col).
+        """
+        _key = self._key(maze, cell)
+        self._queued_keys[cell] = _key
+        heapq.heappush(self._queue, (_key[0], _key[1], cell))
+
+    def _top_key(self) -> Key:
+        """
+        _top_key
+
+        Returns the lowest priority in the queue, discarding replaced entries.
+
+        Returns:
+            Key: The lowest priority, infinite if the queue is empty.
+        """
+        while self._queue:
+            _k1, _k2, _cell = self._queue[0]
+            if self._queued_keys.get(_cell) == (_k1, _k2):
+                return (_k1, _k2)
+            heapq.heappop(self._queue)
+
+        return (math.inf, math.inf)
+
+    def _update_cell(self, maze: Maze, cell: Tuple[int, int]) -> None:
+        """
+        _update_cell
+
+        Recalculates the best cost of reaching a cell from its neighbours,
+        and queues it if that no longer matches its cost.
+
+        Args:
+            maze (Maze): The maze being searched.
+            cell (Tuple[int, int]): The cell (row, col).
+        """
+        if cell != maze.get_start():
+            if maze.is_wall(cell):
+                self._rhs[cell] = math.inf
+            else:
+                self._rhs[cell] = min(
+                    (
+                        self._g.get(_neighbour, math.inf)
+                        + maze.get_step_cost(_neighbour, cell)
+                        for _, _neighbour in maze.get_neighbours(cell)
+                    ),
+                    default=math.inf,
+                )
+
+        self._queued_keys.pop(cell, None)
+        if self._g.get(cell, math.inf) != self._rhs.get(cell, math.inf):
+            self._push(maze, cell)
+
+    def _compute_shortest_path(
+        self, maze: Maze, budget: BudgetTracker
+    ) -> Tuple[List[Tuple[int, int]], bool]:
+        """
+        _compute_shortest_path
+
+        Expands cells until the cost of the goal is known,
+        or the budget runs out.
+
+        Args:
+            maze (Maze): The maze being searched.
+            budget (BudgetTracker): The budget for the search.
+
+        Returns:
+            Tuple[List[Tuple[int, int]], bool]: The cells expanded, in order,
+                and whether the cost of the goal is known.
+        """
+        _goal = maze.get_goal()
+        _explored: List[Tuple[int, int]] = []
+
+        while True:
+            _top_key = self._top_key()
+            if _top_key == (math.inf, math.inf):
+                break
+            if not (
+                _top_key < self._key(maze, _goal)
+                or self._rhs.get(_goal, math.inf) != self._g.get(_goal, math.inf)
+            ):
+                break
+            if not budget.expand():
+                return _explored, False
+
+            _, _, _cell = heapq.heappop(self._queue)
+            del self._queued_keys[_cell]
+            _explored.append(_cell)
+
+            if self._g.get(_cell, math.inf) > self._rhs.get(_cell, math.inf):
+                self._g[_cell] = self._rhs[_cell]
+            else:
+                self._g[_cell] = math.inf
+                self._update_cell(maze, _cell)
+
+            for _, _neighbour in maze.get_neighbours(_cell):
+                self._update_cell(maze, _neighbour)
+
+        return _explored, True
+
+    def _extract_path(self, maze: Maze) -> Tuple[List[Tuple[int, int]], List[str]]:
+        """
+        _extract_path
+
+        Follows the cheapest neighbours back from the goal to the start.
+
+        Args:
+            maze (Maze): The maze being searched.
+
+        Returns:
+            Tuple[List[Tuple[int, int]], List[str]]: The cells and actions
+                from the start to the goal, empty if the goal cannot be reached.
+        """
+        _cell = maze.get_goal()
+        if self._g.get(_cell, math.inf) == math.inf:
+            return [], []
+
+        _cells: List[Tuple[int, int]] = []
+        _actions: List[str] = []
+        while _cell != maze.get_start() and len(_cells) <= maze.rows * maze.cols:
+            _action, _previous = min(
+                maze.get_neighbours(_cell),
+                key=lambda _neighbour: self._g.get(_neighbour[1], math.inf)
+                + maze.get_step_cost(_neighbour[1], _cell),
+            )
+            _cells.append(_cell)
+            _actions.append(REVERSE_ACTIONS[_action])
+            _cell = _previous
+        _cells.reverse()
+        _actions.reverse()
+
+        return _cells, _actions
+
+
+# The planners are kept for as long as the maze they belong to.
+
+_planners: WeakKeyDictionary[Maze, LifelongPlanner] = WeakKeyDictionary()
+_planners_lock = threading.Lock()
+
+
+def get_planner(maze: Maze) -> LifelongPlanner:
+    """
+    get_planner
+
+    Returns the planner for a maze, creating it the first time.
+
+    Args:
+        maze (Maze): The maze.
+
+    Returns:
+        LifelongPlanner: The planner, which listens for changes to the maze.
+    """
+    with _planners_lock:
+        if maze not in _planners:
+            _planner = LifelongPlanner()
+            maze.add_change_listener(_planner.wall_changed)
+            _planners[maze] = _planner
+
+        return _planners[maze]
+
+
+class LifelongPlanningAStar(PlanningPattern):
+    """
+    LifelongPlanningAStar
+
+    The Lifelong Planning A* search pattern, using the manhattan value.
+    """
+
+    def plan(self, maze: Maze, budget: BudgetTracker) -> Solution:
+        """
+        plan
+
+        Searches the maze, repairing the previous search of it if there was one.
+
+        Args:
+            maze (Maze): The maze to search.
+            budget (BudgetTracker): The budget for the search.
+
+        Returns:
+            Solution: The solution.
+        """
+        return get_planner(maze).plan(maze, budget)
@@ -0,0 +1,71 @@
+"""
+Parallel breadth first search.
+
+Searches the maze one level at a time, with the rows split into bands
+searched by worker processes, as described in app.search_parallel.
+Small mazes are searched in a single band, without any workers.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from app.maze import Maze
+from app.search_budget import BudgetTracker
+from app.search_parallel import parallel_breadth_first
+from app.search_pattern import PlanningPattern, SearchPatternFactory, Solution
+
+NAME = "Parallel Breadth First search"
+
+
+def load() -> Tuple[str, SearchPatternFactory]:
+    """
+    load
+
+    Loads the search pattern.
+    Registration informaiton includes:
+        str, The name of the search pattern.
+        SearchPatternFactory, Creates a new search pattern for each search.
+
+    Returns:
+        Tuple[str, SearchPatternFactory]: The registration intormation.
+    """
+    return (NAME, ParallelBreadthFirst)
+
+
+class ParallelBreadthFirst(PlanningPattern):
+    """
+    ParallelBreadthFirst
+
+    The breadth first search pattern, spread over one worker process for each CPU.
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        """
+        __init__
+
+        Initialises the class.
+
+        Args:
+            workers (Optional[int], optional): The number of worker processes.
+                Defaults to one for each CPU.
+        """
+        super().__init__()
+        self.workers: Optional[int] = workers
+
+    def plan(self, maze: Maze, budget: BudgetTracker) -> Solution:
+        """
+        plan
+
+        Searches the maze breadth first, a level at a time.
+
+        Args:
+            maze (Maze): The maze to search.
+            budget (BudgetTracker): The budget for the search,
+                which is checked before each level, or every POLL_INTERVAL
+                seconds while worker processes search.
+
+        Returns:
+            Solution: The solution, without the cells explored.
+        """
+        return parallel_breadth_first(maze, self.workers, budget)
@@ -0,0 +1,115 @@
+"""
+Shared fixtures for the tests, which build small mazes in temporary files.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Callable, List, Tuple
+
+import pytest
+
+from app.maze import Maze
+from app.search import Solver
+from app.search_pattern import Solution
+
+MazeText = Callable[..., str]
+MazeFile = Callable[[str, str], str]
+PathCost = Callable[[Maze, List[Tuple[int, int]]], int]
+Solve = Callable[..., Solution]
+
+
+@pytest.fixture(name="maze_text")
+def fixture_maze_text() -> MazeText:
+    """
+    maze_text
+
+    Returns:
+        MazeText: Builds the text of a random maze, from the top left corner
+            to the bottom right, with walls and, if weighted, terrain costs.
+    """
+
+    def _maze_text(
+        rows: int,
+        cols: int,
+        seed: int,
+        walls: float = 0.25,
+        weighted: bool = True,
+    ) -> str:
+        _random = random.Random(seed)
+        _lines = []
+        for _row in range(rows):
+            _line = []
+            for _col in range(cols):
+                _value = _random.random()
+                if _value < walls:
+                    _line.append("*")
+                elif weighted and _value < walls + (1 - walls) / 2:
+                    _line.append(str(_random.randint(2, 9)))
+                else:
+                    _line.append(" ")
+            _lines.append(_line)
+        _lines[0][0] = "A"
+        _lines[rows - 1][cols - 1] = "B"
+
+        return "\n".join("".join(_line) for _line in _lines) + "\n"
+
+    return _maze_text
+
+
+@pytest.fixture(name="maze_file")
+def fixture_maze_file(tmp_path) -> MazeFile:
+    """
+    maze_file
+
+    Returns:
+        MazeFile: Writes the text of a maze to a named file in a temporary
+            directory, and returns its absolute path.
+    """
+
+    def _maze_file(name: str, text: str) -> str:
+        _path = tmp_path / name
+        _path.write_text(text, encoding="utf-8")
+        return str(_path)
+
+    return _maze_file
+
+
+@pytest.fixture(name="path_cost")
+def fixture_path_cost() -> PathCost:
+    """
+    path_cost
+
+    Returns:
+        PathCost: Checks that a path leads from the start of a maze to its goal
+            one step at a time, and returns the cost of following it.
+    """
+
+    def _path_cost(maze: Maze, cells: List[Tuple[int, int]]) -> int:
+        _cost = 0
+        _previous = maze.get_start()
+        for _cell in cells:
+            assert _cell in [_state for _, _state in maze.get_neighbours(_previous)]
+            _cost += maze.get_step_cost(_previous, _cell)
+            _previous = _cell
+        assert _previous == maze.get_goal()
+
+        return _cost
+
+    return _path_cost
+
+
+@pytest.fixture(name="solve")
+def fixture_solve() -> Solve:
+    """
+    solve
+
+    Returns:
+        Solve: Solves a maze with a search pattern factory through the solver,
+            passing any other keyword arguments on to it, and ignoring progress.
+    """
+
+    def _solve(pattern: Callable, maze: Maze, **kwargs) -> Solution:
+        return Solver(pattern, maze, **kwargs).solve(lambda *_args: None)
+
+    return _solve
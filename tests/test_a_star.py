@@ -0,0 +1,30 @@
+"""
+Tests that A* search finds the cheapest path, as Dijkstra search does.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.maze import Maze
+from app.search import Solver
+from app.search_types.a_star import AStar
+from app.search_types.a_star_landmarks import AStarLandmarks
+from app.search_types.dijkstra import Dijkstra
+
+
+@pytest.mark.parametrize("pattern", [AStar, AStarLandmarks])
+@pytest.mark.parametrize("reduce", [False, True])
+def test_a_star_matches_dijkstra_on_weighted_mazes(
+    maze_text, maze_file, path_cost, pattern, reduce
+) -> None:
+    for _seed in range(8):
+        _maze = Maze(maze_file(f"maze{_seed}.txt", maze_text(20, 20, _seed)))
+        _expected = Solver(Dijkstra, _maze).solve(lambda *_args: None)
+        _solution = Solver(pattern, _maze, reduce=reduce).solve(lambda *_args: None)
+
+        assert _solution.found == _expected.found
+        if _expected.found:
+            assert path_cost(_maze, _solution.cells) == path_cost(
+                _maze, _expected.cells
+            )
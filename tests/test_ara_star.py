@@ -0,0 +1,56 @@
+"""
+Tests that ARA* improves its path until it is the cheapest, or the budget runs out.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+from app.maze import Maze
+from app.search_budget import SearchBudget
+from app.search_types.ara_star import AnytimeRepairingAStar
+from app.search_types.dijkstra import Dijkstra
+
+
+def test_ara_star_ends_with_the_cheapest_path(
+    maze_text, maze_file, path_cost, solve
+) -> None:
+    for _seed in range(8):
+        _maze = Maze(maze_file(f"maze{_seed}.txt", maze_text(20, 20, _seed)))
+        _patterns: List[AnytimeRepairingAStar] = []
+
+        def _factory() -> AnytimeRepairingAStar:
+            _patterns.append(AnytimeRepairingAStar())
+            return _patterns[-1]
+
+        _expected = solve(Dijkstra, _maze)
+        _solution = solve(_factory, _maze)
+
+        assert _solution.found == _expected.found
+        assert not _solution.exhausted
+        if _expected.found:
+            _cost = path_cost(_maze, _solution.cells)
+            assert _cost == path_cost(_maze, _expected.cells)
+
+            # Each path found is cheaper than the last, ending with the cheapest.
+
+            _costs = [_cost for _, _cost in _patterns[0].improvements]
+            assert _costs == sorted(set(_costs), reverse=True)
+            assert _costs[-1] == _cost
+
+
+def test_ara_star_keeps_the_best_path_when_the_budget_runs_out(
+    maze_text, maze_file, path_cost, solve
+) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(30, 30, 3, walls=0.1)))
+    _expected = solve(Dijkstra, _maze)
+    _full = solve(AnytimeRepairingAStar, _maze)
+
+    _solution = solve(
+        AnytimeRepairingAStar,
+        _maze,
+        budget=SearchBudget(max_expansions=_full.num_explored - 1),
+    )
+    assert _solution.exhausted and _solution.found
+    assert _solution.num_explored == _full.num_explored - 1
+    assert path_cost(_maze, _solution.cells) >= path_cost(_maze, _expected.cells)
@@ -0,0 +1,46 @@
+"""
+Tests that Dijkstra search finds the cheapest path through weighted mazes.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Optional, Tuple
+
+import pytest
+
+from app.maze import Maze
+from app.search import Solver
+from app.search_types.dijkstra import Dijkstra
+
+
+def _cheapest_cost(maze: Maze) -> Optional[int]:
+    _costs: Dict[Tuple[int, int], int] = {}
+    _queue = [(0, maze.get_start())]
+    while _queue:
+        _cost, _cell = heapq.heappop(_queue)
+        if _cell in _costs:
+            continue
+        _costs[_cell] = _cost
+        for _, _neighbour in maze.get_neighbours(_cell):
+            if _neighbour not in _costs:
+                heapq.heappush(
+                    _queue, (_cost + maze.get_step_cost(_cell, _neighbour), _neighbour)
+                )
+
+    return _costs.get(maze.get_goal())
+
+
+@pytest.mark.parametrize("reduce", [False, True])
+def test_dijkstra_finds_the_cheapest_path(
+    maze_text, maze_file, path_cost, reduce
+) -> None:
+    for _seed in range(10):
+        _maze = Maze(maze_file(f"maze{_seed}.txt", maze_text(20, 20, _seed)))
+        _expected = _cheapest_cost(_maze)
+        _solution = Solver(Dijkstra, _maze, reduce=reduce).solve(lambda *_args: None)
+
+        if _expected is None:
+            assert not _solution.found
+        else:
+            assert path_cost(_maze, _solution.cells) == _expected
@@ -0,0 +1,46 @@
+"""
+Tests for hierarchical A* search.
+"""
+
+from __future__ import annotations
+
+from app.maze import Maze
+from app.search_budget import CancellationToken, SearchBudget
+from app.search_types.dijkstra import Dijkstra
+from app.search_types.hpa_star import HierarchicalAStar
+
+
+def test_hpa_star_finds_a_path_whenever_dijkstra_does(
+    maze_text, maze_file, path_cost, solve
+) -> None:
+    for _seed in range(5):
+        _maze = Maze(maze_file(f"maze{_seed}.txt", maze_text(25, 25, _seed)))
+        _expected = solve(Dijkstra, _maze)
+        _solution = solve(HierarchicalAStar, _maze)
+
+        assert _solution.found == _expected.found
+        if _expected.found:
+            assert path_cost(_maze, _solution.cells) >= path_cost(
+                _maze, _expected.cells
+            )
+
+
+def test_hpa_star_stops_when_the_budget_runs_out(maze_text, maze_file, solve) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(40, 40, 1, walls=0.0)))
+
+    _solution = solve(HierarchicalAStar, _maze, budget=SearchBudget(max_expansions=50))
+    assert _solution.exhausted and not _solution.found
+    assert _solution.num_explored == 50
+
+    # The unfinished abstraction is not kept, so the next search builds it again.
+
+    assert solve(HierarchicalAStar, _maze).found
+
+
+def test_hpa_star_can_be_cancelled(maze_text, maze_file, solve) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(40, 40, 1, walls=0.0)))
+    _cancellation = CancellationToken()
+    _cancellation.cancel()
+
+    _solution = solve(HierarchicalAStar, _maze, cancellation=_cancellation)
+    assert _solution.exhausted and not _solution.found
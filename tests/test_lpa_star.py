@@ -0,0 +1,48 @@
+"""
+Tests that Lifelong Planning A* stays optimal as the maze changes.
+"""
+
+from __future__ import annotations
+
+import random
+
+from app.maze import Maze
+from app.search_types.dijkstra import Dijkstra
+from app.search_types.lpa_star import LifelongPlanningAStar
+
+
+def test_lpa_star_matches_dijkstra_after_toggling_walls(
+    maze_text, maze_file, path_cost, solve
+) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(15, 15, 3, walls=0.2)))
+    _random = random.Random(3)
+
+    for _ in range(30):
+        _expected = solve(Dijkstra, _maze)
+        _solution = solve(LifelongPlanningAStar, _maze)
+        assert _solution.found == _expected.found
+        if _expected.found:
+            assert path_cost(_maze, _solution.cells) == path_cost(
+                _maze, _expected.cells
+            )
+
+        _cell = (_random.randrange(15), _random.randrange(15))
+        if _cell not in (_maze.start, _maze.goal):
+            _maze.toggle_wall(_cell)
+
+
+def test_lpa_star_starts_afresh_when_a_maze_of_the_same_shape_is_loaded(
+    maze_text, maze_file, path_cost, solve
+) -> None:
+    _maze = Maze(maze_file("first.txt", maze_text(12, 12, 4, walls=0.1)))
+    solve(LifelongPlanningAStar, _maze)
+
+    for _seed in range(5, 10):
+        _maze.load(maze_file(f"maze{_seed}.txt", maze_text(12, 12, _seed, walls=0.1)))
+        _expected = solve(Dijkstra, _maze)
+        _solution = solve(LifelongPlanningAStar, _maze)
+        assert _solution.found == _expected.found
+        if _expected.found:
+            assert path_cost(_maze, _solution.cells) == path_cost(
+                _maze, _expected.cells
+            )
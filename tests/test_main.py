@@ -0,0 +1,84 @@
+"""
+Tests for the command line entry point.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.maze import Maze
+
+
+def test_command_line_modes_do_not_load_the_default_maze(
+    maze_text, maze_file, monkeypatch, capsys
+) -> None:
+    _loaded = []
+    _load = Maze.load
+
+    def _counting_load(self, filename: str = "maze.txt", *args) -> None:
+        _loaded.append(filename)
+        _load(self, filename, *args)
+
+    monkeypatch.setattr(Maze, "load", _counting_load)
+    _main = importlib.reload(importlib.import_module("app.__main__"))
+    assert not _loaded
+
+    _main.main(["--benchmark", "--benchmark-size", "16", "--workers", "1"])
+    assert "1.00x" in capsys.readouterr().out
+
+    _filename = maze_file("maze.txt", maze_text(6, 6, 1, walls=0.0))
+    _main.main(
+        [
+            "--batch",
+            os.path.dirname(_filename),
+            "--workers",
+            "1",
+            "--pattern",
+            "Breadth First search",
+        ]
+    )
+    assert "path=10" in capsys.readouterr().out
+    assert _loaded == [_filename]
+
+
+def test_trace_rejects_an_unknown_search_pattern(
+    maze_text, maze_file, tmp_path, capsys
+) -> None:
+    _main = importlib.import_module("app.__main__")
+    _filename = maze_file("maze.txt", maze_text(6, 6, 1, walls=0.0))
+    _trace = str(tmp_path / "search.trace")
+
+    with pytest.raises(SystemExit) as _exit:
+        _main.main(["--maze", _filename, "--trace", _trace, "--pattern", "Nope"])
+    assert _exit.value.code == 2
+    assert "unknown search pattern 'Nope'" in capsys.readouterr().err
+    assert not os.path.exists(_trace)
+
+    _main.main(
+        ["--maze", _filename, "--trace", _trace, "--pattern", "Breadth First search"]
+    )
+    assert "path=10" in capsys.readouterr().out
+    assert os.path.exists(_trace)
+
+
+def test_starting_the_app_imports_no_search_type() -> None:
+    _result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.__main__; print(sorted(_name for _name in sys.modules "
+            + "if _name.startswith('app.search_types.') "
+            + "or _name == 'app.search_benchmark'))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert _result.stdout.strip() == "[]"
@@ -0,0 +1,36 @@
+"""
+Tests for the maze and its compact grid.
+"""
+
+from __future__ import annotations
+
+from app.maze import OPEN, WALL, Maze
+
+
+def test_toggle_wall_twice_keeps_terrain_cost(maze_file) -> None:
+    _maze = Maze(maze_file("maze.txt", "A 7\n  B\n"))
+    _hash = _maze.content_hash()
+
+    assert _maze.toggle_wall((0, 2))
+    assert _maze.grid[2] == WALL
+    assert _maze.maze[0][2] == "*"
+
+    assert not _maze.toggle_wall((0, 2))
+    assert _maze.grid[2] == 7
+    assert _maze.maze[0][2] == "7"
+    assert _maze.content_hash() == _hash
+
+    _maze.toggle_wall((1, 0))
+    _maze.toggle_wall((1, 0))
+    assert _maze.grid[3] == OPEN
+
+
+def test_load_notifies_change_listeners(maze_file) -> None:
+    _maze = Maze(maze_file("first.txt", "A \n B\n"))
+    _changes = []
+    _maze.add_change_listener(_changes.append)
+
+    _maze.toggle_wall((0, 1))
+    _maze.load(maze_file("second.txt", "A*\n B\n"))
+
+    assert _changes == [(0, 1), None]
@@ -0,0 +1,90 @@
+"""
+Tests for the parallel breadth first search, split over one band or several.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+
+import pytest
+
+from app import search_parallel
+from app.maze import OPEN, WALL, Maze
+from app.search_benchmark import open_grid
+from app.search_budget import CancellationToken, SearchBudget
+from app.search_parallel import band_rows
+from app.search_types.breadth_first import BreadthFirst
+from app.search_types.parallel_breadth_first import ParallelBreadthFirst
+
+
+@pytest.fixture(name="small_bands")
+def fixture_small_bands(monkeypatch) -> None:
+    """
+    small_bands
+
+    Lets small mazes be split into bands four rows high.
+    """
+    monkeypatch.setattr(search_parallel, "MIN_BAND_ROWS", 4)
+
+
+@pytest.mark.usefixtures("small_bands")
+@pytest.mark.parametrize("workers", [1, 2, 3, 5])
+def test_parallel_breadth_first_finds_the_fewest_steps(
+    maze_text, maze_file, path_cost, workers, solve
+) -> None:
+    assert len(band_rows(24, workers)) - 1 == workers
+
+    for _seed in range(6):
+        _maze = Maze(
+            maze_file(f"maze{_seed}.txt", maze_text(24, 24, _seed, 0.3, False))
+        )
+        _expected = solve(BreadthFirst, _maze)
+        _solution = solve(partial(ParallelBreadthFirst, workers), _maze)
+
+        assert _solution.found == _expected.found
+        if _expected.found:
+            assert path_cost(_maze, _solution.cells) == len(_expected.cells)
+            assert len(_solution.actions) == len(_solution.cells)
+
+
+@pytest.mark.usefixtures("small_bands")
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_breadth_first_gives_up_on_an_unreachable_goal(workers, solve) -> None:
+    _grid = bytearray([OPEN]) * (16 * 16)
+    for _col in range(16):
+        _grid[8 * 16 + _col] = WALL
+    _maze = Maze.from_grid(_grid, 16, 16, (0, 0), (15, 15), "split")
+
+    _solution = solve(partial(ParallelBreadthFirst, workers), _maze)
+    assert not _solution.found and not _solution.exhausted
+    assert _solution.num_explored == 8 * 16
+
+
+@pytest.mark.usefixtures("small_bands")
+def test_parallel_breadth_first_stops_when_the_budget_runs_out(solve) -> None:
+    # A single band checks the budget before each level.
+
+    _solution = solve(
+        partial(ParallelBreadthFirst, 1),
+        open_grid(16),
+        budget=SearchBudget(max_expansions=10),
+    )
+    assert _solution.exhausted and not _solution.found
+    assert _solution.num_explored == 1 + 2 + 3 + 4
+
+    # Workers are stopped by the searching process once it sees the budget is spent.
+
+    _solution = solve(
+        partial(ParallelBreadthFirst, 4),
+        open_grid(512),
+        budget=SearchBudget(max_expansions=10),
+    )
+    assert _solution.exhausted and not _solution.found
+    assert _solution.num_explored < 512 * 512
+
+    _cancellation = CancellationToken()
+    _cancellation.cancel()
+    _solution = solve(
+        partial(ParallelBreadthFirst, 4), open_grid(16), cancellation=_cancellation
+    )
+    assert _solution.exhausted and not _solution.found
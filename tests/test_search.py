@@ -0,0 +1,91 @@
+"""
+Tests for the solver, run with every registered search pattern.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.maze import OPEN, WALL, Maze
+from app.search import Solver
+from app.search_loader import SearchLoader
+from app.search_types.breadth_first import BreadthFirst
+
+_loader = SearchLoader()
+_loader.discover_search_modules()
+PATTERNS = _loader.list_search_types()
+
+
+def _open_grid(rows: int, cols: int) -> bytearray:
+    return bytearray([OPEN]) * (rows * cols)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_grid_mazes_are_solved_without_labelling_components(pattern) -> None:
+    _maze = Maze.from_grid(_open_grid(6, 6), 6, 6, (0, 0), (5, 5))
+
+    _solution = Solver(_loader.get_search_pattern_factory(pattern), _maze).solve(
+        lambda *_args: None
+    )
+
+    assert _solution.found
+    assert not _maze.has_derived("components")
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_unreachable_goal_is_not_found(pattern) -> None:
+    _grid = _open_grid(6, 6)
+    for _row in range(6):
+        _grid[_row * 6 + 3] = WALL
+    _maze = Maze.from_grid(_grid, 6, 6, (0, 0), (5, 5))
+
+    _solution = Solver(_loader.get_search_pattern_factory(pattern), _maze).solve(
+        lambda *_args: None
+    )
+
+    assert not _solution.found
+    assert not _solution.exhausted
+
+
+def test_loaded_maze_with_unreachable_goal_is_answered_without_searching(
+    maze_file,
+) -> None:
+    _maze = Maze(maze_file("maze.txt", "A *  \n  * B\n"))
+
+    _solution = Solver(
+        _loader.get_search_pattern_factory("Breadth First search"), _maze
+    ).solve(lambda *_args: None)
+
+    assert not _solution.found
+    assert _solution.num_explored == 0
+
+
+def test_a_search_pattern_object_is_copied_for_each_search() -> None:
+    _maze = Maze.from_grid(_open_grid(6, 6), 6, 6, (0, 0), (5, 5))
+    _pattern = BreadthFirst()
+    _solver = Solver(_pattern, _maze)
+
+    _first = _solver.solve(lambda *_args: None)
+    _second = asyncio.run(_solver.solve_async(lambda *_args: None))
+
+    assert _first.found and _second.cells == _first.cells
+    assert not _pattern.frontier_buffer
+
+
+def test_importing_the_solver_does_not_import_asyncio() -> None:
+    _result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.search; sys.exit('asyncio' in sys.modules)",
+        ],
+        check=False,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert _result.returncode == 0
@@ -0,0 +1,94 @@
+"""
+Tests for solving a directory of mazes in a process pool.
+"""
+
+from __future__ import annotations
+
+import os
+
+from app import maze as maze_module
+from app import search_batch
+from app.maze import Maze
+from app.search import Solver
+from app.search_types.breadth_first import BreadthFirst
+
+PATTERN = "Breadth First search"
+
+
+def test_run_batch_solves_every_maze(maze_text, maze_file) -> None:
+    _filenames = [
+        maze_file(f"maze{_index}.txt", maze_text(12, 12, _index, weighted=False))
+        for _index in range(5)
+    ]
+
+    _results = {
+        os.path.basename(_stats.maze): _stats
+        for _stats in search_batch.run_batch(
+            os.path.dirname(_filenames[0]), [PATTERN], max_workers=1
+        )
+    }
+
+    assert len(_results) == 5
+    for _filename in _filenames:
+        _expected = Solver(BreadthFirst, Maze(_filename)).solve(lambda *_args: None)
+        assert _results[os.path.basename(_filename)].path_length == len(
+            _expected.cells
+        )
+
+
+def test_run_batch_streams_before_loading_every_maze(
+    maze_text, maze_file, monkeypatch
+) -> None:
+    _filenames = [
+        maze_file(f"maze{_index:02}.txt", maze_text(8, 8, 0, walls=0.0))
+        for _index in range(20)
+    ]
+    _loaded = []
+
+    class _CountingMaze(Maze):
+        def __init__(self, filename=None, **kwargs) -> None:
+            if filename is not None:
+                _loaded.append(filename)
+            super().__init__(filename, **kwargs)
+
+    monkeypatch.setattr(search_batch, "Maze", _CountingMaze)
+
+    _results = search_batch.run_batch(
+        os.path.dirname(_filenames[0]), [PATTERN], max_workers=1
+    )
+    next(_results)
+    assert len(_loaded) <= search_batch.MAZES_PER_WORKER + 1
+
+    assert len(list(_results)) == len(_filenames) - 1
+    assert len(_loaded) == len(_filenames)
+
+
+def test_run_batch_labels_components_in_the_workers(
+    maze_text, maze_file, monkeypatch
+) -> None:
+    _open = maze_file("open.txt", maze_text(8, 8, 0, walls=0.0))
+    _walled = maze_file("walled.txt", "A * \n**  \n   B\n")
+    _labelled = []
+    _label_components = maze_module._label_components
+
+    def _counting_label_components(maze: Maze):
+        _labelled.append(maze.filename)
+        return _label_components(maze)
+
+    monkeypatch.setattr(maze_module, "_label_components", _counting_label_components)
+
+    _results = {
+        os.path.basename(_stats.maze): _stats
+        for _stats in search_batch.run_batch(
+            os.path.dirname(_open), [PATTERN, "Dijkstra search"], max_workers=1
+        )
+    }
+
+    # The workers were forked with the counter, so only labelling
+    # in this process would be seen here.
+
+    assert not _labelled
+    assert len(_results) == 2
+    assert _results[os.path.basename(_walled)].path_length == 0
+    assert _results[os.path.basename(_walled)].num_explored == 0
+    assert _results[os.path.basename(_open)].path_length == 14
@@ -0,0 +1,104 @@
+"""
+Tests for saving and resuming searches from checkpoints.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+from app.maze import Maze
+from app.search import Solver
+from app.search_budget import SearchBudget
+from app.search_checkpoint import (
+    CHECKPOINT_VERSION,
+    Checkpointer,
+    SearchCheckpoint,
+    pattern_id,
+)
+from app.search_pattern import Node
+from app.search_types.a_star import AStar
+from app.search_types.breadth_first import BreadthFirst
+from app.search_types.dijkstra import Dijkstra
+
+
+def _checkpoint() -> SearchCheckpoint:
+    _start = Node(state=(0, 0), parent=None, action="")
+    _east = Node(state=(0, 1), parent=_start, action="E", manhattan=4, cost=7)
+    _south = Node(state=(1, 0), parent=_start, action="S", manhattan=3, cost=1)
+    _on = Node(state=(2, 0), parent=_south, action="S", manhattan=2, cost=2)
+
+    return SearchCheckpoint("ab" * 32, "app.x.Pattern", True, 3, [(0, 0)], [_east, _on])
+
+
+def test_checkpoint_round_trip(tmp_path) -> None:
+    _filename = str(tmp_path / "search.ckpt")
+    _checkpoint().save(_filename, cols=5)
+
+    _loaded = SearchCheckpoint.load(_filename)
+
+    assert (_loaded.content_hash, _loaded.pattern, _loaded.reduce) == (
+        "ab" * 32,
+        "app.x.Pattern",
+        True,
+    )
+    assert _loaded.num_explored == 3
+    assert _loaded.explored == [(0, 0)]
+    assert [
+        (_node.state, _node.action, _node.manhattan, _node.cost)
+        for _node in _loaded.frontier
+    ] == [((0, 1), "E", 4, 7), ((2, 0), "S", 2, 2)]
+
+    # Nodes that shared a parent still share it.
+
+    _east, _on = _loaded.frontier
+    assert _on.parent is not None and _on.parent.state == (1, 0)
+    assert _east.parent is _on.parent.parent
+    assert not (tmp_path / "search.ckpt.tmp").exists()
+
+
+def test_damaged_checkpoints_are_rejected(tmp_path) -> None:
+    _filename = tmp_path / "search.ckpt"
+    _checkpoint().save(str(_filename), cols=5)
+    _data = _filename.read_bytes()
+
+    _filename.write_bytes(_data[:-4])
+    with pytest.raises(ValueError, match="damaged"):
+        SearchCheckpoint.load(str(_filename))
+
+    _filename.write_bytes(b"XXXX" + _data[4:])
+    with pytest.raises(ValueError, match="not a checkpoint"):
+        SearchCheckpoint.load(str(_filename))
+
+    _version = struct.pack("<H", CHECKPOINT_VERSION + 1)
+    _filename.write_bytes(_data[:4] + _version + _data[6:])
+    with pytest.raises(ValueError, match="version"):
+        SearchCheckpoint.load(str(_filename))
+
+    _checkpointer = Checkpointer(str(_filename))
+    assert _checkpointer.resume(Maze(None), "app.x.Pattern", True) is None
+
+
+@pytest.mark.parametrize("pattern", [BreadthFirst, AStar, Dijkstra])
+def test_resumed_search_matches_an_uninterrupted_one(
+    maze_text, maze_file, tmp_path, pattern
+) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(20, 20, 2, walls=0.15)))
+    _expected = Solver(pattern, _maze).solve(lambda *_args: None)
+
+    _checkpointer = Checkpointer(str(tmp_path / "search.ckpt"))
+    _stopped = Solver(
+        pattern, _maze, budget=SearchBudget(max_expansions=40), checkpoint=_checkpointer
+    ).solve(lambda *_args: None)
+    assert _stopped.exhausted
+
+    _resumed_from = _checkpointer.resume(_maze, pattern_id(pattern), False)
+    assert _resumed_from is not None and _resumed_from.num_explored == 40
+
+    _solution = Solver(pattern, _maze, checkpoint=_checkpointer).solve(
+        lambda *_args: None
+    )
+    assert _solution.cells == _expected.cells
+    assert _solution.num_explored == _expected.num_explored
+    assert not (tmp_path / "search.ckpt").exists()
@@ -0,0 +1,131 @@
+"""
+Tests for comparing search patterns on the same maze, and the table of results.
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from typing import List
+
+from app.maze import Maze
+from app.search_budget import SearchBudget
+from app.search_compare import (
+    SearchStats,
+    compare_search_patterns,
+    format_comparison,
+    solve_and_measure,
+)
+from app.search_types.dijkstra import Dijkstra
+
+PATTERNS = ["Dijkstra search", "Breadth First search", "A* search"]
+
+
+def test_compare_search_patterns_keeps_the_order_given(
+    maze_text, maze_file, path_cost
+) -> None:
+    _filename = maze_file("maze.txt", maze_text(16, 16, 2, walls=0.1))
+    _maze = Maze(_filename)
+
+    _results = compare_search_patterns(_filename, PATTERNS, max_workers=1)
+
+    assert [_stats.pattern for _stats in _results] == PATTERNS
+    for _stats in _results:
+        assert _stats.maze == _maze.filename
+        assert _stats.path_cost == path_cost(_maze, _stats.cells)
+        assert _stats.seconds > 0 and _stats.peak_memory > 0
+
+    # Dijkstra and A* find the cheapest path, breadth first the fewest steps.
+
+    assert _results[0].path_cost == _results[2].path_cost
+    assert _results[0].path_cost <= _results[1].path_cost
+    assert _results[1].path_length <= _results[0].path_length
+    assert compare_search_patterns(_filename, []) == []
+
+
+def test_solve_and_measure_times_the_search_without_tracing_memory(
+    maze_text, maze_file
+) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(16, 16, 2)))
+    _tracing: List[bool] = []
+
+    def _factory() -> Dijkstra:
+        _tracing.append(tracemalloc.is_tracing())
+        return Dijkstra()
+
+    _stats = solve_and_measure("Dijkstra search", _factory, _maze)
+    assert _tracing == [False, True]
+    assert _stats.peak_memory > 0
+    assert not tracemalloc.is_tracing()
+
+    _tracing.clear()
+    _stats = solve_and_measure("Dijkstra search", _factory, _maze, trace_memory=False)
+    assert _tracing == [False]
+    assert _stats.peak_memory == 0
+
+
+def test_format_comparison_lines_up_the_table() -> None:
+    _results = [
+        SearchStats("A* search", "maze.txt", 12, [(0, 1)] * 5, [], 0.0015, 2048, 9),
+        SearchStats(
+            "Depth First search",
+            "maze.txt",
+            3,
+            [],
+            [],
+            0.25,
+            512,
+            exhausted=True,
+        ),
+    ]
+
+    _lines = format_comparison(_results).splitlines()
+
+    assert len(_lines) == 4
+    assert _lines[0].split("  ")[0].rstrip() == "Search pattern"
+    assert set(_lines[1].replace(" ", "")) == {"-"}
+    assert len({len(_line) for _line in _lines}) == 1
+    assert _lines[2].split() == ["A*", "search", "12", "5", "9", "1.50", "2.0"]
+    assert _lines[3].split() == [
+        "Depth",
+        "First",
+        "search",
+        "*",
+        "3",
+        "-",
+        "-",
+        "250.00",
+        "0.5",
+    ]
+
+
+def test_solve_and_measure_marks_an_exhausted_search(maze_text, maze_file) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(16, 16, 4, walls=0.0)))
+
+    _stats = solve_and_measure(
+        "Dijkstra search",
+        Dijkstra,
+        _maze,
+        trace_memory=False,
+        budget=SearchBudget(max_expansions=5),
+    )
+    assert _stats.exhausted and _stats.path_length == 0
+    assert "*" in format_comparison([_stats])
+
+
+def test_compare_search_patterns_searches_the_maze_as_edited(
+    maze_text, maze_file
+) -> None:
+    _filename = maze_file("maze.txt", maze_text(8, 8, 0, walls=0.0))
+    _maze = Maze(_filename)
+
+    # Wall the goal in after the maze was loaded, so that only the file has a path.
+
+    _maze.toggle_wall((7, 6))
+    _maze.toggle_wall((6, 7))
+
+    _results = compare_search_patterns(_maze, PATTERNS, max_workers=1)
+
+    for _stats in _results:
+        assert _stats.maze == _maze.filename
+        assert _stats.path_length == 0 and not _stats.exhausted
+        assert (7, 6) not in _stats.explored and (6, 7) not in _stats.explored
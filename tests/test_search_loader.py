@@ -0,0 +1,109 @@
+"""
+Tests for loading search types.
+"""
+
+from __future__ import annotations
+
+import sys
+from importlib.metadata import EntryPoint
+from typing import List
+
+import pytest
+
+from app import search_loader
+from app.search_checkpoint import pattern_id
+from app.search_loader import ENTRY_POINT_GROUP, SearchLoader
+from app.search_pattern import as_factory
+from app.search_types.breadth_first import BreadthFirst
+
+PLUGIN = """
+from app.search_types.breadth_first import BreadthFirst
+
+NAME = "Plugin search"
+
+
+def load():
+    return (NAME, BreadthFirst)
+"""
+
+
+class _LegacyPattern(BreadthFirst):
+    def __init__(self, label: str) -> None:
+        super().__init__()
+        self.label = label
+
+
+def test_legacy_instance_is_copied_for_each_search() -> None:
+    _registered = _LegacyPattern("kept")
+    _factory = as_factory(_registered)
+
+    _first = _factory()
+    _second = _factory()
+
+    assert isinstance(_first, _LegacyPattern)
+    assert _first.label == _second.label == "kept"
+    assert _first is not _registered and _first is not _second
+    assert _first.frontier_buffer is not _second.frontier_buffer
+    assert pattern_id(_factory) == pattern_id(_LegacyPattern)
+
+
+def test_factories_are_returned_unchanged() -> None:
+    assert as_factory(BreadthFirst) is BreadthFirst
+
+
+def test_discovery_does_not_import_the_search_types(monkeypatch) -> None:
+    for _module in list(sys.modules):
+        if _module.startswith("app.search_types."):
+            monkeypatch.delitem(sys.modules, _module)
+
+    _loader = SearchLoader()
+    _loader.discover_search_modules()
+
+    assert "Breadth First search" in _loader.list_search_types()
+    assert not [
+        _module for _module in sys.modules if _module.startswith("app.search_types.")
+    ]
+
+    _loader.get_search_pattern_factory("Breadth First search")
+    assert "app.search_types.breadth_first" in sys.modules
+
+
+def test_entry_points_are_loaded_on_demand(tmp_path, monkeypatch) -> None:
+    (tmp_path / "maze_plugin.py").write_text(PLUGIN, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "maze_plugin", raising=False)
+
+    # The same module is registered once by module and once by its load() function,
+    # under a name that does not match its NAME.
+
+    def _entry_points(group: str) -> List[EntryPoint]:
+        assert group == ENTRY_POINT_GROUP
+        return [
+            EntryPoint("Plugin search", "maze_plugin", group),
+            EntryPoint("Other search", "maze_plugin:load", group),
+        ]
+
+    monkeypatch.setattr(search_loader, "entry_points", _entry_points)
+
+    _loader = SearchLoader()
+    _loader.discover_search_modules()
+    assert {"Plugin search", "Other search"} <= set(_loader.list_search_types())
+    assert "maze_plugin" not in sys.modules
+
+    _factory = _loader.get_search_pattern_factory("Plugin search")
+    assert _factory is sys.modules["maze_plugin"].BreadthFirst
+
+    with pytest.raises(ValueError):
+        _loader.get_search_pattern_factory("Other search")
+    with pytest.raises(KeyError):
+        _loader.get_search_pattern_factory("Missing search")
+
+
+def test_import_search_modules_registers_every_search_type() -> None:
+    _loader = SearchLoader()
+    _loader.import_search_modules()
+
+    assert _loader.list_search_types()
+    assert set(_loader.registered_search_modules) == set(
+        _loader.list_search_types()
+    )
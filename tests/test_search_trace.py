@@ -0,0 +1,130 @@
+"""
+Tests for recording and replaying search traces.
+"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from app.maze import Maze
+from app.search import Solver
+from app.search_trace import (
+    ADD,
+    EXPAND,
+    EXPANDED,
+    FRONTIER,
+    TraceFrames,
+    TraceReader,
+    TraceWriter,
+    _decode,
+    _encode,
+    format_frame,
+)
+from app.search_types.breadth_first import BreadthFirst
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        [0],
+        [1, 2, 3, 2, 1, 0],
+        [0, 63, 64, 8191, 8192, 1 << 29, 0, (1 << 29) + 1],
+        [random.Random(1).randrange(0, 1 << 29) for _ in range(1000)],
+    ],
+)
+def test_codec_round_trip(values) -> None:
+    assert list(_decode(_encode(values))) == values
+
+
+def test_each_number_takes_four_bytes() -> None:
+    assert len(_encode(list(range(100)))) == 400
+    assert _encode([5, 2, 7]) == b"\x05\0\0\0\xfd\xff\xff\xff\x05\0\0\0"
+
+
+def _record(maze: Maze, filename: str, chunk_events: int):
+    with TraceWriter(filename, maze, "Breadth First search", chunk_events) as _trace:
+        _solution = Solver(BreadthFirst, maze, trace=_trace).solve(
+            lambda *_args: None
+        )
+
+    return _solution
+
+
+def test_trace_round_trip(maze_text, maze_file, tmp_path) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(15, 15, 6, walls=0.2)))
+    _filename = str(tmp_path / "search.trace")
+    _solution = _record(_maze, _filename, chunk_events=16)
+
+    _reader = TraceReader(_filename)
+    assert len(_reader.chunks) > 1
+    assert _reader.pattern == "Breadth First search"
+    assert _reader.content_hash == _maze.content_hash()
+    assert _reader.maze().content_hash() == _maze.content_hash()
+    assert _reader.path() == _solution.cells
+    assert _reader.num_expansions == _solution.num_explored
+
+    _events = list(_reader.events())
+    assert _events[0] == (ADD, _maze.get_start())
+    assert [_cell for _kind, _cell in _events if _kind == EXPAND] == [
+        *_solution.explored,
+        _maze.get_goal(),
+    ]
+
+    # Reading part of the trace gives the same events as reading all of it.
+
+    for _first, _last in ((0, 5), (7, 30), (30, 31), (31, _reader.num_expansions)):
+        _expected = []
+        _step = 0
+        for _kind, _cell in _events:
+            _step += _kind == EXPAND
+            if _first < _step <= _last or (_first == 0 and _step == 0):
+                _expected.append((_kind, _cell))
+        assert list(_reader.events(_first, _last)) == _expected
+
+
+def test_trace_frames_seek_matches_a_fresh_replay(
+    maze_text, maze_file, tmp_path
+) -> None:
+    _maze = Maze(maze_file("maze.txt", maze_text(15, 15, 6, walls=0.2)))
+    _filename = str(tmp_path / "search.trace")
+    _record(_maze, _filename, chunk_events=16)
+    _reader = TraceReader(_filename)
+
+    _frames = TraceFrames(_reader)
+    _frames.seek(_reader.num_expansions)
+    assert len(_frames.keyframes) > 1
+
+    _random = random.Random(2)
+    for _ in range(40):
+        _step = _random.randrange(_reader.num_expansions + 1)
+        _frames.seek(_step)
+
+        _fresh = TraceFrames(_reader)
+        _fresh.seek(_step)
+        assert _frames.states == _fresh.states
+        assert _frames.step == _step
+
+    # Moving back replays from the nearest keyframe, not from the start.
+
+    _frames.seek(_reader.num_expansions)
+    _restored, _events = _frames.seek(_reader.num_expansions - 1)
+    assert _restored
+    assert len(_events) <= 2 * 16
+
+
+def test_format_frame(maze_file, tmp_path) -> None:
+    _maze = Maze(maze_file("maze.txt", "A   \n*** \nB   \n"))
+    _filename = str(tmp_path / "search.trace")
+    _record(_maze, _filename, chunk_events=4)
+    _reader = TraceReader(_filename)
+
+    assert format_frame(_reader, 2) == "A.o \n*** \nB   "
+    assert format_frame(_reader) == "A+++\n***+\nB+++"
+
+    _frames = TraceFrames(_reader)
+    _frames.seek(2)
+    assert _frames.state((0, 1)) == EXPANDED
+    assert _frames.state((0, 2)) == FRONTIER